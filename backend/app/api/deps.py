@@ -1,10 +1,55 @@
 """依赖注入."""
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.exceptions import UnauthorizedException
+from app.core.revocation import revocation_list
+from app.core.security import verify_access_token
+from app.db.session import get_db, get_read_db, has_recent_write
+from app.models.user import User
+from app.services.auth_service import resolve_user
 
-# 数据库会话依赖
+# 数据库会话依赖（主库，读写）
 DBSession = Annotated[AsyncSession, Depends(get_db)]
+
+# 只读数据库会话依赖（副本或主库，READ ONLY 事务）
+DBReadSession = Annotated[AsyncSession, Depends(get_read_db)]
+
+# 缺少凭据时由 get_current_user 抛出统一格式的 401
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_current_user(
+    request: Request,
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
+) -> User:
+    """解析 ``Authorization: Bearer`` 令牌得到当前用户（依赖注入）.
+
+    令牌声明与用户均有进程内缓存：同一令牌只校验一次签名，
+    缓存命中的请求不访问 Redis 与数据库。吊销状态每次都检查，
+    但未吊销的令牌只查询本地布隆过滤器。
+
+    Args:
+        request: 请求对象
+        credentials: Bearer 凭据
+
+    Returns:
+        当前用户（共享的游离态快照，调用方不得修改）
+
+    Raises:
+        UnauthorizedException: 缺少凭据、令牌无效或已吊销、用户不可用
+        ServiceUnavailableException: 无法确认令牌的吊销状态
+    """
+    if credentials is None:
+        raise UnauthorizedException(message="Not authenticated")
+    claims = verify_access_token(credentials.credentials)
+    if await revocation_list.is_revoked(claims["jti"], claims.get("fam")):
+        raise UnauthorizedException(message="Token has been revoked")
+    return await resolve_user(claims, use_primary=has_recent_write(request))
+
+
+# 当前登录用户依赖
+CurrentUser = Annotated[User, Depends(get_current_user)]
@@ -0,0 +1,49 @@
+"""认证端点."""
+from typing import Any
+
+from fastapi import APIRouter, status
+
+from app.api.deps import DBSession
+from app.schemas.auth import LoginRequest, RefreshRequest, TokenPair
+from app.services.auth_service import AuthService
+
+router = APIRouter()
+
+
+@router.post("/login", response_model=TokenPair)
+async def login(payload: LoginRequest, db: DBSession) -> dict[str, Any]:
+    """用户名密码登录.
+
+    Args:
+        payload: 登录数据
+        db: 数据库会话
+
+    Returns:
+        访问令牌与刷新令牌
+    """
+    return await AuthService(db).login(payload.username, payload.password)
+
+
+@router.post("/refresh", response_model=TokenPair)
+async def refresh(payload: RefreshRequest, db: DBSession) -> dict[str, Any]:
+    """轮换令牌：刷新令牌只能使用一次，重复使用会吊销整个令牌族.
+
+    Args:
+        payload: 刷新令牌
+        db: 数据库会话
+
+    Returns:
+        新的访问令牌与刷新令牌
+    """
+    return await AuthService(db).refresh(payload.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(payload: RefreshRequest, db: DBSession) -> None:
+    """登出：吊销本次登录签发的全部令牌.
+
+    Args:
+        payload: 刷新令牌
+        db: 数据库会话
+    """
+    await AuthService(db).logout(payload.refresh_token)
@@ -1,8 +1,12 @@
 """健康检查端点."""
-from fastapi import APIRouter
+from typing import Any
+
+from fastapi import APIRouter, Response, status
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.db.session import pool_status
+from app.services.health_service import HealthStatus, readiness_checker
 
 router = APIRouter()
 
@@ -16,6 +20,21 @@ class HealthResponse(BaseModel):
     environment: str
 
 
+class LivenessResponse(BaseModel):
+    """存活检查响应."""
+
+    status: str
+
+
+class ReadinessResponse(BaseModel):
+    """就绪检查响应."""
+
+    status: HealthStatus
+    checks: dict[str, dict[str, Any]]
+    checked_at: float | None
+    reason: str | None = None
+
+
 @router.get("", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
     """健康检查端点.
@@ -29,3 +48,41 @@ async def health_check() -> HealthResponse:
         version=settings.APP_VERSION,
         environment=settings.ENVIRONMENT,
     )
+
+
+@router.get("/pool")
+async def pool_stats() -> dict[str, dict[str, Any]]:
+    """数据库连接池指标（当前 worker）.
+
+    Returns:
+        引擎名称 -> 借出数、溢出数、等待时间、建连失败等指标
+    """
+    return pool_status()
+
+
+@router.get("/live", response_model=LivenessResponse)
+async def liveness() -> LivenessResponse:
+    """存活检查：进程能处理请求即可，不检查任何依赖.
+
+    Returns:
+        存活状态
+    """
+    return LivenessResponse(status="ok")
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def readiness(response: Response) -> ReadinessResponse:
+    """就绪检查：返回后台任务缓存的依赖检查结果.
+
+    主库不可达（或检查结果过期）时返回 503；degraded 仍返回 200。
+
+    Args:
+        response: 响应对象
+
+    Returns:
+        依赖检查结果
+    """
+    report = readiness_checker.report()
+    if report["status"] == "down":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(**report)
@@ -1,73 +1,385 @@
 """用户管理端点."""
-from fastapi import APIRouter, status
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable
 
-from app.api.deps import DBSession
-from app.schemas.user import User, UserCreate, UserUpdate
-from app.services.user_service import UserService
+from fastapi import APIRouter, File, Header, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import CurrentUser, DBReadSession, DBSession
+from app.core.config import settings
+from app.core.etag import check_none_match, not_modified, page_etag, resource_etag
+from app.core.exceptions import NotFoundException, ValidationException
+from app.core.pagination import CountStrategy, SortOrder
+from app.core.responses import fast_json_response
+from app.db.session import has_recent_write, open_read_session
+from app.schemas.base import PaginatedResponse
+from app.schemas.user import (
+    User,
+    UserAdapter,
+    UserBulkCreate,
+    UserBulkCreateResponse,
+    UserCreate,
+    UserImportJob,
+    UserPageAdapter,
+    UserSearchAdapter,
+    UserSearchResponse,
+    UserUpdate,
+)
+from app.services.user_import import ImportFormat
+from app.services.user_import_jobs import user_import_jobs
+from app.services.user_service import (
+    SEARCH_MIN_LENGTH,
+    ExportFormat,
+    UserService,
+    UserSort,
+)
 
 router = APIRouter()
 
+# users.id 为 INTEGER（int4），超出范围的 ID 在查询参数绑定时会报错
+MAX_USER_ID = 2**31 - 1
+
 
 @router.post("", response_model=User, status_code=status.HTTP_201_CREATED)
-async def create_user(user_data: UserCreate, db: DBSession) -> User:
+async def create_user(user_data: UserCreate, db: DBSession, response: Response) -> User:
     """创建新用户.
 
     Args:
         user_data: 用户创建数据
         db: 数据库会话
+        response: 响应对象（携带读己之写 Cookie）
 
     Returns:
         创建的用户
     """
     service = UserService(db)
-    return await service.create_user(user_data)
+    user = await service.create_user(user_data)
+    return fast_json_response(
+        UserAdapter, user, status_code=status.HTTP_201_CREATED, response=response
+    )
+
+
+@router.post("/bulk", response_model=UserBulkCreateResponse)
+async def create_users_bulk(payload: UserBulkCreate, db: DBSession) -> UserBulkCreateResponse:
+    """批量创建用户.
+
+    Args:
+        payload: 批量创建数据
+        db: 数据库会话
+
+    Returns:
+        逐条创建结果
+    """
+    service = UserService(db)
+    results = await service.create_users_bulk(payload.users)
+    created = sum(1 for result in results if result.status == "created")
+    return UserBulkCreateResponse(
+        created=created, failed=len(results) - created, results=results
+    )
+
+
+# 上传文件每次读取的字节数
+IMPORT_READ_SIZE = 1024 * 1024
+
+
+@router.post("/import", response_model=UserImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def import_users(
+    request: Request,
+    response: Response,
+    file: UploadFile = File(...),
+    format: ImportFormat | None = None,
+) -> dict[str, Any]:
+    """从 CSV / NDJSON 文件批量导入用户.
+
+    每行都要哈希密码，导入耗时远超请求超时，因此以后台任务运行：立即返回 202 与任务，
+    Location 指向任务状态，进度与完成后的汇总报告从该地址查询。
+
+    Args:
+        request: 请求对象
+        response: 响应对象（设置 Location）
+        file: 上传文件，CSV 首行须为表头（email,username,password,full_name）
+        format: 文件格式，默认按扩展名判断（.ndjson / .jsonl 为 NDJSON，其余为 CSV）
+
+    Returns:
+        新建的导入任务
+
+    Raises:
+        ServiceUnavailableException: 任务状态存储不可用
+    """
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+
+    async def chunks() -> AsyncIterator[bytes]:
+        while chunk := await file.read(IMPORT_READ_SIZE):
+            yield chunk
+
+    job = await user_import_jobs.submit(chunks(), format)
+    response.headers["Location"] = str(request.url_for("get_import_job", job_id=job["id"]))
+    return job
+
+
+@router.get("/import/{job_id}", response_model=UserImportJob)
+async def get_import_job(job_id: str) -> dict[str, Any]:
+    """查询导入任务的状态、进度与报告.
+
+    Args:
+        job_id: 任务 ID
+
+    Returns:
+        导入任务
+
+    Raises:
+        NotFoundException: 任务不存在或已过期
+    """
+    job = await user_import_jobs.get(job_id)
+    if job is None:
+        raise NotFoundException(message="Import job not found", details={"job_id": job_id})
+    return job
+
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(request: Request, format: ExportFormat = "ndjson") -> StreamingResponse:
+    """流式导出全部用户.
+
+    依赖注入的会话会在响应开始发送前关闭，因此导出在生成器内自行打开只读会话，
+    生命周期与响应体一致。客户端读取缓慢时 send 会等待，服务端游标随之暂停。
+
+    Args:
+        request: 请求对象
+        format: 导出格式（ndjson / csv）
+
+    Returns:
+        流式响应
+    """
+    use_primary = has_recent_write(request)
+
+    async def body() -> AsyncIterator[bytes]:
+        async with await open_read_session(use_primary=use_primary) as session:
+            async for chunk in UserService(session).export_users(format):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
+@router.get("/me", response_model=User)
+async def read_current_user(current_user: CurrentUser, response: Response) -> User:
+    """获取当前登录用户.
+
+    Args:
+        current_user: 当前用户
+        response: 响应对象
+
+    Returns:
+        用户信息
+    """
+    return fast_json_response(UserAdapter, current_user, response=response)
+
+
+@router.get("/search", response_model=UserSearchResponse)
+async def search_users(
+    db: DBReadSession,
+    response: Response,
+    q: str = Query(..., min_length=SEARCH_MIN_LENGTH, max_length=100),
+    limit: int = Query(
+        settings.USER_SEARCH_DEFAULT_LIMIT, ge=1, le=settings.USER_SEARCH_MAX_LIMIT
+    ),
+) -> dict[str, Any]:
+    """搜索用户（用户名、邮箱、姓名的前缀与容错匹配）.
+
+    Args:
+        db: 数据库会话
+        response: 响应对象
+        q: 搜索词，不区分大小写
+        limit: 最多返回的条数
+
+    Returns:
+        按相关度降序的搜索结果
+
+    Raises:
+        ValidationException: 去除首尾空白后搜索词过短
+    """
+    service = UserService(db)
+    items = await service.search_users(q, limit)
+    return fast_json_response(
+        UserSearchAdapter, {"query": q, "items": items, "limit": limit}, response=response
+    )
 
 
 @router.get("/{user_id}", response_model=User)
-async def get_user(user_id: int, db: DBSession) -> User:
+async def get_user(
+    user_id: int,
+    db: DBReadSession,
+    response: Response,
+    if_none_match: str | None = Header(None),
+) -> User:
     """获取用户详情.
 
+    携带 If-None-Match 时先只查询版本列，ETag 未变化则返回 304，不加载用户。
+
     Args:
         user_id: 用户 ID
         db: 数据库会话
+        response: 响应对象（设置 ETag）
+        if_none_match: 客户端缓存的 ETag
 
     Returns:
-        用户信息
+        用户信息，或 304 响应
     """
     service = UserService(db)
-    return await service.get_user(user_id)
+    if if_none_match:
+        etag = resource_etag(user_id, await service.get_user_version(user_id))
+        if check_none_match(if_none_match, etag):
+            return not_modified(etag)
+    user = await service.get_user(user_id)
+    response.headers["ETag"] = resource_etag(user.id, user.updated_at)
+    return fast_json_response(UserAdapter, user, response=response)
+
+
+def _conditional_page(
+    page: dict[str, Any],
+    versions: Iterable[tuple[int, datetime]],
+    if_none_match: str | None,
+    response: Response,
+) -> Any:
+    """为列表页设置 ETag，命中 If-None-Match 时返回 304."""
+    etag = page_etag(
+        versions, page["next_cursor"], page["limit"], page["total"], page["total_strategy"]
+    )
+    if check_none_match(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return fast_json_response(UserPageAdapter, page, response=response)
 
 
-@router.get("", response_model=list[User])
-async def get_users(skip: int = 0, limit: int = 20, db: DBSession = None) -> list[User]:
+@router.get("", response_model=PaginatedResponse[User])
+async def get_users(
+    db: DBReadSession,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_SIZE, ge=1, le=settings.PAGINATION_MAX_SIZE),
+    count: CountStrategy | None = None,
+    ids: str | None = Query(None, pattern=r"^\d+(,\d+)*$"),
+    is_active: bool | None = None,
+    is_superuser: bool | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    sort: UserSort = "created_at",
+    order: SortOrder = "asc",
+    if_none_match: str | None = Header(None),
+) -> dict[str, Any]:
     """获取用户列表.
 
+    返回普通字典而非 PaginatedResponse 实例：行映射只在 response_model 处
+    校验、序列化一次，避免先构建模型再被 FastAPI 转回字典重新校验。
+    过滤与排序只接受白名单字段，均有索引支撑；游标只对生成它的过滤与排序参数有效。
+    页面 ETag 由页内各用户的版本与分页信息派生，未变化时返回 304、不发送响应体。
+
     Args:
-        skip: 跳过数量
-        limit: 限制数量
         db: 数据库会话
+        response: 响应对象（设置 ETag）
+        cursor: 上一页返回的游标，为空时从第一页开始
+        limit: 每页数量
+        count: 总数统计策略，默认使用配置；带过滤条件时仅 exact 返回总数
+        ids: 逗号分隔的用户 ID；指定时以一次查询批量返回这些用户（忽略分页参数），
+            不存在的 ID 被跳过
+        is_active: 按是否激活过滤
+        is_superuser: 按是否超级用户过滤
+        created_after: 创建时间下限（含）
+        created_before: 创建时间上限（不含）
+        sort: 排序字段
+        order: 排序方向
+        if_none_match: 客户端缓存的 ETag
 
     Returns:
-        用户列表
+        用户分页数据（total_strategy 标明总数的来源），或 304 响应
+
+    Raises:
+        ValidationException: ids 数量超过单页上限或包含超出范围的 ID
     """
     service = UserService(db)
-    return await service.get_users(skip=skip, limit=limit)
+    if ids is not None:
+        user_ids = [int(user_id) for user_id in ids.split(",")]
+        if len(user_ids) > settings.PAGINATION_MAX_SIZE:
+            raise ValidationException(
+                message="Too many ids",
+                details={"count": len(user_ids), "max": settings.PAGINATION_MAX_SIZE},
+            )
+        invalid = [user_id for user_id in user_ids if user_id > MAX_USER_ID]
+        if invalid:
+            raise ValidationException(
+                message="Invalid ids",
+                details={"invalid": invalid[:10], "max": MAX_USER_ID},
+            )
+        users = await service.get_users_by_ids(user_ids)
+        batch = {
+            "items": users,
+            "next_cursor": None,
+            "limit": len(user_ids),
+            "total": len(users),
+            "total_strategy": "exact",
+        }
+        versions = [(user.id, user.updated_at) for user in users]
+        return _conditional_page(batch, versions, if_none_match, response)
+
+    filters = {
+        "is_active": is_active,
+        "is_superuser": is_superuser,
+        "created_after": created_after,
+        "created_before": created_before,
+    }
+    users, next_cursor = await service.get_users(
+        cursor=cursor, limit=limit, filters=filters, sort=sort, descending=order == "desc"
+    )
+    total, total_strategy = await service.count_users(count, filters)
+    page = {
+        "items": users,
+        "next_cursor": next_cursor,
+        "limit": limit,
+        "total": total,
+        "total_strategy": total_strategy,
+    }
+    versions = [(user["id"], user["updated_at"]) for user in users]
+    return _conditional_page(page, versions, if_none_match, response)
 
 
 @router.put("/{user_id}", response_model=User)
-async def update_user(user_id: int, user_data: UserUpdate, db: DBSession) -> User:
+async def update_user(
+    user_id: int,
+    user_data: UserUpdate,
+    db: DBSession,
+    response: Response,
+    if_match: str | None = Header(None),
+) -> User:
     """更新用户信息.
 
     Args:
         user_id: 用户 ID
         user_data: 更新数据
         db: 数据库会话
+        response: 响应对象（设置新的 ETag）
+        if_match: 客户端读取时的 ETag；与当前版本不一致时返回 412
 
     Returns:
         更新后的用户
+
+    Raises:
+        PreconditionFailedException: 用户已被他人修改
     """
     service = UserService(db)
-    return await service.update_user(user_id, user_data)
+    user = await service.update_user(user_id, user_data, expected_etag=if_match)
+    response.headers["ETag"] = resource_etag(user.id, user.updated_at)
+    return fast_json_response(UserAdapter, user, response=response)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,56 @@
+"""布隆过滤器.
+
+判定“不存在”时一定准确，判定“可能存在”时有一定误判率，适合在本地快速排除
+绝大多数查询，只有可能命中的少数查询才需要访问权威存储。
+"""
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """基于 bytearray 的布隆过滤器（双重哈希）."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """初始化.
+
+        Args:
+            capacity: 预期元素数量，超出后误判率上升
+            error_rate: capacity 个元素时的目标误判率
+        """
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        """添加元素.
+
+        Args:
+            item: 元素
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]) -> None:
+        """批量添加元素.
+
+        Args:
+            items: 元素
+        """
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
@@ -0,0 +1,228 @@
+"""Redis 读穿透缓存.
+
+同一个 key 并发未命中时只允许一个调用真正访问数据库：
+
+- 进程内：以 asyncio.Future 合并同一 worker 中的并发请求；
+- 跨 worker：以 ``SET NX PX`` 短锁选出加载者，其余 worker 轮询等待结果，
+  超时后自行加载（宁可多查一次，也不让请求一直挂起）。
+
+Redis 出错时缓存自动旁路（fail-open）一段时间，请求直接访问数据库。
+"""
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 仅当锁仍由自己持有时才释放
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+Loader = Callable[[], Awaitable[bytes | None]]
+
+
+class CacheStats:
+    """缓存命中统计."""
+
+    def __init__(self) -> None:
+        """初始化."""
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """导出统计快照.
+
+        Returns:
+            统计字典
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ReadThroughCache:
+    """带击穿保护的读穿透缓存."""
+
+    def __init__(
+        self,
+        redis: Callable[[], Redis],
+        namespace: str,
+        ttl: int,
+        lock_ttl: float = 5.0,
+        lock_poll_interval: float = 0.02,
+        bypass_seconds: float = 5.0,
+    ):
+        """初始化.
+
+        Args:
+            redis: 返回 Redis 客户端的函数（客户端可能在关闭后重建）
+            namespace: key 前缀
+            ttl: 缓存有效期（秒）
+            lock_ttl: 跨 worker 加载锁的有效期（秒），也是等待其他 worker 的上限
+            lock_poll_interval: 等待其他 worker 加载时的轮询间隔（秒）
+            bypass_seconds: Redis 出错后旁路缓存的时间（秒）
+        """
+        self.redis = redis
+        self.namespace = namespace
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.lock_poll_interval = lock_poll_interval
+        self.bypass_seconds = bypass_seconds
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future[bytes | None]] = {}
+        self._bypass_until = 0.0
+        self._release_lock: AsyncScript | None = None
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    @property
+    def available(self) -> bool:
+        """Redis 当前是否可用（未处于旁路期）."""
+        return time.monotonic() >= self._bypass_until
+
+    def _on_error(self, error: Exception) -> None:
+        self.stats.errors += 1
+        self._bypass_until = time.monotonic() + self.bypass_seconds
+        logger.warning(
+            "Cache unavailable, bypassing",
+            namespace=self.namespace,
+            error=str(error),
+            bypass_seconds=self.bypass_seconds,
+        )
+
+    async def get_or_load(self, key: str, loader: Loader, *, fill: bool = True) -> bytes | None:
+        """读取缓存，未命中时调用 loader 加载并回填.
+
+        Args:
+            key: 缓存 key（不含命名空间）
+            loader: 加载函数，返回 None 表示数据不存在（不缓存）
+            fill: 未命中时是否回填；loader 读取的数据可能已过期（如来自滞后的副本）时
+                应为 False，否则过期数据会在失效之后被写回，并保留整个 TTL
+
+        Returns:
+            缓存值或加载结果
+        """
+        if not self.available:
+            return await loader()
+
+        full_key = self._key(key)
+        try:
+            cached = await self.redis().get(full_key)
+        except RedisError as e:
+            self._on_error(e)
+            return await loader()
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+        self.stats.misses += 1
+        if not fill:
+            return await loader()
+
+        # 进程内合并：同一 key 只有一个协程负责加载
+        pending = self._inflight.get(full_key)
+        if pending is not None:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # 加载者被取消（如客户端断开），由当前请求自行加载
+                return await loader()
+
+        future: asyncio.Future[bytes | None] = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        try:
+            value = await self._load_once(full_key, loader)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # 避免 "exception was never retrieved" 警告
+                future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(full_key, None)
+
+    async def _load_once(self, full_key: str, loader: Loader) -> bytes | None:
+        lock_key = f"{full_key}:lock"
+        token = uuid.uuid4().hex
+        redis = self.redis()
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except RedisError as e:
+            self._on_error(e)
+            return await loader()
+
+        if not acquired:
+            # 其他 worker 正在加载，轮询等待其回填
+            deadline = time.monotonic() + self.lock_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.lock_poll_interval)
+                try:
+                    cached = await redis.get(full_key)
+                except RedisError as e:
+                    self._on_error(e)
+                    break
+                if cached is not None:
+                    self.stats.coalesced += 1
+                    return cached
+                try:
+                    if not await redis.exists(lock_key):
+                        break
+                except RedisError as e:
+                    self._on_error(e)
+                    break
+            return await loader()
+
+        try:
+            value = await loader()
+            if value is not None:
+                try:
+                    await redis.set(full_key, value, ex=self.ttl)
+                except RedisError as e:
+                    self._on_error(e)
+            return value
+        finally:
+            if self._release_lock is None:
+                self._release_lock = redis.register_script(_RELEASE_LOCK_SCRIPT)
+            try:
+                await self._release_lock(keys=[lock_key], args=[token], client=redis)
+            except RedisError:
+                pass
+
+    async def invalidate(self, *keys: str) -> None:
+        """删除缓存.
+
+        Args:
+            *keys: 缓存 key（不含命名空间）
+        """
+        if not keys:
+            return
+        try:
+            await self.redis().delete(*(self._key(key) for key in keys))
+        except RedisError as e:
+            self._on_error(e)
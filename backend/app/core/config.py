@@ -18,30 +18,152 @@ class Settings(BaseSettings):
     # ==================== API 配置 ====================
     API_V1_PREFIX: str = "/api/v1"
     BACKEND_CORS_ORIGINS: str = "http://localhost:5173"
+    # 快速序列化：以预构建的 TypeAdapter 直接输出 JSON 字节，跳过 FastAPI 的二次校验
+    API_FAST_SERIALIZATION: bool = False
 
     # ==================== 数据库配置 ====================
     DATABASE_URL: PostgresDsn
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_ECHO: bool = False
+    # 取出连接时先 ping 一次（每次多一个往返）；关闭后由后台探测与本地断连检查兜底
+    DB_POOL_PRE_PING: bool = True
+    # 空闲连接探测间隔（秒），仅在关闭 DB_POOL_PRE_PING 时运行，0 表示不探测
+    DB_POOL_MONITOR_INTERVAL: float = Field(default=30.0, ge=0)
+    # 连接最长存活时间（秒），到期后在下次取出时重建，-1 表示不限
+    DB_POOL_RECYCLE: int = Field(default=1800, ge=-1)
+    # 每个连接缓存的服务端预编译语句数（SQLAlchemy asyncpg 方言的 LRU 缓存）
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = Field(default=500, ge=0)
+    # 经 PgBouncer 事务池连接时开启：关闭预编译语句缓存并使用唯一语句名
+    DB_PGBOUNCER_MODE: bool = False
+    # 只读副本（逗号分隔），为空时读请求也走主库
+    DATABASE_READ_REPLICA_URLS: str = ""
+    DB_REPLICA_CONNECT_TIMEOUT: float = Field(default=2.0, gt=0)
+    # 副本连接失败后被摘除的时间（秒），到期后重新尝试
+    DB_REPLICA_FAILOVER_SECONDS: float = Field(default=30.0, gt=0)
+    # 写请求后该客户端的读请求走主库的时间（秒），0 表示关闭读己之写
+    DB_READ_YOUR_WRITES_SECONDS: float = Field(default=5.0, ge=0)
 
     # ==================== Redis 配置 ====================
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT: float = Field(default=0.5, gt=0)
+
+    # ==================== 缓存配置 ====================
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL: int = Field(default=300, ge=1)
 
     # ==================== 日志配置 ====================
     LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
-    LOG_FORMAT: Literal["json", "text"] = "json"
+    # json: 单行紧凑 JSON（生产）；json_pretty: 缩进排序的 JSON；text: 彩色控制台输出
+    LOG_FORMAT: Literal["json", "json_pretty", "text"] = "json"
     LOG_FILE_PATH: str = "logs/app.log"
+    # 异步日志：记录先进入内存队列，由后台线程写入 stdout 与文件
+    LOG_QUEUE_ENABLED: bool = True
+    LOG_QUEUE_MAX_SIZE: int = Field(default=10000, ge=1)
+    LOG_QUEUE_FULL_POLICY: Literal["drop", "block"] = "drop"
+    # 日志文件轮转：按大小（size）或按时间（time）
+    LOG_ROTATION: Literal["size", "time"] = "size"
+    LOG_MAX_BYTES: int = Field(default=50 * 1024 * 1024, ge=1024)
+    LOG_ROTATION_WHEN: str = "midnight"
+    LOG_BACKUP_COUNT: int = Field(default=10, ge=1)
+    LOG_COMPRESS: bool = True
+
+    # ==================== 监控配置 ====================
+    METRICS_ENABLED: bool = True
+    # 各 worker 采样连接池指标的间隔（秒）
+    METRICS_POOL_SAMPLE_INTERVAL: float = Field(default=5.0, gt=0)
+
+    # ==================== 健康检查配置 ====================
+    # 就绪检查由后台任务按间隔执行，探针只读取缓存结果
+    HEALTH_CHECK_INTERVAL: float = Field(default=5.0, gt=0)
+    HEALTH_CHECK_TIMEOUT: float = Field(default=1.0, gt=0)
+    # 连接池借出比例达到该值时报告 degraded
+    HEALTH_POOL_SATURATION_THRESHOLD: float = Field(default=0.9, gt=0, le=1)
 
     # ==================== 安全配置 ====================
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # 已验证令牌声明的进程内 LRU 容量，0 表示关闭（每个请求都校验签名）
+    AUTH_TOKEN_CACHE_SIZE: int = Field(default=10000, ge=0)
+    # 当前用户在进程内缓存的时间（秒），0 表示关闭；更新/删除用户时本 worker 立即失效，
+    # 其他 worker 最多滞后该时长
+    AUTH_USER_CACHE_TTL: float = Field(default=5.0, ge=0)
+    AUTH_USER_CACHE_SIZE: int = Field(default=10000, ge=0)
+    # 吊销同步间隔（秒）：吊销传播到所有 worker 的最大延迟
+    AUTH_REVOCATION_SYNC_INTERVAL: float = Field(default=1.0, gt=0)
+    # 本地布隆过滤器全量重建间隔（秒），重建时剔除过期的吊销记录
+    AUTH_REVOCATION_REBUILD_INTERVAL: float = Field(default=300.0, gt=0)
+    # 布隆过滤器最小容量（0.1% 误判率下约 1.8MB/百万条）
+    AUTH_REVOCATION_BLOOM_CAPACITY: int = Field(default=1_000_000, ge=1)
+
+    # ==================== 限流配置 ====================
+    RATE_LIMIT_ENABLED: bool = True
+    # 未单独配置的路由：每个客户端共用的默认配额（次数/second|minute|hour|day），空字符串表示不限
+    RATE_LIMIT_DEFAULT: str = "600/minute"
+    # 按路由的配额（"方法 路由模板=次数/周期"，分号分隔），每条规则每个客户端一个令牌桶
+    RATE_LIMIT_ROUTES: str = (
+        "POST /api/v1/users=10/minute;"
+        "POST /api/v1/users/bulk=5/minute;"
+        "POST /api/v1/users/import=5/minute;"
+        "POST /api/v1/auth/login=10/minute;"
+        "POST /api/v1/auth/refresh=30/minute"
+    )
+    # 不限流的路径前缀（逗号分隔）
+    RATE_LIMIT_EXEMPT_PATHS: str = "/api/v1/health,/metrics"
+    # Redis 不可用时每个 worker 按该比例使用本地配额（多 worker 部署取 1/worker 数）
+    RATE_LIMIT_LOCAL_SHARE: float = Field(default=1.0, gt=0, le=1)
+
+    # ==================== 密码哈希配置 ====================
+    HASH_POOL_WORKERS: int = Field(default=2, ge=1)
+    HASH_POOL_MAX_QUEUE: int = Field(default=64, ge=0)
+    HASH_POOL_QUEUE_TIMEOUT: float = Field(default=5.0, gt=0)
+    # 批量哈希时每个进程池任务处理的密码数
+    HASH_BULK_CHUNK_SIZE: int = Field(default=8, ge=1)
 
     # ==================== 分页配置 ====================
     PAGINATION_MAX_SIZE: int = 100
     PAGINATION_DEFAULT_SIZE: int = 20
+    PAGINATION_COUNT_STRATEGY: Literal["exact", "estimate", "cached"] = "cached"
+    PAGINATION_COUNT_CACHE_TTL: float = Field(default=30.0, gt=0)
+    # 估算值低于该阈值时直接精确计数（小表 count(*) 很便宜，估算误差相对更大）
+    PAGINATION_COUNT_ESTIMATE_THRESHOLD: int = Field(default=10000, ge=0)
+
+    # ==================== 搜索配置 ====================
+    USER_SEARCH_DEFAULT_LIMIT: int = Field(default=10, ge=1)
+    USER_SEARCH_MAX_LIMIT: int = Field(default=50, ge=1)
+
+    # ==================== 批量操作配置 ====================
+    # 每行都要做一次 bcrypt（约 250ms），整批耗时约 条数 × 250ms / HASH_POOL_WORKERS，
+    # 须远低于网关的 proxy_read_timeout（60s）：默认 200 条、2 个进程约 25s
+    USER_BULK_MAX_SIZE: int = Field(default=200, ge=1)
+    # 导入时每批校验、哈希并 COPY 的行数
+    USER_IMPORT_CHUNK_SIZE: int = Field(default=5000, ge=1)
+    # 导入报告中最多列出的问题行数（计数不受影响）
+    USER_IMPORT_MAX_ISSUES: int = Field(default=1000, ge=0)
+    # 导入任务状态在 Redis 中的保留时间（秒）
+    USER_IMPORT_JOB_TTL: int = Field(default=86400, ge=60)
+
+    @property
+    def read_replica_urls(self) -> list[str]:
+        """解析只读副本地址."""
+        return [url.strip() for url in self.DATABASE_READ_REPLICA_URLS.split(",") if url.strip()]
+
+    @property
+    def rate_limit_routes(self) -> dict[str, str]:
+        """解析按路由的限流配置."""
+        routes = {}
+        for item in self.RATE_LIMIT_ROUTES.split(";"):
+            route, sep, rate = item.partition("=")
+            if sep:
+                routes[" ".join(route.split())] = rate.strip()
+        return routes
+
+    @property
+    def rate_limit_exempt_paths(self) -> list[str]:
+        """解析不限流的路径前缀."""
+        return [path.strip() for path in self.RATE_LIMIT_EXEMPT_PATHS.split(",") if path.strip()]
 
     @property
     def cors_origins(self) -> list[str]:
@@ -0,0 +1,105 @@
+"""请求级批量加载器.
+
+同一事件循环轮次内的多次 ``load`` 被收集为一批，在下一轮次以一次批量查询完成，
+同一 key 在加载器生命周期内只加载一次。加载器应随请求（或服务实例）创建，
+不可跨请求共享：缓存的结果不会随数据更新失效。
+
+并发的 ``load`` 只会发出一次查询，因此也可在同一 AsyncSession 上 gather
+多个加载（AsyncSession 本身不允许并发执行语句）。
+"""
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Mapping, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+BatchLoadFn = Callable[[list[KeyT]], Awaitable[Mapping[KeyT, ValueT]]]
+
+
+class DataLoader(Generic[KeyT, ValueT]):
+    """按轮次合并单条加载为批量加载."""
+
+    def __init__(self, batch_load: BatchLoadFn[KeyT, ValueT], max_batch_size: int = 1000):
+        """初始化.
+
+        Args:
+            batch_load: 批量加载函数，返回 key -> 值 的映射，缺失的 key 视为不存在
+            max_batch_size: 单批最多的 key 数量，超出时拆分为多次批量加载
+        """
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._futures: dict[KeyT, asyncio.Future[ValueT | None]] = {}
+        self._queue: list[KeyT] = []
+        # 事件循环只弱引用任务，需持有引用直到批量加载完成，否则可能被垃圾回收
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def load(self, key: KeyT) -> asyncio.Future[ValueT | None]:
+        """加载单个 key.
+
+        Args:
+            key: 键
+
+        Returns:
+            可等待的结果，不存在时为 None
+        """
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[KeyT]) -> dict[KeyT, ValueT]:
+        """批量加载.
+
+        Args:
+            keys: 键（可重复）
+
+        Returns:
+            存在的 key -> 值
+        """
+        unique = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.load(key) for key in unique))
+        return {key: value for key, value in zip(unique, values) if value is not None}
+
+    def clear(self, key: KeyT) -> None:
+        """丢弃某个 key 的缓存结果（如该记录已被修改）.
+
+        Args:
+            key: 键
+        """
+        future = self._futures.get(key)
+        if future is not None and future.done():
+            del self._futures[key]
+
+    def _dispatch(self) -> None:
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch_size):
+            batch = queue[start : start + self.max_batch_size]
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, keys: list[KeyT]) -> None:
+        futures = [self._futures[key] for key in keys]
+        try:
+            results = await self.batch_load(keys)
+        except asyncio.CancelledError:
+            for key, future in zip(keys, futures):
+                self._futures.pop(key, None)
+                future.cancel()
+            raise
+        except Exception as e:
+            for key, future in zip(keys, futures):
+                # 失败的结果不缓存，后续调用会重新加载
+                self._futures.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+                    # 避免无人等待时出现 "exception was never retrieved" 警告
+                    future.exception()
+            return
+        for key, future in zip(keys, futures):
+            if not future.done():
+                future.set_result(results.get(key))
@@ -0,0 +1,103 @@
+"""ETag 与条件请求.
+
+资源的 ETag 由 ``id`` 与 ``updated_at`` 派生：任何更新都会刷新 ``updated_at``，
+因此判断客户端缓存是否有效只需读取版本列，无需加载并序列化整行。
+列表页的 ETag 由页内各条记录的版本与分页信息共同派生。
+
+- ``If-None-Match``（GET）：匹配时返回 304，不发送响应体（弱比较）；
+- ``If-Match``（PUT）：不匹配时返回 412，防止覆盖他人的修改（强比较）。
+"""
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """由若干取值生成强 ETag.
+
+    Args:
+        *parts: 参与计算的取值（datetime 按 ISO 格式参与）
+
+    Returns:
+        带引号的 ETag
+    """
+    raw = "|".join(
+        part.isoformat() if isinstance(part, datetime) else str(part) for part in parts
+    )
+    return f'"{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"'
+
+
+def resource_etag(id: Any, updated_at: datetime) -> str:
+    """单个资源的 ETag.
+
+    Args:
+        id: 资源 ID
+        updated_at: 最后更新时间
+
+    Returns:
+        带引号的 ETag
+    """
+    return make_etag(id, updated_at)
+
+
+def page_etag(versions: Iterable[tuple[Any, datetime]], *meta: Any) -> str:
+    """列表页的 ETag.
+
+    Args:
+        versions: 页内各条记录的 (id, updated_at)
+        *meta: 影响响应内容的其他取值（下一页游标、总数等）
+
+    Returns:
+        带引号的 ETag
+    """
+    return make_etag(*meta, *(resource_etag(id, updated_at) for id, updated_at in versions))
+
+
+def _parse(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def check_none_match(header: str | None, etag: str) -> bool:
+    """判断 If-None-Match 是否命中（弱比较，忽略 ``W/`` 前缀）.
+
+    Args:
+        header: If-None-Match 请求头
+        etag: 当前 ETag
+
+    Returns:
+        命中（客户端缓存仍然有效）时为 True
+    """
+    if not header:
+        return False
+    tags = _parse(header)
+    return "*" in tags or etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
+
+
+def check_if_match(header: str | None, etag: str) -> bool:
+    """判断 If-Match 是否满足（强比较，弱 ETag 永不匹配）.
+
+    Args:
+        header: If-Match 请求头
+        etag: 当前 ETag
+
+    Returns:
+        请求头缺失或满足条件时为 True
+    """
+    if header is None:
+        return True
+    tags = _parse(header)
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    """构建 304 响应.
+
+    Args:
+        etag: 当前 ETag
+
+    Returns:
+        不含响应体的 304 响应
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -5,6 +5,7 @@ from fastapi import Request, status
 from fastapi.responses import JSONResponse
 
 from app.core.logging import get_logger
+from app.core.metrics import APP_EXCEPTIONS
 
 logger = get_logger(__name__)
 
@@ -103,6 +104,36 @@ class ConflictException(AppException):
         )
 
 
+class PreconditionFailedException(AppException):
+    """前置条件不满足异常（If-Match 与当前版本不一致）."""
+
+    def __init__(
+        self, message: str = "Precondition failed", details: dict[str, Any] | None = None
+    ):
+        """初始化."""
+        super().__init__(
+            code="PRECONDITION_FAILED",
+            message=message,
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            details=details,
+        )
+
+
+class ServiceUnavailableException(AppException):
+    """服务暂不可用异常."""
+
+    def __init__(
+        self, message: str = "Service unavailable", details: dict[str, Any] | None = None
+    ):
+        """初始化."""
+        super().__init__(
+            code="SERVICE_UNAVAILABLE",
+            message=message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details=details,
+        )
+
+
 async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
     """自定义异常处理器.
 
@@ -113,6 +144,7 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
     Returns:
         JSON 响应
     """
+    APP_EXCEPTIONS.labels(code=exc.code).inc()
     logger.error(
         "Application exception occurred",
         code=exc.code,
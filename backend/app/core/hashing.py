@@ -0,0 +1,260 @@
+"""密码哈希执行器.
+
+bcrypt 是刻意设计的慢哈希（单次约 250ms），直接在事件循环中调用会阻塞同一
+worker 上的所有请求。这里把哈希与校验放到独立的进程池中执行，并通过有界的
+准入队列实现背压：排队超时直接返回 503，而不是无限堆积。
+"""
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Sequence, TypeVar
+
+from app.core import security
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 延迟统计保留的最近样本数
+LATENCY_SAMPLE_SIZE = 1024
+
+
+class HashingMetrics:
+    """哈希执行器运行指标."""
+
+    def __init__(self) -> None:
+        """初始化."""
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self._queue_waits: deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    def observe(self, queue_wait: float, latency: float) -> None:
+        """记录一次完成的任务.
+
+        Args:
+            queue_wait: 排队等待时间（秒）
+            latency: 从提交到完成的总耗时（秒）
+        """
+        self.completed += 1
+        self._queue_waits.append(queue_wait)
+        self._latencies.append(latency)
+
+    @staticmethod
+    def _percentile(samples: deque[float], q: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> dict[str, Any]:
+        """导出当前指标快照.
+
+        Returns:
+            指标字典
+        """
+        return {
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "queue_wait_p50": self._percentile(self._queue_waits, 0.50),
+            "queue_wait_p99": self._percentile(self._queue_waits, 0.99),
+            "latency_p50": self._percentile(self._latencies, 0.50),
+            "latency_p99": self._percentile(self._latencies, 0.99),
+        }
+
+
+class HashingExecutor:
+    """基于进程池的密码哈希执行器."""
+
+    def __init__(self, max_workers: int, max_queue: int, queue_timeout: float):
+        """初始化.
+
+        Args:
+            max_workers: 进程池大小
+            max_queue: 除正在执行的任务外，允许排队的最大任务数
+            queue_timeout: 等待准入的最长时间（秒）
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.metrics = HashingMetrics()
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(max_workers + max_queue)
+        self._restart_lock = asyncio.Lock()
+
+    def start(self) -> None:
+        """启动进程池（重复调用无副作用）."""
+        if self._executor is not None:
+            return
+        # 使用 spawn，避免在已有线程的进程中 fork
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(
+            "Hashing executor started",
+            max_workers=self.max_workers,
+            max_queue=self.max_queue,
+        )
+
+    async def shutdown(self) -> None:
+        """关闭进程池，等待已提交的任务完成."""
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        logger.info("Hashing executor stopped")
+
+    async def _restart(self, failed: ProcessPoolExecutor) -> None:
+        """替换损坏的进程池.
+
+        同一进程池损坏时所有在途任务都会收到 BrokenProcessPool，只有第一个调用者重建，
+        其余调用者发现进程池已被替换后直接返回。
+
+        Args:
+            failed: 任务提交时使用的进程池
+        """
+        async with self._restart_lock:
+            if self._executor is not failed:
+                return
+            logger.error("Hashing process pool is broken, restarting")
+            self._executor = None
+            failed.shutdown(wait=False, cancel_futures=True)
+            self.start()
+
+    def stats(self) -> dict[str, Any]:
+        """获取执行器统计信息.
+
+        Returns:
+            指标字典，queue_depth 包含等待准入和已提交但尚未开始执行的任务
+        """
+        snapshot = self.metrics.snapshot()
+        snapshot["max_workers"] = self.max_workers
+        snapshot["queue_depth"] = self.metrics.waiting + max(
+            0, self.metrics.in_flight - self.max_workers
+        )
+        return snapshot
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """在进程池中执行函数.
+
+        Args:
+            fn: 可被 pickle 的模块级函数
+            *args: 函数参数
+
+        Returns:
+            函数返回值
+
+        Raises:
+            ServiceUnavailableException: 排队超时或进程池不可用
+        """
+        self.start()
+
+        submitted_at = time.perf_counter()
+        self.metrics.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError as e:
+            self.metrics.rejected += 1
+            logger.warning("Hashing queue is full", **self.stats())
+            raise ServiceUnavailableException(
+                message="Password hashing is overloaded, please retry later",
+                details={"queue_timeout": self.queue_timeout},
+            ) from e
+        finally:
+            self.metrics.waiting -= 1
+
+        started_at = time.perf_counter()
+        self.metrics.in_flight += 1
+        executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool as e:
+            self.metrics.failed += 1
+            if executor is not None:
+                await self._restart(executor)
+            raise ServiceUnavailableException(message="Password hashing unavailable") from e
+        finally:
+            self.metrics.in_flight -= 1
+            self._slots.release()
+
+        self.metrics.observe(
+            queue_wait=started_at - submitted_at,
+            latency=time.perf_counter() - submitted_at,
+        )
+        return result
+
+
+def _hash_many(passwords: list[str]) -> list[str]:
+    """在子进程中批量生成哈希."""
+    return [security.get_password_hash(password) for password in passwords]
+
+
+hashing_executor = HashingExecutor(
+    max_workers=settings.HASH_POOL_WORKERS,
+    max_queue=settings.HASH_POOL_MAX_QUEUE,
+    queue_timeout=settings.HASH_POOL_QUEUE_TIMEOUT,
+)
+
+
+async def hash_password(password: str) -> str:
+    """异步生成密码哈希.
+
+    Args:
+        password: 明文密码
+
+    Returns:
+        哈希后的密码
+    """
+    return await hashing_executor.run(security.get_password_hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """异步验证密码.
+
+    Args:
+        plain_password: 明文密码
+        hashed_password: 哈希后的密码
+
+    Returns:
+        是否匹配
+    """
+    return await hashing_executor.run(security.verify_password, plain_password, hashed_password)
+
+
+async def hash_passwords(passwords: Sequence[str]) -> list[str]:
+    """异步批量生成密码哈希，结果顺序与输入一致.
+
+    密码按 HASH_BULK_CHUNK_SIZE 分块提交，同时最多占用 max_workers 个执行槽，
+    剩余的排队名额留给普通请求，避免批量任务饿死单个注册。
+
+    Args:
+        passwords: 明文密码列表
+
+    Returns:
+        哈希后的密码列表
+    """
+    chunk_size = settings.HASH_BULK_CHUNK_SIZE
+    chunks = [list(passwords[i : i + chunk_size]) for i in range(0, len(passwords), chunk_size)]
+    limiter = asyncio.Semaphore(hashing_executor.max_workers)
+
+    async def run_chunk(chunk: list[str]) -> list[str]:
+        async with limiter:
+            return await hashing_executor.run(_hash_many, chunk)
+
+    results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+    return [hashed for chunk in results for hashed in chunk]
@@ -1,62 +1,247 @@
 """日志系统配置."""
+import gzip
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
 
+import orjson
 import structlog
 from structlog.types import EventDict, Processor
 
 from app.core.config import settings
 
 
-def add_china_timestamp(
-    logger: Any, method_name: str, event_dict: EventDict
-) -> EventDict:
+class ChinaTimestamper:
     """添加中国时区的时间戳.
 
-    Args:
-        logger: logger 实例
-        method_name: 方法名
-        event_dict: 事件字典
+    时区对象只创建一次；秒级部分（人类可读时间与 ISO 前缀）按秒缓存，
+    同一秒内的事件只需拼接微秒，避免每条日志都调用 strftime / isoformat。
+    """
 
-    Returns:
-        添加了时间戳的事件字典
+    __slots__ = ("_tz", "_cache")
+
+    def __init__(self, tz_name: str = "Asia/Shanghai") -> None:
+        """初始化.
+
+        Args:
+            tz_name: 时区名称
+        """
+        self._tz = ZoneInfo(tz_name)
+        # (秒, 人类可读时间, ISO 秒级前缀, UTC 偏移)，整体替换以保证线程安全
+        self._cache: tuple[int, str, str, str] = (-1, "", "", "")
+
+    def _format_second(self, second: int) -> tuple[int, str, str, str]:
+        moment = datetime.fromtimestamp(second, self._tz)
+        iso = moment.isoformat()
+        self._cache = (second, moment.strftime("%Y-%m-%d %H:%M:%S"), iso[:19], iso[19:])
+        return self._cache
+
+    def __call__(self, logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+        """处理事件.
+
+        Args:
+            logger: logger 实例
+            method_name: 方法名
+            event_dict: 事件字典
+
+        Returns:
+            添加了时间戳的事件字典
+        """
+        now = time.time()
+        second = int(now)
+        cached = self._cache
+        if cached[0] != second:
+            cached = self._format_second(second)
+
+        # 添加人类可读的时间戳
+        event_dict["timestamp"] = cached[1]
+        # 保留 ISO 格式用于机器处理
+        event_dict["timestamp_iso"] = f"{cached[2]}.{int((now - second) * 1e6):06d}{cached[3]}"
+
+        return event_dict
+
+
+add_china_timestamp = ChinaTimestamper()
+
+
+class ORJSONRenderer:
+    """单行 JSON 渲染器.
+
+    使用 orjson 直接序列化为 bytes；标准库 handler 只接受 str，
+    因此仅在末尾做一次 UTF-8 解码。无法序列化的值退化为 ``str()``。
     """
-    # 使用 Asia/Shanghai 时区
-    china_tz = ZoneInfo("Asia/Shanghai")
-    now = datetime.now(china_tz)
 
-    # 添加人类可读的时间戳
-    event_dict["timestamp"] = now.strftime("%Y-%m-%d %H:%M:%S")
-    # 保留 ISO 格式用于机器处理
-    event_dict["timestamp_iso"] = now.isoformat()
+    def __call__(self, logger: Any, method_name: str, event_dict: EventDict) -> str:
+        """渲染事件.
 
-    return event_dict
+        Args:
+            logger: logger 实例
+            method_name: 方法名
+            event_dict: 事件字典
 
+        Returns:
+            单行 JSON 文本
+        """
+        return orjson.dumps(event_dict, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
-def setup_logging() -> None:
-    """配置结构化日志系统."""
-    # 确保日志目录存在
-    log_path = Path(settings.LOG_FILE_PATH)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # 配置日志级别
-    log_level = getattr(logging, settings.LOG_LEVEL)
+class PolicyQueueHandler(logging.handlers.QueueHandler):
+    """带满队列策略的 QueueHandler.
 
-    # 配置标准库 logging
-    logging.basicConfig(
-        format="%(message)s",
-        level=log_level,
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler(settings.LOG_FILE_PATH),
-        ],
-    )
+    ``drop`` 策略在队列满时丢弃记录并计数，保证调用方永不阻塞；
+    ``block`` 策略则等待队列腾出空间，保证不丢日志。
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]", policy: str):
+        """初始化.
+
+        Args:
+            log_queue: 日志队列
+            policy: 队列满时的策略（drop / block）
+        """
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """将记录放入队列.
+
+        Args:
+            record: 日志记录
+        """
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogCompressor:
+    """在后台线程中压缩轮转出的日志段."""
+
+    def __init__(self) -> None:
+        """初始化."""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+        self._pending: Future[None] | None = None
+        self._closed = False
+
+    def attach(self, handler: logging.handlers.BaseRotatingHandler) -> None:
+        """接管 handler 的轮转：命名、重命名与压缩.
+
+        Args:
+            handler: 轮转文件 handler
+        """
+        handler.namer = self.namer
+        handler.rotator = self.rotator
+        do_rollover = handler.doRollover
+
+        def rollover() -> None:
+            # doRollover 会先移动已有的 .N.gz 备份再调用 rotator，
+            # 必须在移动之前等上一段压缩完成，否则它写出的 .1.gz 会被本次轮转覆盖
+            self.wait()
+            do_rollover()
+
+        handler.doRollover = rollover  # type: ignore[method-assign]
+
+    @staticmethod
+    def namer(default_name: str) -> str:
+        """轮转文件命名：追加 .gz 后缀.
+
+        Args:
+            default_name: 默认文件名
+
+        Returns:
+            压缩后的文件名
+        """
+        return f"{default_name}.gz"
+
+    def rotator(self, source: str, dest: str) -> None:
+        """轮转回调：先重命名，再异步压缩（关闭后改为同步压缩）.
+
+        Args:
+            source: 当前日志文件
+            dest: 轮转目标文件（带 .gz 后缀）
+        """
+        if not os.path.exists(source):
+            return
+        segment = dest.removesuffix(".gz")
+        os.replace(source, segment)
+        if self._closed:
+            self._compress(segment, dest)
+            return
+        self._pending = self._executor.submit(self._compress, segment, dest)
 
-    # 配置 structlog 处理器
+    @staticmethod
+    def _compress(segment: str, dest: str) -> None:
+        with open(segment, "rb") as f_in, gzip.open(f"{dest}.tmp", "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.replace(f"{dest}.tmp", dest)
+        os.remove(segment)
+
+    def wait(self) -> None:
+        """等待正在进行的压缩完成."""
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
+    def shutdown(self) -> None:
+        """等待压缩完成并关闭线程（之后的轮转在调用线程中同步压缩）."""
+        self._closed = True
+        self.wait()
+        self._executor.shutdown(wait=True)
+
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: PolicyQueueHandler | None = None
+_compressor: LogCompressor | None = None
+
+
+def _build_file_handler() -> logging.Handler:
+    """根据配置创建轮转文件 handler."""
+    global _compressor
+
+    handler: logging.handlers.BaseRotatingHandler
+    if settings.LOG_ROTATION == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(
+            settings.LOG_FILE_PATH,
+            when=settings.LOG_ROTATION_WHEN,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE_PATH,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+
+    if settings.LOG_COMPRESS:
+        _compressor = LogCompressor()
+        _compressor.attach(handler)
+    return handler
+
+
+def build_processors(log_format: str) -> list[Processor]:
+    """构建 structlog 处理器链.
+
+    Args:
+        log_format: 日志格式（json / json_pretty / text）
+
+    Returns:
+        处理器列表
+    """
     processors: list[Processor] = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
@@ -67,7 +252,10 @@ def setup_logging() -> None:
     ]
 
     # 根据格式选择渲染器
-    if settings.LOG_FORMAT == "json":
+    if log_format == "json":
+        # 生产环境：单行紧凑 JSON，便于日志采集
+        processors.append(ORJSONRenderer())
+    elif log_format == "json_pretty":
         # 使用格式化的JSON渲染器，带缩进和换行
         processors.append(
             structlog.processors.JSONRenderer(
@@ -84,10 +272,47 @@ def setup_logging() -> None:
                 exception_formatter=structlog.dev.plain_traceback,
             )
         )
+    return processors
+
+
+def setup_logging() -> None:
+    """配置结构化日志系统."""
+    global _listener, _queue_handler
+
+    # 确保日志目录存在
+    log_path = Path(settings.LOG_FILE_PATH)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 配置日志级别
+    log_level = getattr(logging, settings.LOG_LEVEL)
+
+    handlers: list[logging.Handler] = [
+        logging.StreamHandler(sys.stdout),
+        _build_file_handler(),
+    ]
+
+    if settings.LOG_QUEUE_ENABLED:
+        # 请求路径只做入队，真正的 I/O 由监听线程完成
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(
+            maxsize=settings.LOG_QUEUE_MAX_SIZE
+        )
+        _queue_handler = PolicyQueueHandler(log_queue, settings.LOG_QUEUE_FULL_POLICY)
+        _listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        handlers = [_queue_handler]
+
+    # 配置标准库 logging
+    logging.basicConfig(
+        format="%(message)s",
+        level=log_level,
+        handlers=handlers,
+    )
 
     # 配置 structlog
     structlog.configure(
-        processors=processors,
+        processors=build_processors(settings.LOG_FORMAT),
         wrapper_class=structlog.stdlib.BoundLogger,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -95,6 +320,29 @@ def setup_logging() -> None:
     )
 
 
+def shutdown_logging() -> None:
+    """停止后台日志线程，确保队列中的日志全部落盘（在 lifespan 关闭时调用）."""
+    global _listener, _compressor
+
+    if _listener is not None:
+        # stop() 会投递哨兵并等待监听线程处理完队列中剩余的记录
+        _listener.stop()
+        # 关闭之后的日志（如服务器退出信息）改为同步直写，避免写入无人消费的队列
+        root = logging.getLogger()
+        if _queue_handler is not None:
+            root.removeHandler(_queue_handler)
+        for handler in _listener.handlers:
+            handler.flush()
+            root.addHandler(handler)
+        _listener = None
+        if _queue_handler is not None and _queue_handler.dropped:
+            sys.stderr.write(f"logging: dropped {_queue_handler.dropped} records (queue full)\n")
+
+    if _compressor is not None:
+        _compressor.shutdown()
+        _compressor = None
+
+
 def get_logger(name: str) -> Any:
     """获取 logger 实例.
 
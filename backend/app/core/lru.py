@@ -0,0 +1,80 @@
+"""进程内带过期时间的 LRU 缓存.
+
+每个条目有各自的过期时间（Unix 时间戳），容量满时淘汰最久未使用的条目。
+只在事件循环线程中使用，不加锁；各 worker 进程各自持有一份。
+"""
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+
+class ExpiringLRU(Generic[KeyT, ValueT]):
+    """容量有界、按条目过期的 LRU 缓存."""
+
+    def __init__(self, maxsize: int):
+        """初始化.
+
+        Args:
+            maxsize: 最大条目数，0 表示关闭缓存（set 不生效）
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[KeyT, tuple[ValueT, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: KeyT) -> ValueT | None:
+        """读取未过期的条目.
+
+        Args:
+            key: 键
+
+        Returns:
+            缓存值，不存在或已过期时为 None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: KeyT, value: ValueT, expires_at: float) -> None:
+        """写入条目.
+
+        Args:
+            key: 键
+            value: 值
+            expires_at: 过期时间（Unix 时间戳），已过期的条目不写入
+        """
+        if self.maxsize <= 0 or expires_at <= time.time():
+            return
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, *keys: KeyT) -> None:
+        """删除条目.
+
+        Args:
+            *keys: 键
+        """
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存与命中统计."""
+        self._entries.clear()
+        self.hits = self.misses = 0
@@ -0,0 +1,156 @@
+"""Prometheus 指标.
+
+多 worker 部署（uvicorn --workers N）时设置环境变量 ``PROMETHEUS_MULTIPROC_DIR``：
+各 worker 将指标写入该目录下的 mmap 文件，``/metrics`` 由 MultiProcessCollector
+汇总所有 worker，无论请求落在哪个 worker 上结果都一致。该目录须在启动前清空。
+"""
+import asyncio
+import os
+from typing import Any, Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration in seconds",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+APP_EXCEPTIONS = Counter(
+    "app_exceptions_total",
+    "Application exceptions by error code",
+    ["code"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool size", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Overflow connections currently open", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connection checkouts", ["pool"])
+DB_POOL_CONNECT_FAILURES = Counter(
+    "db_pool_connect_failures_total", "Failed connection attempts", ["pool"]
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that timed out waiting for a connection",
+    ["pool"],
+)
+DB_POOL_WAIT_SECONDS = Counter(
+    "db_pool_checkout_wait_seconds_total", "Total time spent waiting for a connection", ["pool"]
+)
+
+# 连接池累计值 -> 对应的 Counter（按两次采样的差值递增）
+_POOL_COUNTERS: dict[str, Counter] = {
+    "checkouts": DB_POOL_CHECKOUTS,
+    "connect_failures": DB_POOL_CONNECT_FAILURES,
+    "checkout_timeouts": DB_POOL_CHECKOUT_TIMEOUTS,
+    "wait_seconds_total": DB_POOL_WAIT_SECONDS,
+}
+
+PoolStatsSource = Callable[[], dict[str, dict[str, Any]]]
+
+
+class PoolStatsSampler:
+    """定期把连接池指标写入 Prometheus 指标.
+
+    每个 worker 各自采样自己的连接池；/metrics 只由其中一个 worker 响应，
+    因此不能在抓取时才读取连接池，否则其他 worker 的数据会停留在旧值。
+    """
+
+    def __init__(self, source: PoolStatsSource, interval: float):
+        """初始化.
+
+        Args:
+            source: 返回 {连接池名称: 指标} 的函数
+            interval: 采样间隔（秒）
+        """
+        self.source = source
+        self.interval = interval
+        self._last: dict[tuple[str, str], float] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def sample(self) -> None:
+        """采样一次."""
+        for pool, stats in self.source().items():
+            DB_POOL_SIZE.labels(pool=pool).set(stats["size"])
+            DB_POOL_CHECKED_OUT.labels(pool=pool).set(stats["checked_out"])
+            DB_POOL_OVERFLOW.labels(pool=pool).set(stats["overflow"])
+            for key, counter in _POOL_COUNTERS.items():
+                value = stats[key]
+                delta = value - self._last.get((pool, key), 0)
+                if delta > 0:
+                    counter.labels(pool=pool).inc(delta)
+                self._last[(pool, key)] = value
+
+    def start(self) -> None:
+        """启动后台采样（重复调用无副作用）."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="pool-stats-sampler")
+
+    async def stop(self) -> None:
+        """停止后台采样."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning("Pool stats sampling failed", error=str(e))
+            await asyncio.sleep(self.interval)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """生成 Prometheus 文本格式的指标.
+
+    Returns:
+        (指标内容, Content-Type)
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """worker 退出时清理其 live 类 Gauge（多进程模式）."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
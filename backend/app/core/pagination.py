@@ -0,0 +1,75 @@
+"""游标分页工具.
+
+游标是排序名称与排序键取值组成的 JSON 经 URL 安全 Base64 编码后的字符串，对客户端不透明。
+排序名称用于拒绝在另一种排序下使用的游标（取值的类型与含义都不同）。
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Literal, Sequence
+
+from app.core.exceptions import ValidationException
+
+# 总数统计策略：exact 精确 count(*)；estimate 规划器估算；cached 带 TTL 缓存的精确值
+CountStrategy = Literal["exact", "estimate", "cached"]
+
+SortOrder = Literal["asc", "desc"]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Unsupported cursor value type: {type(value).__name__}")
+
+
+def encode_cursor(values: Sequence[Any], sort: str | None) -> str:
+    """编码游标.
+
+    Args:
+        values: 排序键取值
+        sort: 生成游标时的排序名称（None 表示默认排序）
+
+    Returns:
+        不透明的游标字符串
+    """
+    payload = {"sort": sort, "values": list(values)}
+    raw = json.dumps(payload, default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, python_types: Sequence[type], sort: str | None) -> list[Any]:
+    """解码游标.
+
+    Args:
+        cursor: 游标字符串
+        python_types: 各排序键对应的 Python 类型，用于还原取值
+        sort: 当前请求的排序名称，须与生成游标时一致
+
+    Returns:
+        排序键取值列表
+
+    Raises:
+        ValidationException: 游标格式非法，或游标属于另一种排序
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict):
+            raise ValueError("cursor payload is not an object")
+        values = payload.get("values")
+        if not isinstance(values, list) or len(values) != len(python_types):
+            raise ValueError("cursor length mismatch")
+        cursor_sort = payload.get("sort")
+        decoded = [
+            datetime.fromisoformat(value) if python_type is datetime else python_type(value)
+            for value, python_type in zip(values, python_types)
+        ]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise ValidationException(message="Invalid cursor", details={"cursor": cursor}) from e
+    if cursor_sort != sort:
+        raise ValidationException(
+            message="Cursor does not match sort",
+            details={"cursor_sort": cursor_sort, "sort": sort},
+        )
+    return decoded
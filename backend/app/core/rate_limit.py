@@ -0,0 +1,184 @@
+"""令牌桶限流.
+
+每个 (规则, 客户端) 对应一个令牌桶：容量为 limit，每 period 秒匀速补满。
+桶保存在 Redis 哈希中，补充、扣减与过期设置在一次 EVALSHA 中原子完成，
+时间取 Redis 服务器时钟，所有 worker 共享同一份配额，也不受各机器时钟偏差影响。
+
+Redis 出错时在 ``bypass_seconds`` 内改用进程内的桶（fail-open 到本地限流）：
+各 worker 独立计数，配额按 ``local_share`` 缩放，使总量与分布式限流大致相当。
+"""
+import math
+import time
+from typing import Callable
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.lru import ExpiringLRU
+from app.core.redis import get_redis
+
+logger = get_logger(__name__)
+
+# 返回 {是否放行, 扣减后的剩余令牌}；剩余令牌为小数，以字符串返回避免被截断为整数
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimit:
+    """限流规则：每 period 秒最多 limit 次（允许突发 limit 次）."""
+
+    def __init__(self, limit: int, period: float):
+        """初始化.
+
+        Args:
+            limit: 桶容量（周期内的请求数）
+            period: 周期（秒）
+        """
+        self.limit = limit
+        self.period = period
+        self.rate = limit / period
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """解析 ``次数/周期`` 格式（如 ``10/minute``）.
+
+        Args:
+            value: 规则字符串，周期为 second / minute / hour / day
+
+        Returns:
+            限流规则
+
+        Raises:
+            ValueError: 格式非法
+        """
+        count, _, unit = value.strip().partition("/")
+        if unit not in _PERIODS or not count.isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid rate limit {value!r}, expected e.g. '10/minute'")
+        return cls(int(count), _PERIODS[unit])
+
+    @property
+    def policy(self) -> str:
+        """``RateLimit-Policy`` 响应头取值."""
+        return f"{self.limit};w={math.ceil(self.period)}"
+
+
+class RateLimitResult:
+    """一次限流判定的结果."""
+
+    __slots__ = ("allowed", "limit", "remaining", "reset", "retry_after")
+
+    def __init__(self, allowed: bool, rule: RateLimit, tokens: float):
+        """初始化.
+
+        Args:
+            allowed: 是否放行
+            rule: 限流规则
+            tokens: 判定后桶内剩余的令牌数
+        """
+        self.allowed = allowed
+        self.limit = rule.limit
+        self.remaining = max(0, math.floor(tokens))
+        # 桶补满所需的秒数
+        self.reset = math.ceil((rule.limit - tokens) / rule.rate)
+        # 被拒绝时下一个令牌可用的秒数
+        self.retry_after = 0 if allowed else max(1, math.ceil((1 - tokens) / rule.rate))
+
+
+class RateLimiter:
+    """Redis 令牌桶限流器（Redis 不可用时降级为进程内令牌桶）."""
+
+    def __init__(
+        self,
+        redis: Callable[[], Redis],
+        prefix: str = "ratelimit",
+        local_share: float = 1.0,
+        local_size: int = 100_000,
+        bypass_seconds: float = 5.0,
+    ):
+        """初始化.
+
+        Args:
+            redis: 返回 Redis 客户端的函数（客户端可能在关闭后重建）
+            prefix: Redis key 前缀
+            local_share: 降级时每个 worker 使用的配额比例
+            local_size: 进程内最多保存的令牌桶数量
+            bypass_seconds: Redis 出错后使用本地令牌桶的时间（秒）
+        """
+        self.redis = redis
+        self.prefix = prefix
+        self.local_share = local_share
+        self.bypass_seconds = bypass_seconds
+        self._local: ExpiringLRU[str, list[float]] = ExpiringLRU(local_size)
+        self._local_rules: dict[tuple[int, float], RateLimit] = {}
+        self._bypass_until = 0.0
+        self._script: AsyncScript | None = None
+
+    async def hit(self, key: str, rule: RateLimit) -> RateLimitResult:
+        """消耗一个令牌.
+
+        Args:
+            key: 令牌桶标识（规则 + 客户端）
+            rule: 限流规则
+
+        Returns:
+            判定结果
+        """
+        if time.monotonic() < self._bypass_until:
+            return self._hit_local(key, rule)
+        redis = self.redis()
+        if self._script is None:
+            self._script = redis.register_script(_TOKEN_BUCKET_SCRIPT)
+        try:
+            allowed, tokens = await self._script(
+                keys=[f"{self.prefix}:{key}"], args=[rule.limit, rule.rate], client=redis
+            )
+        except RedisError as e:
+            self._bypass_until = time.monotonic() + self.bypass_seconds
+            logger.warning(
+                "Rate limiter falling back to local buckets",
+                error=str(e),
+                bypass_seconds=self.bypass_seconds,
+            )
+            return self._hit_local(key, rule)
+        return RateLimitResult(allowed == 1, rule, float(tokens))
+
+    def _hit_local(self, key: str, rule: RateLimit) -> RateLimitResult:
+        local = self._local_rules.get((rule.limit, rule.period))
+        if local is None:
+            local = RateLimit(max(1, math.floor(rule.limit * self.local_share)), rule.period)
+            self._local_rules[rule.limit, rule.period] = local
+        now = time.time()
+        bucket = self._local.get(key)
+        if bucket is None:
+            tokens = float(local.limit)
+        else:
+            tokens = min(local.limit, bucket[0] + max(0.0, now - bucket[1]) * local.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._local.set(key, [tokens, now], now + local.period)
+        return RateLimitResult(allowed, local, tokens)
+
+
+rate_limiter = RateLimiter(get_redis, local_share=settings.RATE_LIMIT_LOCAL_SHARE)
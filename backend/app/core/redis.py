@@ -0,0 +1,40 @@
+"""Redis 客户端管理."""
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+_client: Redis | None = None
+
+
+def get_redis() -> Redis:
+    """获取 Redis 客户端单例（懒加载）.
+
+    Returns:
+        Redis 客户端
+    """
+    global _client
+    if _client is None:
+        _client = Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+    return _client
+
+
+def set_redis(client: Redis | None) -> None:
+    """替换 Redis 客户端（测试中可注入进程内替身，如 fakeredis）.
+
+    Args:
+        client: Redis 客户端，None 表示恢复为按配置懒加载
+    """
+    global _client
+    _client = client
+
+
+async def close_redis() -> None:
+    """关闭 Redis 连接池."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,46 @@
+"""响应序列化.
+
+默认路径下，端点返回的对象先按 response_model 校验，再由 FastAPI 转为 JSON 兼容的
+Python 对象，最后由 JSONResponse 编码为 JSON。快速路径（API_FAST_SERIALIZATION）
+使用预构建的 TypeAdapter 校验一次后直接在 pydantic-core 中输出 JSON 字节，
+跳过中间的 Python 对象与二次校验；端点仍声明 response_model 以生成 OpenAPI 文档。
+"""
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+
+class JSONBytesResponse(Response):
+    """内容为已编码 JSON 字节的响应."""
+
+    media_type = "application/json"
+
+
+def fast_json_response(
+    adapter: TypeAdapter[Any],
+    content: Any,
+    status_code: int = 200,
+    response: Response | None = None,
+) -> Any:
+    """按快速序列化配置生成响应.
+
+    Args:
+        adapter: 与端点 response_model 一致的 TypeAdapter
+        content: 响应内容（ORM 对象、字典或模型）
+        status_code: 状态码，快速路径下替代路由装饰器中的 status_code
+        response: 端点注入的 Response；端点直接返回 Response 时 FastAPI 不再合并
+            其响应头（如 ETag、依赖设置的 Cookie），快速路径在此复制
+
+    Returns:
+        开启快速序列化时为 JSONBytesResponse，否则原样返回 content 交由 FastAPI 处理
+    """
+    if not settings.API_FAST_SERIALIZATION:
+        return content
+    value = adapter.validate_python(content, from_attributes=True)
+    fast = JSONBytesResponse(adapter.dump_json(value), status_code=status_code)
+    if response is not None:
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
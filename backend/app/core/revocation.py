@@ -0,0 +1,258 @@
+"""令牌吊销列表.
+
+吊销记录保存在 Redis 中：
+
+- ``auth:revoked``（ZSET）：成员为 ``jti:<令牌 ID>`` 或 ``fam:<令牌族 ID>``，
+  分值为记录的过期时间（不早于被吊销令牌的 exp），过期记录在全量重建时清理；
+- ``auth:revocations``（Stream）：按时间顺序的吊销事件，供各 worker 增量同步。
+
+每个 worker 在本地维护一份布隆过滤器，后台任务每隔 ``sync_interval`` 秒读取新事件
+加入过滤器，因此吊销最多在一个同步间隔后对所有 worker 生效（发起吊销的 worker 立即生效）。
+请求只查询本地过滤器：未命中（绝大多数情况）即判定未吊销，不访问 Redis；
+命中时再用 ZMSCORE 精确确认，排除误判。
+
+布隆过滤器无法删除元素，每隔 ``rebuild_interval`` 秒从 ZSET 全量重建一次，剔除过期记录；
+事件流按 MAXLEN≈``stream_maxlen`` 截断，单个同步间隔内的吊销超过该数量时，
+遗漏的记录在下一次全量重建时补齐。
+
+同步连续失败超过 ``STALE_INTERVALS`` 个间隔后本地过滤器视为过期，改为每次请求
+直接查询 Redis；此时 Redis 仍不可用则拒绝请求（fail-closed），不放行可能已吊销的令牌。
+"""
+import asyncio
+import time
+from typing import Callable, Literal
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+
+logger = get_logger(__name__)
+
+REVOKED_KEY = "auth:revoked"
+EVENTS_KEY = "auth:revocations"
+
+# 同步结果超过若干个间隔未更新即视为过期
+STALE_INTERVALS = 3
+
+# 增量同步每次读取的事件数
+SYNC_BATCH_SIZE = 1000
+
+# 写入吊销记录（分值只增不减）并追加事件
+_REVOKE_SCRIPT = """
+redis.call("ZADD", KEYS[1], "GT", ARGV[1], ARGV[2])
+redis.call("XADD", KEYS[2], "MAXLEN", "~", ARGV[3], "*", "m", ARGV[2])
+return 1
+"""
+
+# 一次性使用刷新令牌：令牌族已吊销返回 -1，令牌已使用过返回 0，成功返回 1
+_CONSUME_SCRIPT = """
+if redis.call("ZSCORE", KEYS[1], ARGV[2]) then
+    return -1
+end
+if redis.call("ZADD", KEYS[1], "NX", ARGV[3], ARGV[1]) == 0 then
+    return 0
+end
+redis.call("XADD", KEYS[2], "MAXLEN", "~", ARGV[4], "*", "m", ARGV[1])
+return 1
+"""
+
+ConsumeResult = Literal["ok", "reused", "family_revoked"]
+
+
+def token_member(jti: str) -> str:
+    """单个令牌的吊销记录成员."""
+    return f"jti:{jti}"
+
+
+def family_member(family: str) -> str:
+    """令牌族（同一次登录轮换出的全部令牌）的吊销记录成员."""
+    return f"fam:{family}"
+
+
+class RevocationList:
+    """Redis 吊销列表 + 本地布隆过滤器."""
+
+    def __init__(
+        self,
+        redis: Callable[[], Redis],
+        sync_interval: float,
+        rebuild_interval: float,
+        capacity: int,
+        error_rate: float = 0.001,
+        stream_maxlen: int = 100_000,
+    ):
+        """初始化.
+
+        Args:
+            redis: 返回 Redis 客户端的函数（客户端可能在关闭后重建）
+            sync_interval: 增量同步间隔（秒），即吊销传播到其他 worker 的最大延迟
+            rebuild_interval: 全量重建间隔（秒）
+            capacity: 布隆过滤器的最小容量，记录更多时按两倍记录数重建
+            error_rate: 布隆过滤器的目标误判率
+            stream_maxlen: 事件流保留的大致条数
+        """
+        self.redis = redis
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.stream_maxlen = stream_maxlen
+        self._filter = BloomFilter(capacity, error_rate)
+        self._last_id = "0-0"
+        self._synced_at: float | None = None
+        self._rebuilt_at = 0.0
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """先完成一次全量加载，再启动后台同步任务（重复调用无副作用）."""
+        if self._task is not None:
+            return
+        try:
+            await self.rebuild()
+        except RedisError as e:
+            logger.warning("Revocation list load failed", error=str(e))
+        self._task = asyncio.create_task(self._run(), name="revocation-sync")
+
+    async def stop(self) -> None:
+        """停止后台同步任务."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                if time.monotonic() - self._rebuilt_at >= self.rebuild_interval:
+                    await self.rebuild()
+                else:
+                    await self.sync()
+            except RedisError as e:
+                logger.warning("Revocation sync failed", error=str(e))
+
+    @property
+    def fresh(self) -> bool:
+        """本地过滤器是否在允许的延迟内与 Redis 同步过."""
+        if self._synced_at is None:
+            return False
+        return time.monotonic() - self._synced_at <= self.sync_interval * STALE_INTERVALS
+
+    async def rebuild(self) -> None:
+        """清理过期记录并从 ZSET 全量重建本地过滤器."""
+        async with self.redis().pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(REVOKED_KEY, "-inf", time.time())
+            pipe.xrevrange(EVENTS_KEY, count=1)
+            pipe.zrange(REVOKED_KEY, 0, -1)
+            _, last, members = await pipe.execute()
+
+        bloom = BloomFilter(max(self.capacity, len(members) * 2), self.error_rate)
+        bloom.update(member.decode() for member in members)
+        self._filter = bloom
+        self._last_id = last[0][0].decode() if last else "0-0"
+        self._synced_at = self._rebuilt_at = time.monotonic()
+        logger.debug("Revocation list rebuilt", records=len(members))
+
+    async def sync(self) -> None:
+        """读取上次同步之后的吊销事件并加入本地过滤器."""
+        redis = self.redis()
+        while True:
+            response = await redis.xread({EVENTS_KEY: self._last_id}, count=SYNC_BATCH_SIZE)
+            entries = response[0][1] if response else []
+            for entry_id, fields in entries:
+                self._filter.add(fields[b"m"].decode())
+                self._last_id = entry_id.decode()
+            if len(entries) < SYNC_BATCH_SIZE:
+                break
+        self._synced_at = time.monotonic()
+
+    async def is_revoked(self, jti: str, family: str | None = None) -> bool:
+        """判断令牌是否已被吊销.
+
+        Args:
+            jti: 令牌 ID
+            family: 令牌族 ID
+
+        Returns:
+            令牌或其所属令牌族已被吊销时为 True
+
+        Raises:
+            ServiceUnavailableException: 本地过滤器已过期且 Redis 不可用
+        """
+        members = [token_member(jti)]
+        if family:
+            members.append(family_member(family))
+        if self.fresh:
+            members = [member for member in members if member in self._filter]
+            if not members:
+                return False
+        try:
+            scores = await self.redis().zmscore(REVOKED_KEY, members)
+        except RedisError as e:
+            logger.error("Revocation check unavailable", error=str(e))
+            raise ServiceUnavailableException(message="Token revocation check unavailable") from e
+        return any(score is not None for score in scores)
+
+    async def revoke(self, *members: str, expires_at: float) -> None:
+        """写入吊销记录（本 worker 立即生效，其他 worker 在下一次同步后生效）.
+
+        Args:
+            *members: 吊销记录成员（token_member / family_member）
+            expires_at: 记录过期时间（Unix 时间戳），不得早于相关令牌的 exp
+
+        Raises:
+            ServiceUnavailableException: Redis 不可用
+        """
+        script = self.redis().register_script(_REVOKE_SCRIPT)
+        try:
+            for member in members:
+                await script(
+                    keys=[REVOKED_KEY, EVENTS_KEY], args=[expires_at, member, self.stream_maxlen]
+                )
+                self._filter.add(member)
+        except RedisError as e:
+            raise ServiceUnavailableException(message="Token revocation unavailable") from e
+
+    async def consume(self, jti: str, family: str, expires_at: float) -> ConsumeResult:
+        """将刷新令牌标记为已使用（原子操作，并发请求中只有一个成功）.
+
+        Args:
+            jti: 刷新令牌 ID
+            family: 令牌族 ID
+            expires_at: 刷新令牌的过期时间（Unix 时间戳）
+
+        Returns:
+            ok：首次使用；reused：令牌已使用过；family_revoked：令牌族已被吊销
+
+        Raises:
+            ServiceUnavailableException: Redis 不可用
+        """
+        script = self.redis().register_script(_CONSUME_SCRIPT)
+        member = token_member(jti)
+        try:
+            result = await script(
+                keys=[REVOKED_KEY, EVENTS_KEY],
+                args=[member, family_member(family), expires_at, self.stream_maxlen],
+            )
+        except RedisError as e:
+            raise ServiceUnavailableException(message="Token revocation unavailable") from e
+        if result == 1:
+            self._filter.add(member)
+            return "ok"
+        return "reused" if result == 0 else "family_revoked"
+
+
+revocation_list = RevocationList(
+    get_redis,
+    sync_interval=settings.AUTH_REVOCATION_SYNC_INTERVAL,
+    rebuild_interval=settings.AUTH_REVOCATION_REBUILD_INTERVAL,
+    capacity=settings.AUTH_REVOCATION_BLOOM_CAPACITY,
+)
@@ -1,4 +1,5 @@
 """安全相关功能：JWT、密码哈希等."""
+import uuid
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -7,10 +8,20 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 from app.core.exceptions import UnauthorizedException
+from app.core.lru import ExpiringLRU
 
 # 密码哈希上下文
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 令牌类型（type 声明），防止刷新令牌被当作访问令牌使用，反之亦然
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+# 已验证令牌的声明（令牌 -> 声明），条目在令牌的 exp 时刻过期
+token_claims_cache: ExpiringLRU[str, dict[str, Any]] = ExpiringLRU(
+    settings.AUTH_TOKEN_CACHE_SIZE
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码.
@@ -40,6 +51,8 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """创建访问令牌.
 
+    每个令牌带有唯一的 ``jti``，可被单独吊销；带 ``fam`` 时随所属令牌族一起吊销。
+
     Args:
         data: 要编码的数据
         expires_delta: 过期时间
@@ -47,7 +60,7 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
     Returns:
         JWT 令牌
     """
-    to_encode = data.copy()
+    to_encode = {"type": ACCESS_TOKEN_TYPE, "jti": uuid.uuid4().hex, **data}
 
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -59,6 +72,34 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
     return encoded_jwt
 
 
+def create_refresh_token(
+    subject: str, family: str | None = None, expires_delta: timedelta | None = None
+) -> str:
+    """创建刷新令牌.
+
+    同一次登录轮换出的刷新令牌属于同一令牌族（``fam``），每个刷新令牌只能使用一次。
+
+    Args:
+        subject: 用户 ID
+        family: 令牌族 ID，为空时开启新的令牌族（新登录）
+        expires_delta: 过期时间，默认 REFRESH_TOKEN_EXPIRE_DAYS
+
+    Returns:
+        JWT 令牌
+    """
+    expire = datetime.utcnow() + (
+        expires_delta or timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    to_encode = {
+        "sub": subject,
+        "type": REFRESH_TOKEN_TYPE,
+        "jti": uuid.uuid4().hex,
+        "fam": family or uuid.uuid4().hex,
+        "exp": expire,
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
 def decode_access_token(token: str) -> dict[str, Any]:
     """解码访问令牌.
 
@@ -79,3 +120,52 @@ def decode_access_token(token: str) -> dict[str, Any]:
             message="Could not validate credentials",
             details={"error": str(e)},
         ) from e
+
+
+def _check_type(claims: dict[str, Any], token_type: str) -> dict[str, Any]:
+    if claims.get("type") != token_type or "jti" not in claims:
+        raise UnauthorizedException(
+            message="Could not validate credentials",
+            details={"error": f"Not a valid {token_type} token"},
+        )
+    return claims
+
+
+def decode_refresh_token(token: str) -> dict[str, Any]:
+    """解码并校验刷新令牌（不检查是否已使用或吊销）.
+
+    Args:
+        token: JWT 令牌
+
+    Returns:
+        令牌声明
+
+    Raises:
+        UnauthorizedException: 令牌无效、过期或不是刷新令牌
+    """
+    return _check_type(decode_access_token(token), REFRESH_TOKEN_TYPE)
+
+
+def verify_access_token(token: str) -> dict[str, Any]:
+    """验证访问令牌，结果按令牌缓存到其过期时刻.
+
+    同一令牌在有效期内只做一次 HMAC 校验与 JSON 解码；校验失败的令牌不缓存。
+    更换 SECRET_KEY 后需调用 ``token_claims_cache.clear()``（重启 worker 亦可）。
+    吊销状态不在此检查，每个请求须另行查询吊销列表。
+
+    Args:
+        token: JWT 令牌
+
+    Returns:
+        令牌声明（与其他请求共享，调用方不得修改）
+
+    Raises:
+        UnauthorizedException: 令牌无效、过期或不是访问令牌
+    """
+    claims = token_claims_cache.get(token)
+    if claims is None:
+        claims = _check_type(decode_access_token(token), ACCESS_TOKEN_TYPE)
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            token_claims_cache.set(token, claims, float(exp))
+    return claims
@@ -0,0 +1,223 @@
+"""数据库连接池监控.
+
+``pool_pre_ping`` 会在每次取出连接时向数据库多发一次往返。关闭它之后由以下机制兜底：
+
+- 取出连接时检查 asyncpg 连接是否已被对端关闭（本地状态，无往返），
+  已关闭则抛出 DisconnectionError，连接池丢弃该连接并重试一次；
+- 后台任务按间隔逐个探测空闲连接，失效的连接被作废并由连接池重建；
+- ``pool_recycle`` 让存活过久的连接在下次取出时重建。
+
+同时统计借出数、溢出数、等待时间、建连失败等指标。
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Sequence
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, PoolProxiedConnection
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 保留最近的等待时间样本数（用于计算分位数）
+WAIT_SAMPLES = 1000
+
+
+class PoolMetrics:
+    """连接池指标."""
+
+    def __init__(self) -> None:
+        """初始化."""
+        self.checkouts = 0
+        self.connects = 0
+        self.connect_failures = 0
+        self.checkout_timeouts = 0
+        self.stale_discarded = 0
+        self.invalidations = 0
+        self.probes = 0
+        self.probe_failures = 0
+        self.wait_seconds_total = 0.0
+        self.waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def observe_wait(self, seconds: float) -> None:
+        """记录一次取连接的等待时间.
+
+        Args:
+            seconds: 等待时间（秒）
+        """
+        self.wait_seconds_total += seconds
+        self.waits.append(seconds)
+
+    def snapshot(self, pool: AsyncAdaptedQueuePool) -> dict[str, Any]:
+        """导出指标快照.
+
+        Args:
+            pool: 连接池
+
+        Returns:
+            指标字典
+        """
+        waits = sorted(self.waits)
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "connect_failures": self.connect_failures,
+            "checkout_timeouts": self.checkout_timeouts,
+            "stale_discarded": self.stale_discarded,
+            "invalidations": self.invalidations,
+            "probes": self.probes,
+            "probe_failures": self.probe_failures,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_p50_ms": round(waits[len(waits) // 2] * 1000, 3) if waits else 0.0,
+            "wait_p99_ms": round(waits[int(len(waits) * 0.99)] * 1000, 3) if waits else 0.0,
+        }
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """记录等待时间与建连失败的异步队列连接池."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """初始化."""
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "MonitoredQueuePool":
+        """重建连接池（dispose 时调用），保留累计指标."""
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool  # type: ignore[return-value]
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.checkout_timeouts += 1
+            raise
+        except Exception:
+            self.metrics.connect_failures += 1
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - started_at)
+        self.metrics.checkouts += 1
+        return record
+
+
+def instrument_engine(engine: AsyncEngine) -> PoolMetrics:
+    """为引擎注册连接池事件.
+
+    Args:
+        engine: 使用 MonitoredQueuePool 的异步引擎
+
+    Returns:
+        连接池指标
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, MonitoredQueuePool):
+        raise TypeError("engine must use MonitoredQueuePool")
+
+    def metrics() -> PoolMetrics:
+        # dispose 后 engine.pool 会被替换，始终从当前连接池读取
+        return engine.sync_engine.pool.metrics  # type: ignore[attr-defined]
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        metrics().connects += 1
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(
+        dbapi_connection: Any, record: ConnectionPoolEntry, proxy: PoolProxiedConnection
+    ) -> None:
+        # 对端已关闭的连接（数据库重启、pg_terminate_backend 等）无需往返即可识别，
+        # 抛出 DisconnectionError 后连接池会丢弃它并重试一次
+        if dbapi_connection.driver_connection.is_closed():
+            metrics().stale_discarded += 1
+            raise exc.DisconnectionError("Connection closed by server")
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def on_invalidate(
+        dbapi_connection: Any, record: ConnectionPoolEntry, exception: BaseException | None
+    ) -> None:
+        metrics().invalidations += 1
+
+    return pool.metrics
+
+
+class PoolMonitor:
+    """后台探测空闲连接."""
+
+    def __init__(self, engines: Sequence[AsyncEngine], interval: float):
+        """初始化.
+
+        Args:
+            engines: 需要探测的引擎
+            interval: 探测间隔（秒）
+        """
+        self.engines = list(engines)
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """启动后台任务（重复调用无副作用）."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="db-pool-monitor")
+            logger.info("Database pool monitor started", interval=self.interval)
+
+    async def stop(self) -> None:
+        """停止后台任务."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            for engine in self.engines:
+                try:
+                    await self.probe(engine)
+                except Exception as e:
+                    logger.warning("Database pool probe failed", error=str(e))
+
+    async def probe(self, engine: AsyncEngine) -> int:
+        """逐个探测当前空闲的连接.
+
+        连接池为 FIFO，依次取出再归还即可轮询到每个空闲连接；
+        断开类错误会使 SQLAlchemy 作废该连接，连接池随后重建。
+
+        Args:
+            engine: 引擎
+
+        Returns:
+            探测失败的连接数
+        """
+        pool = engine.sync_engine.pool
+        metrics: PoolMetrics = pool.metrics  # type: ignore[attr-defined]
+        failures = 0
+        for _ in range(pool.checkedin()):
+            metrics.probes += 1
+            try:
+                async with engine.connect() as conn:
+                    await conn.exec_driver_sql("SELECT 1")
+            except exc.DBAPIError as e:
+                failures += 1
+                metrics.probe_failures += 1
+                if not e.connection_invalidated:
+                    raise
+        if failures:
+            logger.warning("Recycled stale pooled connections", count=failures)
+        return failures
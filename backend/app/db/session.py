@@ -1,18 +1,102 @@
 """数据库会话管理."""
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import time
+import uuid
+from http.cookies import SimpleCookie
+from typing import Any, AsyncGenerator, Awaitable, Callable, Sequence
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.pool import MonitoredQueuePool, PoolMonitor, instrument_engine
+
+logger = get_logger(__name__)
+
+# 读己之写：最近一次写请求的时间戳
+READ_YOUR_WRITES_COOKIE = "db_last_write"
+
+# 请求提交了写入时在 ASGI scope["state"] 中的标记（由 ReadYourWritesMiddleware 下发 Cookie）
+COMMITTED_WRITE_STATE = "db_committed_write"
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def build_connect_args(pgbouncer_mode: bool | None = None) -> dict[str, Any]:
+    """构建 asyncpg 连接参数.
+
+    常规模式下，每个连接缓存最近使用的预编译语句，热点查询只需 Bind/Execute。
+    PgBouncer 事务池模式下，同一客户端连接的相邻事务可能落在不同的服务端连接上，
+    缓存的语句名会失效或冲突，因此关闭缓存并为每条语句生成唯一名称。
+
+    Args:
+        pgbouncer_mode: 是否为 PgBouncer 模式，默认取 DB_PGBOUNCER_MODE
+
+    Returns:
+        连接参数
+    """
+    if settings.DB_PGBOUNCER_MODE if pgbouncer_mode is None else pgbouncer_mode:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+
+
+def create_engine(url: str, **connect_args: Any) -> AsyncEngine:
+    """按连接池配置创建引擎并注册连接池监控.
+
+    Args:
+        url: 数据库地址
+        **connect_args: 额外的 asyncpg 连接参数
+
+    Returns:
+        异步引擎
+    """
+    db_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=MonitoredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,  # 连接健康检查
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={**build_connect_args(), **connect_args},
+    )
+    instrument_engine(db_engine)
+    return db_engine
+
 
 # 创建异步引擎
-engine = create_async_engine(
-    str(settings.DATABASE_URL),
-    echo=settings.DB_ECHO,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_pre_ping=True,  # 连接健康检查
-)
+engine = create_engine(str(settings.DATABASE_URL))
+
+# 只读事务（BEGIN READ ONLY，不额外增加往返）
+READ_ONLY_OPTIONS = {"postgresql_readonly": True}
+
+# 主库上的只读视图，与 engine 共享连接池
+primary_read_engine = engine.execution_options(**READ_ONLY_OPTIONS)
+
+# 只读副本
+replica_engines = [
+    create_engine(url, timeout=settings.DB_REPLICA_CONNECT_TIMEOUT).execution_options(
+        **READ_ONLY_OPTIONS
+    )
+    for url in settings.read_replica_urls
+]
+
+# 关闭 pre-ping 时由后台任务探测空闲连接
+pool_monitor = PoolMonitor([engine, *replica_engines], settings.DB_POOL_MONITOR_INTERVAL)
 
 # 创建异步会话工厂
 AsyncSessionLocal = async_sessionmaker(
@@ -23,19 +107,258 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# 只读会话工厂（按请求绑定到副本或主库）
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
+class ReplicaRouter:
+    """只读副本路由：轮询分发，连接失败的副本暂时摘除，全部不可用时回退主库."""
+
+    def __init__(
+        self, replicas: Sequence[AsyncEngine], fallback: AsyncEngine, failover_seconds: float
+    ):
+        """初始化.
+
+        Args:
+            replicas: 副本引擎
+            fallback: 回退引擎（主库）
+            failover_seconds: 副本被摘除的时间（秒）
+        """
+        self.replicas = list(replicas)
+        self.fallback = fallback
+        self.failover_seconds = failover_seconds
+        self._counter = itertools.count()
+        self._down_until: dict[int, float] = {}
+
+    def candidates(self) -> list[AsyncEngine]:
+        """按尝试顺序返回引擎：从轮询位置开始的健康副本，最后是主库.
+
+        Returns:
+            引擎列表
+        """
+        if not self.replicas:
+            return [self.fallback]
+        now = time.monotonic()
+        start = next(self._counter) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        healthy = [
+            replica for replica in ordered if self._down_until.get(id(replica), 0.0) <= now
+        ]
+        return [*healthy, self.fallback]
+
+    def mark_down(self, replica: AsyncEngine) -> None:
+        """摘除连接失败的副本.
+
+        Args:
+            replica: 副本引擎
+        """
+        if replica is self.fallback:
+            return
+        self._down_until[id(replica)] = time.monotonic() + self.failover_seconds
+        logger.warning(
+            "Read replica unavailable, failing over",
+            replica=replica.url.render_as_string(hide_password=True),
+            retry_in_seconds=self.failover_seconds,
+        )
+
+    def status(self) -> list[dict[str, object]]:
+        """副本健康状态.
+
+        Returns:
+            每个副本的地址与是否可用
+        """
+        now = time.monotonic()
+        return [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "available": self._down_until.get(id(replica), 0.0) <= now,
+            }
+            for replica in self.replicas
+        ]
+
+
+replica_router = ReplicaRouter(
+    replica_engines, primary_read_engine, settings.DB_REPLICA_FAILOVER_SECONDS
+)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """注册在会话成功提交后执行的异步回调（如缓存失效）.
+
+    Args:
+        session: 数据库会话
+        callback: 异步回调
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def commit_session(session: AsyncSession) -> None:
+    """提交事务，成功后依次执行 after_commit 注册的回调.
+
+    Args:
+        session: 数据库会话
+    """
+    await session.commit()
+    for callback in session.info.pop("after_commit", []):
+        await callback()
+
+
+def mark_write(session: AsyncSession) -> None:
+    """记录会话写入了数据（提交成功后才对客户端下发读己之写 Cookie）.
+
+    Args:
+        session: 数据库会话
+    """
+    session.info["wrote"] = True
+
+
+def recent_write_cookie() -> str | None:
+    """生成读己之写 Cookie，窗口期内该客户端的读请求走主库.
+
+    Returns:
+        Set-Cookie 头的值，未开启读己之写时为 None
+    """
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    if window <= 0:
+        return None
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[READ_YOUR_WRITES_COOKIE] = f"{time.time():.3f}"
+    morsel = cookie[READ_YOUR_WRITES_COOKIE]
+    morsel["max-age"] = max(1, int(window + 0.999))
+    morsel["path"] = "/"
+    morsel["httponly"] = True
+    morsel["samesite"] = "lax"
+    return morsel.OutputString()
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """会话是否绑定在只读副本上（数据可能滞后于主库）.
+
+    Args:
+        session: 数据库会话
+
+    Returns:
+        由 open_read_session 分配到副本时为 True
+    """
+    return bool(session.info.get("replica"))
+
+
+def has_recent_write(request: Request) -> bool:
+    """客户端是否处于读己之写窗口期内.
+
+    Args:
+        request: 请求对象
+
+    Returns:
+        是否应读取主库
+    """
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    raw = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if window <= 0 or not raw:
+        return False
+    try:
+        return time.time() - float(raw) < window
+    except ValueError:
+        return False
+
+
+async def open_read_session(*, use_primary: bool = False) -> AsyncSession:
+    """打开只读会话，并立即建立连接以便在副本不可用时故障转移.
+
+    Args:
+        use_primary: 是否直接使用主库（读己之写）
+
+    Returns:
+        已连接的只读会话，调用方负责关闭
+    """
+    engines = [primary_read_engine] if use_primary else replica_router.candidates()
+    for index, read_engine in enumerate(engines):
+        session = ReadSessionLocal(bind=read_engine)
+        try:
+            await session.connection()
+            session.info["replica"] = read_engine is not primary_read_engine
+            return session
+        except (DBAPIError, OSError, asyncio.TimeoutError):
+            await session.close()
+            if index == len(engines) - 1:
+                raise
+            replica_router.mark_down(read_engine)
+    raise RuntimeError("No database engine available")  # pragma: no cover
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """获取数据库会话（依赖注入）.
 
+    只有提交成功且确实写入了数据（见 mark_write）的请求才下发读己之写 Cookie。
+    依赖退出时 FastAPI 已合并完子响应的响应头，因此只在 scope 中记录，
+    由 ReadYourWritesMiddleware 在响应头发送时追加 Cookie。
+
+    Args:
+        request: 请求对象
+
     Yields:
         数据库会话
     """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            await commit_session(session)
+            if session.info.pop("wrote", False):
+                request.scope.setdefault("state", {})[COMMITTED_WRITE_STATE] = True
         except Exception:
+            session.info.pop("after_commit", None)
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """获取只读数据库会话（依赖注入）.
+
+    事务以 READ ONLY 开启，结束时直接关闭（回滚），不发送 COMMIT。
+    配置了副本时轮询副本，否则使用主库。
+
+    Args:
+        request: 请求对象
+
+    Yields:
+        只读数据库会话
+    """
+    session = await open_read_session(use_primary=has_recent_write(request))
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def pool_status() -> dict[str, dict[str, Any]]:
+    """各连接池的指标快照.
+
+    Returns:
+        引擎名称（primary / replica-N）-> 指标
+    """
+    engines = {"primary": engine}
+    engines.update({f"replica-{i}": replica for i, replica in enumerate(replica_engines)})
+    return {
+        name: db_engine.sync_engine.pool.metrics.snapshot(db_engine.sync_engine.pool)
+        for name, db_engine in engines.items()
+    }
+
+
+async def start_db() -> None:
+    """启动数据库相关的后台任务."""
+    if not settings.DB_POOL_PRE_PING and settings.DB_POOL_MONITOR_INTERVAL > 0:
+        pool_monitor.start()
+
+
+async def close_db() -> None:
+    """停止后台任务并释放主库与副本的连接池."""
+    await pool_monitor.stop()
+    for db_engine in (engine, *replica_engines):
+        await db_engine.dispose()
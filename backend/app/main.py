@@ -2,29 +2,57 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.exceptions import AppException, app_exception_handler
-from app.core.logging import get_logger, setup_logging
+from app.core.hashing import hashing_executor
+from app.core.logging import get_logger, setup_logging, shutdown_logging
+from app.core.metrics import PoolStatsSampler, mark_process_dead, render_metrics
+from app.core.rate_limit import RateLimit, rate_limiter
+from app.core.redis import close_redis
+from app.core.revocation import revocation_list
+from app.db.session import close_db, pool_status, start_db
 from app.middleware.correlation_id import CorrelationIdMiddleware
 from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.services.health_service import readiness_checker
+from app.services.user_import_jobs import user_import_jobs
 
 # 设置日志
 setup_logging()
 logger = get_logger(__name__)
 
+pool_stats_sampler = PoolStatsSampler(pool_status, settings.METRICS_POOL_SAMPLE_INTERVAL)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """应用生命周期管理."""
     # 启动
     logger.info("Application startup", app_name=settings.APP_NAME, version=settings.APP_VERSION)
+    hashing_executor.start()
+    await start_db()
+    await readiness_checker.start()
+    await revocation_list.start()
+    if settings.METRICS_ENABLED:
+        pool_stats_sampler.start()
     yield
     # 关闭
+    await user_import_jobs.stop()
+    await pool_stats_sampler.stop()
+    await readiness_checker.stop()
+    await revocation_list.stop()
+    mark_process_dead()
+    await hashing_executor.shutdown()
+    await close_redis()
+    await close_db()
     logger.info("Application shutdown")
+    shutdown_logging()
 
 
 # 创建 FastAPI 应用
@@ -38,6 +66,24 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 读己之写 Cookie（最内层：写会话在依赖退出时提交，之后才发送响应头）
+app.add_middleware(ReadYourWritesMiddleware)
+
+# 限流中间件（位于 CORS 内层：429 响应同样带 CORS 头，预检请求也不消耗配额）
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=rate_limiter,
+        routes=app.routes,
+        route_limits={
+            route: RateLimit.parse(rate) for route, rate in settings.rate_limit_routes.items()
+        },
+        default_limit=(
+            RateLimit.parse(settings.RATE_LIMIT_DEFAULT) if settings.RATE_LIMIT_DEFAULT else None
+        ),
+        exempt_paths=settings.rate_limit_exempt_paths,
+    )
+
 # CORS 中间件
 app.add_middleware(
     CORSMiddleware,
@@ -45,11 +91,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 跨域客户端需要读取 ETag 才能发送 If-Match，读取限流头才能退避
+    expose_headers=[
+        "ETag",
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+        "RateLimit-Policy",
+        "Retry-After",
+    ],
 )
 
-# 自定义中间件
-app.add_middleware(CorrelationIdMiddleware)
+# 自定义中间件（后添加的在外层：关联 ID 先绑定，请求日志才能带上 request_id）
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(CorrelationIdMiddleware)
 
 # 异常处理器
 app.add_exception_handler(AppException, app_exception_handler)
@@ -66,3 +123,13 @@ async def root() -> dict[str, str]:
         "docs": "/docs",
         "version": settings.APP_VERSION,
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus 指标（多 worker 时汇总所有 worker）."""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    pool_stats_sampler.sample()
+    content, content_type = render_metrics()
+    return Response(content=content, headers={"Content-Type": content_type})
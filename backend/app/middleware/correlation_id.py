@@ -1,40 +1,53 @@
 """请求追踪 ID 中间件."""
 import uuid
-from typing import Any
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    """为每个请求生成唯一的关联 ID."""
+class CorrelationIdMiddleware:
+    """为每个请求生成唯一的关联 ID.
 
-    async def dispatch(self, request: Request, call_next: Any) -> Response:
-        """处理请求.
+    纯 ASGI 实现：不经过 BaseHTTPMiddleware 的任务切换与响应包装，
+    只在 ``http.response.start`` 消息中追加响应头，因此不会缓冲流式响应，
+    绑定的 contextvars 也能直接传递到路由处理函数。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """初始化.
 
         Args:
-            request: 请求对象
-            call_next: 下一个中间件
+            app: 下游 ASGI 应用
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """处理请求.
 
-        Returns:
-            响应对象
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive 通道
+            send: ASGI send 通道
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # 从请求头获取或生成新的 request_id
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        request_id = Headers(scope=scope).get("x-request-id") or str(uuid.uuid4())
 
         # 绑定到 structlog 上下文
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(request_id=request_id)
 
-        # 将 request_id 附加到请求状态
-        request.state.request_id = request_id
-
-        # 处理请求
-        response: Response = await call_next(request)
+        # 将 request_id 附加到请求状态（request.state.request_id）
+        scope.setdefault("state", {})["request_id"] = request_id
 
-        # 在响应头中返回 request_id
-        response.headers["X-Request-ID"] = request_id
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 在响应头中返回 request_id
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_request_id)
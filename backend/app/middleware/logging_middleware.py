@@ -1,55 +1,74 @@
 """请求日志中间件"""
 import time
-from typing import Any
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """记录所有请求的详细信息."""
+class LoggingMiddleware:
+    """记录所有请求的详细信息.
 
-    async def dispatch(self, request: Request, call_next: Any) -> Response:
-        """处理请求.
+    纯 ASGI 实现，处理时间在响应头发出时写入 ``X-Process-Time``，
+    完成日志在响应体全部发送后记录（流式响应同样适用）。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """初始化.
 
         Args:
-            request: 请求对象
-            call_next: 下一个中间件
+            app: 下游 ASGI 应用
+        """
+        self.app = app
 
-        Returns:
-            响应对象
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """处理请求.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive 通道
+            send: ASGI send 通道
         """
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
 
         # 记录请求信息
         logger.info(
             "Request started",
-            method=request.method,
-            path=request.url.path,
-            client_host=request.client.host if request.client else None,
+            method=method,
+            path=path,
+            client_host=client[0] if client else None,
         )
 
-        # 处理请求
-        response: Response = await call_next(request)
-
-        # 计算处理时间
-        process_time = time.time() - start_time
-
-        # 记录响应信息
-        logger.info(
-            "Request completed",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            process_time=f"{process_time:.3f}s",
-        )
+        status_code = 500
 
-        # 添加处理时间到响应头
-        response.headers["X-Process-Time"] = f"{process_time:.3f}"
+        async def send_with_process_time(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # 添加处理时间到响应头
+                process_time = time.perf_counter() - start_time
+                MutableHeaders(scope=message)["X-Process-Time"] = f"{process_time:.3f}"
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_with_process_time)
+        finally:
+            # 记录响应信息
+            process_time = time.perf_counter() - start_time
+            logger.info(
+                "Request completed",
+                method=method,
+                path=path,
+                status_code=status_code,
+                process_time=f"{process_time:.3f}s",
+            )
@@ -0,0 +1,58 @@
+"""请求指标中间件."""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import REQUEST_DURATION, REQUESTS_IN_PROGRESS
+
+# 未匹配任何路由的请求（404 等）统一归为一个标签，避免原始路径导致标签基数失控
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """记录请求耗时直方图与处理中请求数.
+
+    路由标签取 FastAPI 匹配到的路由模板（如 ``/api/v1/users/{user_id}``），
+    而不是原始路径。路由匹配发生在下游，完成后从共享的 scope 中读取。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """初始化.
+
+        Args:
+            app: 下游 ASGI 应用
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """处理请求.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive 通道
+            send: ASGI send 通道
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start_time = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = getattr(scope.get("route"), "path_format", UNMATCHED_ROUTE)
+            REQUEST_DURATION.labels(method=method, route=route, status=str(status_code)).observe(
+                time.perf_counter() - start_time
+            )
@@ -0,0 +1,136 @@
+"""限流中间件."""
+import re
+from typing import Mapping, Sequence
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging import get_logger
+from app.core.rate_limit import RateLimit, RateLimiter, RateLimitResult
+
+logger = get_logger(__name__)
+
+# 未单独配置的路由共用的令牌桶名称
+DEFAULT_RULE = "default"
+
+
+class RateLimitMiddleware:
+    """按路由与客户端 IP 限流，响应带 ``RateLimit-*`` 头，超限返回 429.
+
+    路由规则以 ``"方法 路由模板"`` 为键（如 ``POST /api/v1/users``），每条规则每个客户端
+    一个令牌桶；其余路由共用每个客户端一个默认令牌桶。限流在路由匹配之前执行，
+    因此首个请求时把配置的路由模板解析为对应路由的路径正则，之后逐条匹配。
+    客户端取 ASGI scope 中的地址，部署在反向代理后时需开启 uvicorn 的 ``--proxy-headers``，
+    并用 ``--forwarded-allow-ips`` 只信任代理的地址（信任任意来源时客户端可伪造
+    ``X-Forwarded-For`` 更换令牌桶）。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter,
+        routes: Sequence[BaseRoute],
+        route_limits: Mapping[str, RateLimit],
+        default_limit: RateLimit | None = None,
+        exempt_paths: Sequence[str] = (),
+    ) -> None:
+        """初始化.
+
+        Args:
+            app: 下游 ASGI 应用
+            limiter: 限流器
+            routes: 应用的路由表（FastAPI ``app.routes``，在首个请求时读取）
+            route_limits: 路由规则，键为 ``"方法 路由模板"``
+            default_limit: 其余路由的默认规则，None 表示不限流
+            exempt_paths: 不限流的路径前缀（健康检查、指标等）
+        """
+        self.app = app
+        self.limiter = limiter
+        self.routes = routes
+        self.route_limits = route_limits
+        self.default_limit = default_limit
+        self.exempt_paths = tuple(exempt_paths)
+        self._rules: list[tuple[str, re.Pattern[str], str, RateLimit]] | None = None
+
+    def _compile(self) -> list[tuple[str, re.Pattern[str], str, RateLimit]]:
+        rules = []
+        for route in self.routes:
+            path_format = getattr(route, "path_format", None)
+            for method in getattr(route, "methods", None) or ():
+                name = f"{method} {path_format}"
+                if name in self.route_limits:
+                    rules.append((method, route.path_regex, name, self.route_limits[name]))
+        unknown = set(self.route_limits) - {name for _, _, name, _ in rules}
+        if unknown:
+            logger.warning("Rate limit rules match no route", rules=sorted(unknown))
+        return rules
+
+    def _match(self, method: str, path: str) -> tuple[str, RateLimit | None]:
+        if self._rules is None:
+            self._rules = self._compile()
+        for rule_method, regex, name, limit in self._rules:
+            if rule_method == method and regex.match(path):
+                return name, limit
+        return DEFAULT_RULE, self.default_limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """处理请求.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive 通道
+            send: ASGI send 通道
+        """
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        name, limit = self._match(scope["method"], scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        result = await self.limiter.hit(f"{name}:{client[0] if client else 'unknown'}", limit)
+        headers = [
+            (b"ratelimit-limit", str(result.limit).encode()),
+            (b"ratelimit-remaining", str(result.remaining).encode()),
+            (b"ratelimit-reset", str(result.reset).encode()),
+            (b"ratelimit-policy", limit.policy.encode()),
+        ]
+        if not result.allowed:
+            await self._reject(scope, send, result, headers)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 下游不会设置这些头，直接追加，省去逐个查重替换
+                MutableHeaders(scope=message).raw.extend(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    async def _reject(
+        self, scope: Scope, send: Send, result: RateLimitResult, headers: list[tuple[bytes, bytes]]
+    ) -> None:
+        # 与 app_exception_handler 的错误响应格式一致
+        body = orjson.dumps(
+            {
+                "error": {
+                    "code": "RATE_LIMITED",
+                    "message": "Too many requests",
+                    "details": {"retry_after": result.retry_after},
+                    "request_id": scope.get("state", {}).get("request_id"),
+                }
+            }
+        )
+        raw_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(result.retry_after).encode()),
+            *headers,
+        ]
+        await send({"type": "http.response.start", "status": 429, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
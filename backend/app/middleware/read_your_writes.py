@@ -0,0 +1,44 @@
+"""读己之写 Cookie 中间件."""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.session import COMMITTED_WRITE_STATE, recent_write_cookie
+
+
+class ReadYourWritesMiddleware:
+    """请求提交了写入时下发读己之写 Cookie.
+
+    写会话在依赖退出时才提交，此时 FastAPI 已构建好响应、不再合并依赖设置的响应头，
+    因此 get_db 只在 ``scope["state"]`` 中记录，这里在 ``http.response.start`` 中追加 Cookie。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """初始化.
+
+        Args:
+            app: 下游 ASGI 应用
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """处理请求.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive 通道
+            send: ASGI send 通道
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and scope.get("state", {}).get(
+                COMMITTED_WRITE_STATE
+            ):
+                cookie = recent_write_cookie()
+                if cookie:
+                    MutableHeaders(scope=message).append("set-cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,5 +1,5 @@
 """用户模型."""
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base, TimestampMixin
@@ -9,6 +9,19 @@ class User(Base, TimestampMixin):
     """用户模型."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # 游标分页排序键
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # 列表过滤（迁移 c4d7e2f19a63）
+        Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
+        Index(
+            "ix_users_superuser_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_superuser"),
+        ),
+        # 搜索用的 lower(username/email/full_name) gin_trgm_ops 索引由迁移 8b1e4d6c2a90 创建
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
@@ -1,17 +1,81 @@
 """基础 Repository."""
-from typing import Any, Generic, Type, TypeVar
+import operator
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Iterable,
+    Mapping,
+    Sequence,
+    Type,
+    TypeVar,
+)
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import (
+    Executable,
+    Row,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    func,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.exceptions import ConflictException, ValidationException
+from app.core.pagination import CountStrategy, decode_cursor, encode_cursor
 from app.db.base import Base
+from app.db.session import after_commit, mark_write
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# 多行 INSERT 每条语句的行数（asyncpg 单条语句最多 32767 个绑定参数）
+INSERT_BATCH_SIZE = 1000
+
+# 进程内精确计数缓存：表名 -> (总数, 过期时间)
+_count_cache: dict[str, tuple[int, float]] = {}
+
+# PostgreSQL unique_violation
+UNIQUE_VIOLATION = "23505"
+
+# 过滤运算符
+FILTER_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ge": operator.ge,
+    "lt": operator.lt,
+}
+
+# 预构建语句注册表：(模型, 名称) -> 使用 bindparam 的语句
+# 热点查询只构建一次，每次执行只传参数，省去构造 select() 的开销；
+# SQLAlchemy 以语句缓存键命中编译缓存，asyncpg 再以 SQL 文本命中预编译语句缓存
+_statements: dict[tuple[type, str], Executable] = {}
+
 
 class BaseRepository(Generic[ModelType]):
     """基础 Repository，提供通用 CRUD 操作."""
 
+    # 游标分页的默认排序键，需有对应的（复合）索引，且最后一列唯一
+    cursor_keys: Sequence[str] = ("id",)
+
+    # 允许的排序：名称 -> 排序键（要求同 cursor_keys），未列出的排序一律拒绝
+    sort_keys: dict[str, Sequence[str]] = {}
+
+    # 允许的过滤条件：参数名 -> (列名, 运算符)，每个条件都应有索引支撑
+    filter_fields: dict[str, tuple[str, str]] = {}
+
+    # 唯一约束（或唯一索引）名 -> (字段名, 冲突时的错误消息)
+    unique_constraints: dict[str, tuple[str, str]] = {}
+
     def __init__(self, model: Type[ModelType], db: AsyncSession):
         """初始化.
 
@@ -22,6 +86,22 @@ class BaseRepository(Generic[ModelType]):
         self.model = model
         self.db = db
 
+    def statement(self, name: str, build: Callable[[], Executable]) -> Executable:
+        """从注册表获取预构建语句，首次使用时构建.
+
+        Args:
+            name: 语句名称（在同一模型内唯一）
+            build: 构建函数，参数须使用 bindparam 声明
+
+        Returns:
+            预构建语句
+        """
+        key = (self.model, name)
+        stmt = _statements.get(key)
+        if stmt is None:
+            stmt = _statements[key] = build()
+        return stmt
+
     async def get(self, id: Any) -> ModelType | None:
         """根据 ID 获取单条记录.
 
@@ -31,9 +111,54 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             模型实例 或 None
         """
-        result = await self.db.execute(select(self.model).where(self.model.id == id))
+        stmt = self.statement(
+            "get", lambda: select(self.model).where(self.model.id == bindparam("id"))
+        )
+        result = await self.db.execute(stmt, {"id": id})
         return result.scalar_one_or_none()
 
+    async def get_version(self, id: Any, *, for_update: bool = False) -> datetime | None:
+        """只查询记录的 ``updated_at``（模型须包含 TimestampMixin）.
+
+        用于 ETag 校验：不加载整行，也不创建 ORM 对象。
+
+        Args:
+            id: 记录 ID
+            for_update: 是否加行锁（FOR UPDATE），在当前事务结束前阻止并发修改
+
+        Returns:
+            最后更新时间 或 None（记录不存在）
+        """
+
+        def build() -> Executable:
+            stmt = select(self.model.updated_at).where(self.model.id == bindparam("id"))
+            return stmt.with_for_update() if for_update else stmt
+
+        stmt = self.statement("get_version_for_update" if for_update else "get_version", build)
+        return (await self.db.execute(stmt, {"id": id})).scalar_one_or_none()
+
+    async def get_many(self, ids: Sequence[Any]) -> list[ModelType]:
+        """根据多个 ID 获取记录（一次 ``id = ANY(:ids)`` 查询）.
+
+        ID 以单个数组参数传递，SQL 文本与 ID 数量无关，可复用同一条预编译语句。
+
+        Args:
+            ids: 记录 ID
+
+        Returns:
+            存在的模型实例（顺序不保证与 ids 一致）
+        """
+        if not ids:
+            return []
+        stmt = self.statement(
+            "get_many",
+            lambda: select(self.model).where(
+                self.model.id == any_(bindparam("ids", type_=ARRAY(self.model.id.type)))
+            ),
+        )
+        result = await self.db.execute(stmt, {"ids": list(ids)})
+        return list(result.scalars().all())
+
     async def get_multi(self, *, skip: int = 0, limit: int = 100) -> list[ModelType]:
         """获取多条记录（分页）.
 
@@ -47,45 +172,313 @@ class BaseRepository(Generic[ModelType]):
         result = await self.db.execute(select(self.model).offset(skip).limit(limit))
         return list(result.scalars().all())
 
+    async def get_page(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int = 20,
+        descending: bool = False,
+        filters: Mapping[str, Any] | None = None,
+        sort: str | None = None,
+    ) -> tuple[list[ModelType], str | None]:
+        """按排序键做 keyset 分页.
+
+        与 OFFSET 不同，查询通过行值比较直接定位到游标之后的位置，
+        深页不会变慢，并发插入也不会导致记录在页间漂移。
+        游标只对生成它时的排序与过滤条件有效，排序不一致的游标会被拒绝。
+
+        Args:
+            cursor: 上一页返回的游标，为空时从头开始
+            limit: 每页数量
+            descending: 是否倒序
+            filters: 过滤条件（键须在 filter_fields 中，值为 None 的条件被忽略）
+            sort: 排序名称（须在 sort_keys 中），默认按 cursor_keys
+
+        Returns:
+            (模型实例列表, 下一页游标)，没有更多数据时游标为 None
+        """
+        keys = self._sort_keys(sort)
+        stmt = self._page_statement(
+            self._filter(select(self.model), filters), cursor, limit, descending, keys, sort
+        )
+        items = list((await self.db.scalars(stmt)).all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor([getattr(items[-1], key) for key in keys], sort)
+        return items, next_cursor
+
+    async def get_page_rows(
+        self,
+        columns: Sequence[str],
+        *,
+        cursor: str | None = None,
+        limit: int = 20,
+        descending: bool = False,
+        filters: Mapping[str, Any] | None = None,
+        sort: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """keyset 分页的 Core 快速路径：只查询指定列，返回普通字典.
+
+        不创建 ORM 对象、不进入 identity map，适合只读列表直接交给响应序列化
+        （普通字典比 RowMapping 的逐键访问更快）。
+
+        Args:
+            columns: 列名（缺少的排序键会自动补上）
+            cursor: 上一页返回的游标，为空时从头开始
+            limit: 每页数量
+            descending: 是否倒序
+            filters: 过滤条件（键须在 filter_fields 中，值为 None 的条件被忽略）
+            sort: 排序名称（须在 sort_keys 中），默认按 cursor_keys
+
+        Returns:
+            (行字典列表, 下一页游标)，没有更多数据时游标为 None
+        """
+        keys = self._sort_keys(sort)
+        names = [*columns, *(key for key in keys if key not in columns)]
+        stmt = self._page_statement(
+            self._filter(select(*(getattr(self.model, name) for name in names)), filters),
+            cursor,
+            limit,
+            descending,
+            keys,
+            sort,
+        )
+        result = await self.db.execute(stmt)
+        rows = [dict(zip(names, row)) for row in result]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][key] for key in keys], sort)
+        return rows, next_cursor
+
+    def _sort_keys(self, sort: str | None) -> Sequence[str]:
+        """解析排序名称.
+
+        Raises:
+            ValidationException: 排序不在白名单中
+        """
+        if sort is None:
+            return self.cursor_keys
+        keys = self.sort_keys.get(sort)
+        if keys is None:
+            raise ValidationException(
+                message="Unsupported sort", details={"sort": sort, "allowed": list(self.sort_keys)}
+            )
+        return keys
+
+    def _filter(self, stmt: Select[Any], filters: Mapping[str, Any] | None) -> Select[Any]:
+        """按白名单添加过滤条件.
+
+        Raises:
+            ValidationException: 过滤条件不在白名单中
+        """
+        for name, value in (filters or {}).items():
+            if value is None:
+                continue
+            field = self.filter_fields.get(name)
+            if field is None:
+                raise ValidationException(
+                    message="Unsupported filter",
+                    details={"filter": name, "allowed": list(self.filter_fields)},
+                )
+            column, op = field
+            stmt = stmt.where(FILTER_OPERATORS[op](getattr(self.model, column), value))
+        return stmt
+
+    async def count_filtered(self, filters: Mapping[str, Any]) -> int:
+        """按过滤条件精确计数.
+
+        Args:
+            filters: 过滤条件（同 get_page_rows）
+
+        Returns:
+            满足条件的记录数
+        """
+        stmt = self._filter(select(func.count()).select_from(self.model), filters)
+        return (await self.db.execute(stmt)).scalar_one()
+
+    def _page_statement(
+        self,
+        stmt: Select[Any],
+        cursor: str | None,
+        limit: int,
+        descending: bool,
+        keys: Sequence[str],
+        sort: str | None,
+    ) -> Select[Any]:
+        """为查询加上游标条件、排序与 limit（多取一条用于判断是否还有下一页）."""
+        columns = [getattr(self.model, key) for key in keys]
+
+        if cursor:
+            python_types = [column.type.python_type for column in columns]
+            values = decode_cursor(cursor, python_types, sort)
+            position, boundary = tuple_(*columns), tuple_(*values)
+            stmt = stmt.where(position < boundary if descending else position > boundary)
+
+        order = [column.desc() if descending else column.asc() for column in columns]
+        return stmt.order_by(*order).limit(limit + 1)
+
+    async def stream_rows(
+        self, columns: Sequence[str], *, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """通过服务端游标按批流式读取指定列（按主键排序）.
+
+        每批只在内存中保留 ``batch_size`` 行，调用方暂停消费时游标也随之暂停，
+        内存占用与表大小无关。
+
+        Args:
+            columns: 列名
+            batch_size: 每批行数
+
+        Yields:
+            一批行
+        """
+        stmt = (
+            select(*(getattr(self.model, column) for column in columns))
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions(batch_size):
+            yield partition
+
+    def _conflict(self, error: IntegrityError, values: dict[str, Any]) -> ConflictException:
+        """将唯一约束冲突转换为 ConflictException，其他完整性错误原样抛出."""
+        if getattr(error.orig, "sqlstate", None) != UNIQUE_VIOLATION:
+            raise error
+        # asyncpg 的原始异常带有约束名
+        constraint = getattr(error.orig.__cause__, "constraint_name", None)
+        field, message = self.unique_constraints.get(
+            constraint or "", (None, "Resource already exists")
+        )
+        details = {field: values[field]} if field in values else {"constraint": constraint}
+        return ConflictException(message=message, details=details)
+
     async def create(self, **kwargs: Any) -> ModelType:
-        """创建记录.
+        """创建记录（单条 INSERT ... RETURNING）.
+
+        唯一约束冲突由数据库判定，失败后当前事务不可再用，调用方应让异常向上传播。
 
         Args:
             **kwargs: 模型字段
 
         Returns:
             创建的模型实例
+
+        Raises:
+            ConflictException: 违反唯一约束
         """
-        obj = self.model(**kwargs)
-        self.db.add(obj)
-        await self.db.flush()
-        await self.db.refresh(obj)
+        stmt = insert(self.model).values(**kwargs).returning(self.model)
+        try:
+            obj = (await self.db.scalars(stmt)).one()
+        except IntegrityError as e:
+            raise self._conflict(e, kwargs) from e
+        mark_write(self.db)
+        self.invalidate_count()
         return obj
 
+    async def create_many(
+        self, rows: list[dict[str, Any]], *, skip_conflicts: bool = False
+    ) -> list[ModelType]:
+        """批量创建记录（多行 INSERT ... RETURNING）.
+
+        Args:
+            rows: 每条记录的字段字典
+            skip_conflicts: 是否跳过违反唯一约束的行（ON CONFLICT DO NOTHING）
+
+        Returns:
+            实际插入的模型实例（跳过的行不在其中）
+
+        Raises:
+            ConflictException: 未跳过冲突时违反唯一约束
+        """
+        created: list[ModelType] = []
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            stmt = insert(self.model).values(rows[start : start + INSERT_BATCH_SIZE])
+            if skip_conflicts:
+                stmt = stmt.on_conflict_do_nothing()
+            try:
+                result = await self.db.scalars(stmt.returning(self.model))
+            except IntegrityError as e:
+                # 多行插入无法确定是哪一行冲突，详情中只给出约束名
+                raise self._conflict(e, {}) from e
+            created.extend(result.all())
+        if created:
+            mark_write(self.db)
+            self.invalidate_count()
+        return created
+
+    async def copy_records(
+        self, table: str, columns: Sequence[str], records: Iterable[Sequence[Any]]
+    ) -> None:
+        """通过 asyncpg 的 COPY 协议写入记录（在当前会话的事务内）.
+
+        比多行 INSERT 快一个数量级，但不经过 ORM，也不支持 ON CONFLICT，
+        通常先写入临时表再用一条 SQL 合并到目标表。
+
+        Args:
+            table: 表名
+            columns: 列名
+            records: 与列顺序一致的记录
+        """
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table, records=records, columns=list(columns)
+        )
+
     async def update(self, id: Any, **kwargs: Any) -> ModelType | None:
-        """更新记录.
+        """更新记录（单条 UPDATE ... RETURNING）.
 
         Args:
             id: 记录 ID
-            **kwargs: 更新字段
+            **kwargs: 更新字段，不能为空
 
         Returns:
-            更新后的模型实例 或 None
+            更新后的模型实例 或 None（记录不存在）
+
+        Raises:
+            ConflictException: 违反唯一约束
         """
-        await self.db.execute(update(self.model).where(self.model.id == id).values(**kwargs))
-        return await self.get(id)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**kwargs)
+            .returning(self.model)
+            # 会话中已加载的同一对象也以返回值刷新
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        try:
+            obj = (await self.db.scalars(stmt)).one_or_none()
+        except IntegrityError as e:
+            raise self._conflict(e, kwargs) from e
+        if obj is not None:
+            mark_write(self.db)
+        return obj
 
-    async def delete(self, id: Any) -> bool:
-        """删除记录.
+    async def delete(self, id: Any) -> ModelType | None:
+        """删除记录（单条 DELETE ... RETURNING）.
 
         Args:
             id: 记录 ID
 
         Returns:
-            是否删除成功
+            被删除记录的模型实例 或 None（记录不存在）
         """
-        result = await self.db.execute(delete(self.model).where(self.model.id == id))
-        return result.rowcount > 0
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        obj = (await self.db.scalars(stmt)).one_or_none()
+        if obj is not None:
+            mark_write(self.db)
+            self.invalidate_count()
+        return obj
 
     async def count(self) -> int:
         """计数.
@@ -93,5 +486,70 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             记录总数
         """
-        result = await self.db.execute(select(func.count()).select_from(self.model))
+        stmt = self.statement("count", lambda: select(func.count()).select_from(self.model))
+        result = await self.db.execute(stmt)
         return result.scalar_one()
+
+    async def estimate_count(self) -> int | None:
+        """读取规划器统计的行数估算（pg_class.reltuples），不扫描表.
+
+        Returns:
+            估算行数；表从未 ANALYZE 过时返回 None
+        """
+        result = await self.db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": self.model.__table__.fullname},
+        )
+        estimate = result.scalar_one_or_none()
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    async def cached_count(self) -> int:
+        """带 TTL 的精确计数，create/delete 的事务提交后失效.
+
+        缓存位于进程内，其他 worker 的写入最多在 TTL 后可见。
+
+        Returns:
+            记录总数
+        """
+        key = self.model.__table__.fullname
+        cached = _count_cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        total = await self.count()
+        _count_cache[key] = (total, time.monotonic() + settings.PAGINATION_COUNT_CACHE_TTL)
+        return total
+
+    def invalidate_count(self) -> None:
+        """在事务提交后使当前表的计数缓存失效.
+
+        提交前失效的话，并发的计数请求看不到未提交的写入，会把旧总数重新缓存一个 TTL。
+        """
+        key = self.model.__table__.fullname
+
+        async def invalidate() -> None:
+            _count_cache.pop(key, None)
+
+        after_commit(self.db, invalidate)
+
+    async def count_with_strategy(
+        self, strategy: CountStrategy | None = None
+    ) -> tuple[int, CountStrategy]:
+        """按策略统计总数.
+
+        Args:
+            strategy: 计数策略，默认取 PAGINATION_COUNT_STRATEGY
+
+        Returns:
+            (总数, 实际使用的策略)。估算不可用或估算值低于阈值时退化为精确计数
+        """
+        strategy = strategy or settings.PAGINATION_COUNT_STRATEGY
+        if strategy == "estimate":
+            estimate = await self.estimate_count()
+            if estimate is not None and estimate >= settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+                return estimate, "estimate"
+            return await self.count(), "exact"
+        if strategy == "cached":
+            return await self.cached_count(), "cached"
+        return await self.count(), "exact"
@@ -1,14 +1,61 @@
 """用户 Repository."""
-from sqlalchemy import select
+from typing import Any, Iterable, Literal, Sequence
+
+from sqlalchemy import Integer, Row, String, bindparam, case, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.session import mark_write
 from app.models.user import User
 from app.repositories.base import BaseRepository
 
+# 导入暂存表（临时表，跨事务保留到 drop_import_staging 或连接关闭）
+IMPORT_STAGING_TABLE = "user_import_staging"
+IMPORT_STAGING_COLUMNS = ("line", "email", "username", "hashed_password", "full_name")
+
+UniqueField = Literal["email", "username"]
+
+# 搜索字段，均有 lower(...) gin_trgm_ops 索引（迁移 8b1e4d6c2a90）
+SEARCH_FIELDS = ("username", "email", "full_name")
+
+
+def escape_like(value: str) -> str:
+    """转义 LIKE 通配符（转义字符为反斜杠）.
+
+    Args:
+        value: 原始字符串
+
+    Returns:
+        可安全拼接到 LIKE 模式中的字符串
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class UserRepository(BaseRepository[User]):
     """用户数据访问层."""
 
+    # 对应索引 ix_users_created_at_id
+    cursor_keys = ("created_at", "id")
+
+    # 排序与过滤白名单；组合索引见迁移 c4d7e2f19a63，
+    # tests/test_list_plans.py 逐一检查各组合的执行计划
+    sort_keys = {
+        "created_at": ("created_at", "id"),
+        "id": ("id",),
+        "username": ("username",),
+    }
+
+    filter_fields = {
+        "is_active": ("is_active", "eq"),
+        "is_superuser": ("is_superuser", "eq"),
+        "created_after": ("created_at", "ge"),
+        "created_before": ("created_at", "lt"),
+    }
+
+    unique_constraints = {
+        "ix_users_email": ("email", "Email already registered"),
+        "ix_users_username": ("username", "Username already taken"),
+    }
+
     def __init__(self, db: AsyncSession):
         """初始化.
 
@@ -26,7 +73,10 @@ class UserRepository(BaseRepository[User]):
         Returns:
             用户实例 或 None
         """
-        result = await self.db.execute(select(User).where(User.email == email))
+        stmt = self.statement(
+            "get_by_email", lambda: select(User).where(User.email == bindparam("email"))
+        )
+        result = await self.db.execute(stmt, {"email": email})
         return result.scalar_one_or_none()
 
     async def get_by_username(self, username: str) -> User | None:
@@ -38,29 +88,198 @@ class UserRepository(BaseRepository[User]):
         Returns:
             用户实例 或 None
         """
-        result = await self.db.execute(select(User).where(User.username == username))
+        stmt = self.statement(
+            "get_by_username", lambda: select(User).where(User.username == bindparam("username"))
+        )
+        result = await self.db.execute(stmt, {"username": username})
         return result.scalar_one_or_none()
 
-    async def exists_by_email(self, email: str) -> bool:
-        """检查邮箱是否存在.
+    async def search(
+        self, query: str, columns: Sequence[str], limit: int
+    ) -> list[dict[str, Any]]:
+        """按用户名、邮箱、姓名搜索用户（前缀 + 模糊匹配），按相关度排序.
+
+        前缀匹配（``LIKE 'q%'``）与模糊匹配（``%>``，pg_trgm 词相似度，
+        阈值为 pg_trgm.word_similarity_threshold）均可使用三元组 GIN 索引，
+        数据库以 BitmapOr 合并各字段的索引扫描，不做全表扫描。
+        得分为各字段词相似度的最大值（0-1），前缀命中再加 1，完全相同再加 1。
 
         Args:
-            email: 邮箱地址
+            query: 搜索词（不区分大小写）
+            columns: 返回的列名
+            limit: 最多返回的条数
 
         Returns:
-            是否存在
+            行字典列表（附带 score），按得分降序
         """
-        user = await self.get_by_email(email)
-        return user is not None
 
-    async def exists_by_username(self, username: str) -> bool:
-        """检查用户名是否存在.
+        def build() -> Any:
+            q = bindparam("q", type_=String)
+            prefix = bindparam("prefix", type_=String)
+            fields = [func.lower(getattr(User, name)) for name in SEARCH_FIELDS]
+            prefix_hit = or_(*(field.like(prefix, escape="\\") for field in fields))
+            exact_hit = or_(*(field == q for field in fields))
+            score = (
+                func.greatest(*(func.word_similarity(q, field) for field in fields))
+                + case((prefix_hit, 1.0), else_=0.0)
+                + case((exact_hit, 1.0), else_=0.0)
+            ).label("score")
+            matched = or_(prefix_hit, *(field.op("%>")(q) for field in fields))
+            return (
+                select(*(getattr(User, name) for name in columns), score)
+                .where(matched)
+                .order_by(score.desc(), User.id)
+                .limit(bindparam("limit", type_=Integer))
+            )
+
+        stmt = self.statement(f"search:{','.join(columns)}", build)
+        q = query.lower()
+        result = await self.db.execute(
+            stmt, {"q": q, "prefix": f"{escape_like(q)}%", "limit": limit}
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def find_taken(
+        self, emails: list[str], usernames: list[str]
+    ) -> tuple[set[str], set[str]]:
+        """一次查询找出已被占用的邮箱与用户名.
 
         Args:
-            username: 用户名
+            emails: 待检查的邮箱
+            usernames: 待检查的用户名
+
+        Returns:
+            (已存在的邮箱集合, 已存在的用户名集合)
+        """
+        if not emails and not usernames:
+            return set(), set()
+        result = await self.db.execute(
+            select(User.email, User.username).where(
+                or_(User.email.in_(emails), User.username.in_(usernames))
+            )
+        )
+        taken_emails: set[str] = set()
+        taken_usernames: set[str] = set()
+        for email, username in result.all():
+            taken_emails.add(email)
+            taken_usernames.add(username)
+        return taken_emails, taken_usernames
+
+    async def create_import_staging(self) -> None:
+        """创建导入暂存表（已存在时重建）."""
+        await self.drop_import_staging()
+        await self.db.execute(
+            text(
+                f"""
+                CREATE TEMP TABLE {IMPORT_STAGING_TABLE} (
+                    line bigint NOT NULL,
+                    email varchar(255) NOT NULL,
+                    username varchar(50) NOT NULL,
+                    hashed_password varchar(255) NOT NULL,
+                    full_name varchar(100)
+                )
+                """
+            )
+        )
+
+    async def drop_import_staging(self) -> None:
+        """删除导入暂存表."""
+        await self.db.execute(text(f"DROP TABLE IF EXISTS pg_temp.{IMPORT_STAGING_TABLE}"))
+
+    async def copy_to_import_staging(self, records: Iterable[Sequence[Any]]) -> None:
+        """以 COPY 写入暂存表.
+
+        Args:
+            records: 按 IMPORT_STAGING_COLUMNS 顺序排列的记录
+        """
+        await self.copy_records(IMPORT_STAGING_TABLE, IMPORT_STAGING_COLUMNS, records)
+
+    async def analyze_import_staging(self) -> None:
+        """收集暂存表统计信息（临时表不会被 autovacuum 分析）."""
+        await self.db.execute(text(f"ANALYZE {IMPORT_STAGING_TABLE}"))
+
+    async def _remove_staged(self, delete_sql: str, limit: int) -> tuple[int, list[Row[Any]]]:
+        result = await self.db.execute(
+            text(
+                f"""
+                WITH removed AS ({delete_sql} RETURNING s.line, s.email, s.username),
+                removed_count AS (SELECT count(*) AS total FROM removed)
+                SELECT removed_count.total, sample.line, sample.email, sample.username
+                FROM removed_count
+                LEFT JOIN LATERAL (
+                    SELECT line, email, username FROM removed ORDER BY line LIMIT :limit
+                ) sample ON true
+                """
+            ),
+            {"limit": limit},
+        )
+        # 总数在未加 LIMIT 的聚合中计算；没有明细时仍返回一行（明细列为 NULL）
+        rows = list(result.all())
+        return rows[0].total, [row for row in rows if row.line is not None]
+
+    async def remove_staged_duplicates(
+        self, field: UniqueField, *, limit: int
+    ) -> tuple[int, list[Row[Any]]]:
+        """删除暂存表内重复的记录（同一字段值只保留行号最小的一条）.
+
+        Args:
+            field: 唯一字段
+            limit: 最多返回的明细条数
+
+        Returns:
+            (删除总数, 按行号排序的明细 (total, line, email, username))
+        """
+        return await self._remove_staged(
+            f"""
+            DELETE FROM {IMPORT_STAGING_TABLE} s
+            USING (
+                SELECT line, row_number() OVER (PARTITION BY {field} ORDER BY line) AS rank
+                FROM {IMPORT_STAGING_TABLE}
+            ) ranked
+            WHERE s.line = ranked.line AND ranked.rank > 1
+            """,
+            limit,
+        )
+
+    async def remove_staged_conflicts(
+        self, field: UniqueField, *, limit: int
+    ) -> tuple[int, list[Row[Any]]]:
+        """删除暂存表中与已有用户冲突的记录.
+
+        Args:
+            field: 唯一字段
+            limit: 最多返回的明细条数
+
+        Returns:
+            (删除总数, 按行号排序的明细 (total, line, email, username))
+        """
+        return await self._remove_staged(
+            f"DELETE FROM {IMPORT_STAGING_TABLE} s USING users u WHERE u.{field} = s.{field}",
+            limit,
+        )
+
+    async def insert_from_import_staging(self) -> int:
+        """将暂存表合并到 users 表.
+
+        并发写入导致的唯一约束冲突由 ON CONFLICT DO NOTHING 跳过。
 
         Returns:
-            是否存在
+            实际插入的行数
         """
-        user = await self.get_by_username(username)
-        return user is not None
+        result = await self.db.execute(
+            text(
+                f"""
+                INSERT INTO users (
+                    email, username, hashed_password, full_name, is_active, is_superuser
+                )
+                SELECT email, username, hashed_password, full_name, true, false
+                FROM {IMPORT_STAGING_TABLE}
+                ORDER BY line
+                ON CONFLICT DO NOTHING
+                """
+            )
+        )
+        if result.rowcount:
+            mark_write(self.db)
+            self.invalidate_count()
+        return result.rowcount
@@ -0,0 +1,27 @@
+"""认证 Schema."""
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class LoginRequest(BaseModel):
+    """登录请求 Schema."""
+
+    username: str = Field(..., min_length=1, max_length=50)
+    password: str = Field(..., min_length=1)
+
+
+class RefreshRequest(BaseModel):
+    """刷新令牌请求 Schema（刷新与登出共用）."""
+
+    refresh_token: str
+
+
+class TokenPair(BaseModel):
+    """令牌响应 Schema."""
+
+    access_token: str
+    refresh_token: str
+    token_type: Literal["bearer"] = "bearer"
+    # 访问令牌有效期（秒）
+    expires_in: int
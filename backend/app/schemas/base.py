@@ -1,8 +1,13 @@
 """基础 Schema."""
 from datetime import datetime
+from typing import Generic, TypeVar
 
 from pydantic import BaseModel, ConfigDict
 
+from app.core.pagination import CountStrategy
+
+ItemT = TypeVar("ItemT")
+
 
 class TimestampSchema(BaseModel):
     """时间戳 Schema."""
@@ -16,18 +21,19 @@ class TimestampSchema(BaseModel):
 class PaginationParams(BaseModel):
     """分页参数."""
 
-    skip: int = 0
+    cursor: str | None = None
     limit: int = 20
 
     model_config = ConfigDict(from_attributes=True)
 
 
-class PaginatedResponse(BaseModel):
-    """分页响应."""
+class PaginatedResponse(BaseModel, Generic[ItemT]):
+    """游标分页响应."""
 
-    total: int
-    items: list[BaseModel]
-    skip: int
+    items: list[ItemT]
+    next_cursor: str | None = None
     limit: int
+    total: int | None = None
+    total_strategy: CountStrategy | None = None
 
     model_config = ConfigDict(from_attributes=True)
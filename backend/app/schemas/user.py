@@ -1,7 +1,10 @@
 """用户 Schema."""
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from typing import Literal
 
-from app.schemas.base import TimestampSchema
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
+
+from app.core.config import settings
+from app.schemas.base import PaginatedResponse, TimestampSchema
 
 
 class UserBase(BaseModel):
@@ -34,6 +37,8 @@ class UserUpdate(BaseModel):
 class User(UserBase, TimestampSchema):
     """用户响应 Schema."""
 
+    # 邮箱来自数据库，写入时已校验；响应中不再逐行调用 email-validator（列表页的主要 CPU 开销）
+    email: str = Field(..., json_schema_extra={"format": "email"})
     id: int
     is_active: bool
     is_superuser: bool
@@ -41,9 +46,99 @@ class User(UserBase, TimestampSchema):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserSearchHit(User):
+    """用户搜索结果."""
+
+    # 相关度：字段词相似度最大值（0-1），前缀命中 +1，完全相同 +1
+    score: float
+
+
+class UserSearchResponse(BaseModel):
+    """用户搜索响应 Schema."""
+
+    query: str
+    items: list[UserSearchHit]
+    limit: int
+
+
+# 预构建的 TypeAdapter（快速序列化路径，见 app.core.responses）
+UserAdapter = TypeAdapter(User)
+UserPageAdapter = TypeAdapter(PaginatedResponse[User])
+UserSearchAdapter = TypeAdapter(UserSearchResponse)
+
+
 class UserInDB(User):
     """数据库中的用户 Schema."""
 
     hashed_password: str
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserBulkCreate(BaseModel):
+    """批量创建用户请求 Schema."""
+
+    users: list[UserCreate] = Field(..., min_length=1, max_length=settings.USER_BULK_MAX_SIZE)
+
+
+class UserBulkItemResult(BaseModel):
+    """批量创建中单条记录的结果."""
+
+    index: int
+    status: Literal["created", "duplicate", "conflict"]
+    id: int | None = None
+    email: str
+    username: str
+    error: str | None = None
+
+
+class UserBulkCreateResponse(BaseModel):
+    """批量创建用户响应 Schema."""
+
+    created: int
+    failed: int
+    results: list[UserBulkItemResult]
+
+
+class UserImportIssue(BaseModel):
+    """导入中未写入的单条记录."""
+
+    line: int
+    status: Literal["invalid", "duplicate", "conflict"]
+    email: str | None = None
+    username: str | None = None
+    error: str
+
+
+class UserImportReport(BaseModel):
+    """用户导入报告 Schema."""
+
+    processed: int
+    imported: int
+    invalid: int
+    duplicate: int
+    conflict: int
+    elapsed_seconds: float
+    rows_per_second: float
+    issues: list[UserImportIssue]
+    issues_truncated: bool
+
+
+class UserImportProgress(BaseModel):
+    """导入进度 Schema（每批写入暂存表后更新）."""
+
+    processed: int
+    staged: int
+    invalid: int
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class UserImportJob(BaseModel):
+    """后台导入任务 Schema."""
+
+    id: str
+    status: Literal["pending", "running", "completed", "failed"]
+    progress: UserImportProgress | None = None
+    report: UserImportReport | None = None
+    error: str | None = None
@@ -0,0 +1,147 @@
+"""认证服务.
+
+登录签发访问令牌与刷新令牌，二者属于同一令牌族。刷新令牌每次使用后即作废并轮换出新的一对；
+已作废的刷新令牌再次出现说明可能被盗用，整个令牌族随即吊销。登出吊销令牌族，
+其中尚未过期的访问令牌也在吊销传播后失效（见 app.core.revocation）。
+"""
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import NotFoundException, UnauthorizedException
+from app.core.logging import get_logger
+from app.core.revocation import family_member, revocation_list
+from app.core.security import create_access_token, create_refresh_token, decode_refresh_token
+from app.db.session import open_read_session
+from app.models.user import User
+from app.services.user_cache import current_user_cache
+from app.services.user_service import UserService
+
+logger = get_logger(__name__)
+
+
+async def resolve_user(claims: dict[str, Any], *, use_primary: bool = False) -> User:
+    """由令牌声明解析当前用户.
+
+    先查本进程的短 TTL 缓存；未命中时才打开只读会话，经 UserService.get_user
+    （Redis 用户缓存、数据库）加载，因此缓存命中的请求不占用数据库连接。
+
+    Args:
+        claims: 已验证的令牌声明，``sub`` 为用户 ID
+        use_primary: 未命中时是否直接读主库（读己之写）
+
+    Returns:
+        当前用户（共享的游离态快照，调用方不得修改）
+
+    Raises:
+        UnauthorizedException: 声明缺少用户 ID，或用户不存在、已停用
+    """
+    try:
+        user_id = int(claims["sub"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise UnauthorizedException(message="Could not validate credentials") from e
+
+    user = current_user_cache.get(user_id)
+    if user is None:
+        async with await open_read_session(use_primary=use_primary) as session:
+            try:
+                user = current_user_cache.put(await UserService(session).get_user(user_id))
+            except NotFoundException:
+                logger.info("Token subject not found", user_id=user_id)
+                raise UnauthorizedException(message="Could not validate credentials") from None
+
+    if not user.is_active:
+        raise UnauthorizedException(message="Inactive user", details={"user_id": user_id})
+    return user
+
+
+class AuthService:
+    """认证业务逻辑层."""
+
+    def __init__(self, db: AsyncSession):
+        """初始化.
+
+        Args:
+            db: 数据库会话
+        """
+        self.users = UserService(db)
+
+    def _issue(self, user_id: int, family: str) -> dict[str, Any]:
+        return {
+            "access_token": create_access_token({"sub": str(user_id), "fam": family}),
+            "refresh_token": create_refresh_token(str(user_id), family),
+            "token_type": "bearer",
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        }
+
+    async def login(self, username: str, password: str) -> dict[str, Any]:
+        """用户名密码登录，开启新的令牌族.
+
+        Args:
+            username: 用户名
+            password: 密码
+
+        Returns:
+            令牌对
+
+        Raises:
+            UnauthorizedException: 用户名或密码错误，或用户已停用
+        """
+        user = await self.users.authenticate(username, password)
+        if user is None or not user.is_active:
+            raise UnauthorizedException(message="Incorrect username or password")
+        logger.info("User logged in", user_id=user.id)
+        return self._issue(user.id, uuid.uuid4().hex)
+
+    async def refresh(self, refresh_token: str) -> dict[str, Any]:
+        """用刷新令牌换取新的令牌对（轮换：旧刷新令牌随即作废）.
+
+        Args:
+            refresh_token: 刷新令牌
+
+        Returns:
+            新的令牌对（同一令牌族）
+
+        Raises:
+            UnauthorizedException: 令牌无效、已使用、已吊销，或用户不可用
+            ServiceUnavailableException: 吊销存储不可用
+        """
+        claims = decode_refresh_token(refresh_token)
+        user_id, family = int(claims["sub"]), claims["fam"]
+        result = await revocation_list.consume(claims["jti"], family, claims["exp"])
+        if result == "reused":
+            # 已轮换过的刷新令牌被再次使用：合法方与攻击者无法区分，吊销整个令牌族
+            await self._revoke_family(family)
+            logger.warning("Refresh token reuse detected", user_id=user_id, family=family)
+        if result != "ok":
+            raise UnauthorizedException(message="Refresh token has been revoked")
+
+        try:
+            user = await self.users.get_user(user_id)
+        except NotFoundException:
+            raise UnauthorizedException(message="Could not validate credentials") from None
+        if not user.is_active:
+            raise UnauthorizedException(message="Inactive user", details={"user_id": user_id})
+        return self._issue(user_id, family)
+
+    async def logout(self, refresh_token: str) -> None:
+        """登出：吊销刷新令牌所属的令牌族（含其访问令牌）.
+
+        Args:
+            refresh_token: 刷新令牌
+
+        Raises:
+            UnauthorizedException: 令牌无效或已过期
+            ServiceUnavailableException: 吊销存储不可用
+        """
+        claims = decode_refresh_token(refresh_token)
+        await self._revoke_family(claims["fam"])
+        logger.info("User logged out", user_id=claims["sub"])
+
+    async def _revoke_family(self, family: str) -> None:
+        # 令牌族中任何令牌的过期时间都不晚于此刻加上刷新令牌的有效期
+        expires_at = time.time() + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        await revocation_list.revoke(family_member(family), expires_at=expires_at)
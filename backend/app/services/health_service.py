@@ -0,0 +1,184 @@
+"""就绪检查.
+
+依赖检查由每个 worker 的后台任务按固定间隔执行，``/health/ready`` 只读取缓存的结果：
+探针本身不访问数据库或 Redis，高负载下也不会增加负载或延迟。
+
+- 数据库：用独立的 NullPool 引擎建立新连接并执行 ``SELECT 1``，不占用业务连接池，
+  连接池耗尽时也能如实反映数据库本身是否可达；
+- Redis：``PING``；
+- 连接池：借出比例超过阈值或出现取连接超时时视为饱和。
+
+主库不可达时状态为 down（503）；副本、Redis（缓存可降级）不可用
+或连接池饱和时为 degraded（仍返回 200，流量不会被摘除）。
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+from app.db.session import build_connect_args, pool_status
+
+logger = get_logger(__name__)
+
+HealthStatus = Literal["ok", "degraded", "down"]
+
+# 检查结果超过若干个检查间隔未更新即视为失效（后台任务卡住或已退出）
+STALE_INTERVALS = 3
+
+
+def _probe_engine(url: str, timeout: float) -> AsyncEngine:
+    return create_async_engine(
+        url, poolclass=NullPool, connect_args={**build_connect_args(), "timeout": timeout}
+    )
+
+
+class ReadinessChecker:
+    """后台执行依赖检查并缓存结果."""
+
+    def __init__(
+        self,
+        database_url: str,
+        replica_urls: list[str],
+        interval: float,
+        timeout: float,
+        saturation_threshold: float,
+    ):
+        """初始化.
+
+        Args:
+            database_url: 主库地址
+            replica_urls: 只读副本地址
+            interval: 检查间隔（秒）
+            timeout: 单项检查超时（秒）
+            saturation_threshold: 连接池借出比例达到该值视为饱和
+        """
+        self.interval = interval
+        self.timeout = timeout
+        self.saturation_threshold = saturation_threshold
+        self._primary = _probe_engine(database_url, timeout)
+        self._replicas = [_probe_engine(url, timeout) for url in replica_urls]
+        self._checkout_timeouts: dict[str, int] = {}
+        self._report: dict[str, Any] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """先完成一次检查，再启动后台任务（重复调用无副作用）."""
+        if self._task is None:
+            await self.refresh()
+            self._task = asyncio.create_task(self._run(), name="readiness-checker")
+
+    async def stop(self) -> None:
+        """停止后台任务并释放探测引擎."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for probe in (self._primary, *self._replicas):
+            await probe.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Readiness check failed", error=str(e))
+
+    def report(self) -> dict[str, Any]:
+        """最近一次检查结果.
+
+        Returns:
+            包含 status、checks、checked_at 的字典；尚未检查或结果过期时状态为 down
+        """
+        if self._report is None:
+            return {"status": "down", "checks": {}, "checked_at": None, "reason": "not checked"}
+        age = time.time() - self._report["checked_at"]
+        if age > self.interval * STALE_INTERVALS + self.timeout:
+            return {**self._report, "status": "down", "reason": "stale"}
+        return self._report
+
+    async def refresh(self) -> dict[str, Any]:
+        """执行一次全部检查并缓存结果.
+
+        Returns:
+            检查结果
+        """
+        names = ["database", *(f"replica-{i}" for i in range(len(self._replicas))), "redis"]
+        probes = [
+            self._check_database(self._primary),
+            *(self._check_database(replica) for replica in self._replicas),
+            self._check_redis(),
+        ]
+        checks = dict(zip(names, await asyncio.gather(*probes)))
+        checks["pool"] = self._check_pool()
+
+        if checks["database"]["status"] != "ok":
+            status: HealthStatus = "down"
+        elif any(check["status"] != "ok" for check in checks.values()):
+            status = "degraded"
+        else:
+            status = "ok"
+
+        previous = self._report["status"] if self._report else None
+        if status != previous:
+            log = logger.info if status == "ok" else logger.warning
+            log("Readiness changed", status=status, previous=previous, checks=checks)
+        self._report = {"status": status, "checks": checks, "checked_at": time.time()}
+        return self._report
+
+    async def _timed(self, probe: Callable[[], Awaitable[Any]]) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return {"status": "down", "error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            return {"status": "down", "error": f"{type(e).__name__}: {e}"}
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - start) * 1000, 3)}
+
+    async def _check_database(self, probe: AsyncEngine) -> dict[str, Any]:
+        async def ping() -> None:
+            async with probe.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        return await self._timed(ping)
+
+    async def _check_redis(self) -> dict[str, Any]:
+        return await self._timed(get_redis().ping)
+
+    def _check_pool(self) -> dict[str, Any]:
+        pools: dict[str, dict[str, Any]] = {}
+        saturated = False
+        for name, stats in pool_status().items():
+            capacity = stats["size"] + max(stats["max_overflow"], 0)
+            utilization = stats["checked_out"] / capacity if capacity else 0.0
+            timeouts = stats["checkout_timeouts"] - self._checkout_timeouts.get(name, 0)
+            self._checkout_timeouts[name] = stats["checkout_timeouts"]
+            pool_saturated = utilization >= self.saturation_threshold or timeouts > 0
+            saturated = saturated or pool_saturated
+            pools[name] = {
+                "utilization": round(utilization, 3),
+                "checked_out": stats["checked_out"],
+                "capacity": capacity,
+                "checkout_timeouts": timeouts,
+                "wait_p99_ms": stats["wait_p99_ms"],
+            }
+        return {"status": "degraded" if saturated else "ok", "pools": pools}
+
+
+readiness_checker = ReadinessChecker(
+    str(settings.DATABASE_URL),
+    settings.read_replica_urls,
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    saturation_threshold=settings.HEALTH_POOL_SATURATION_THRESHOLD,
+)
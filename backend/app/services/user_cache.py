@@ -0,0 +1,203 @@
+"""用户查询缓存."""
+import time
+from typing import Awaitable, Callable
+
+from app.core.cache import ReadThroughCache
+from app.core.config import settings
+from app.core.lru import ExpiringLRU
+from app.core.redis import get_redis
+from app.models.user import User
+from app.schemas.user import User as UserSchema
+
+UserLoader = Callable[[], Awaitable[User | None]]
+
+
+def _dump(user: User) -> bytes:
+    # 只缓存公开字段：密码哈希不进入共享的 Redis
+    return UserSchema.model_validate(user).model_dump_json().encode()
+
+
+def _load(raw: bytes) -> User:
+    # 还原为游离态的 ORM 对象（不含 hashed_password），调用方与数据库查询结果的用法一致
+    return User(**UserSchema.model_validate_json(raw).model_dump())
+
+
+class UserCache:
+    """用户读穿透缓存.
+
+    ``id:{id}`` 存放用户的公开字段，``username:{username}`` 与 ``email:{email}``
+    只存放用户 ID，因此任何一次更新只需删除一份数据加若干索引。
+    通过索引读取到的用户会再次核对用户名/邮箱，索引过期时自动回源。
+    """
+
+    def __init__(self, cache: ReadThroughCache):
+        """初始化.
+
+        Args:
+            cache: 读穿透缓存
+        """
+        self.cache = cache
+
+    async def get_by_id(
+        self, user_id: int, loader: UserLoader, *, fill: bool = True
+    ) -> User | None:
+        """按 ID 读取用户.
+
+        Args:
+            user_id: 用户 ID
+            loader: 未命中时的数据库加载函数
+            fill: 未命中时是否回填（loader 读取副本时为 False）
+
+        Returns:
+            用户实例 或 None
+        """
+
+        async def load() -> bytes | None:
+            user = await loader()
+            return _dump(user) if user else None
+
+        raw = await self.cache.get_or_load(f"id:{user_id}", load, fill=fill)
+        return _load(raw) if raw else None
+
+    async def _get_by_index(
+        self, field: str, value: str, loader: UserLoader, fill: bool
+    ) -> User | None:
+        loaded: User | None = None
+
+        async def load_id() -> bytes | None:
+            nonlocal loaded
+            loaded = await loader()
+            return str(loaded.id).encode() if loaded else None
+
+        raw_id = await self.cache.get_or_load(f"{field}:{value}", load_id, fill=fill)
+        if not raw_id:
+            return None
+        if loaded is not None:
+            return loaded
+
+        user_id = int(raw_id)
+
+        async def load_same_user() -> User | None:
+            # 索引可能已过期，只有查到的仍是同一用户时才回填 id 缓存
+            user = await loader()
+            return user if user is not None and user.id == user_id else None
+
+        user = await self.get_by_id(user_id, load_same_user, fill=fill)
+        if user is None or getattr(user, field) != value:
+            # 索引已过期（用户被改名或删除），回源并清理
+            await self.cache.invalidate(f"{field}:{value}", f"id:{user_id}")
+            return await loader()
+        return user
+
+    async def get_by_username(
+        self, username: str, loader: UserLoader, *, fill: bool = True
+    ) -> User | None:
+        """按用户名读取用户.
+
+        Args:
+            username: 用户名
+            loader: 未命中时的数据库加载函数
+            fill: 未命中时是否回填（loader 读取副本时为 False）
+
+        Returns:
+            用户实例 或 None
+        """
+        return await self._get_by_index("username", username, loader, fill)
+
+    async def get_by_email(
+        self, email: str, loader: UserLoader, *, fill: bool = True
+    ) -> User | None:
+        """按邮箱读取用户.
+
+        Args:
+            email: 邮箱地址
+            loader: 未命中时的数据库加载函数
+            fill: 未命中时是否回填（loader 读取副本时为 False）
+
+        Returns:
+            用户实例 或 None
+        """
+        return await self._get_by_index("email", email, loader, fill)
+
+    async def invalidate(self, *users: User) -> None:
+        """删除用户相关的全部缓存.
+
+        Args:
+            *users: 用户实例（更新时同时传入新旧两个版本，以清理旧索引）
+        """
+        keys: set[str] = set()
+        for user in users:
+            keys.update((f"id:{user.id}", f"username:{user.username}", f"email:{user.email}"))
+        await self.cache.invalidate(*keys)
+
+
+_user_cache: UserCache | None = None
+
+
+def get_user_cache() -> UserCache | None:
+    """获取用户缓存单例.
+
+    Returns:
+        用户缓存；USER_CACHE_ENABLED 关闭时返回 None
+    """
+    global _user_cache
+    if not settings.USER_CACHE_ENABLED:
+        return None
+    if _user_cache is None:
+        _user_cache = UserCache(
+            ReadThroughCache(get_redis, namespace="user", ttl=settings.USER_CACHE_TTL)
+        )
+    return _user_cache
+
+
+class LocalUserCache:
+    """进程内短 TTL 用户缓存，供认证依赖解析当前用户.
+
+    缓存的是游离态快照（不绑定任何会话），可跨请求共享；
+    命中时既不访问 Redis 也不占用数据库连接。
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        """初始化.
+
+        Args:
+            ttl: 有效期（秒），0 表示关闭
+            maxsize: 最大条目数
+        """
+        self.ttl = ttl
+        self.entries: ExpiringLRU[int, User] = ExpiringLRU(maxsize if ttl > 0 else 0)
+
+    def get(self, user_id: int) -> User | None:
+        """读取用户.
+
+        Args:
+            user_id: 用户 ID
+
+        Returns:
+            用户快照（与其他请求共享，调用方不得修改） 或 None
+        """
+        return self.entries.get(user_id)
+
+    def put(self, user: User) -> User:
+        """缓存用户快照.
+
+        Args:
+            user: 用户实例（可绑定在任意会话上）
+
+        Returns:
+            缓存的游离态快照
+        """
+        snapshot = User(**UserSchema.model_validate(user).model_dump())
+        self.entries.set(user.id, snapshot, time.time() + self.ttl)
+        return snapshot
+
+    def invalidate(self, *user_ids: int) -> None:
+        """删除用户.
+
+        Args:
+            *user_ids: 用户 ID
+        """
+        self.entries.pop(*user_ids)
+
+
+current_user_cache = LocalUserCache(settings.AUTH_USER_CACHE_TTL, settings.AUTH_USER_CACHE_SIZE)
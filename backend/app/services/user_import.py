@@ -0,0 +1,332 @@
+"""用户批量导入.
+
+上传内容按块流式解析（CSV 或 NDJSON），逐行按 UserCreate 规则校验，
+合法记录分批哈希密码后以 COPY 写入临时暂存表；全部写入后在数据库内
+剔除文件内重复与已存在的邮箱/用户名，再用一条 INSERT ... SELECT 合并到 users 表。
+
+接口中的导入以后台任务运行（见 ``app.services.user_import_jobs``），
+暂存阶段每批提交一次，不在整个导入期间持有同一个事务。
+"""
+import asyncio
+import codecs
+import csv
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.hashing import hash_passwords
+from app.core.logging import get_logger
+from app.db.session import commit_session
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import UserCreate, UserImportIssue, UserImportReport
+
+logger = get_logger(__name__)
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# (起始行号, 原始记录, 解析错误)，原始记录为 None 表示该行无法解析
+ParsedRecord = tuple[int, dict[str, Any] | None, str | None]
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[list[str]]:
+    """将字节块切分为完整的行（每个字节块产出一批），自动去除 UTF-8 BOM."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        if lines:
+            yield lines
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield [buffer]
+
+
+async def parse_records(
+    chunks: AsyncIterator[bytes], fmt: ImportFormat
+) -> AsyncIterator[list[ParsedRecord]]:
+    """流式解析上传内容.
+
+    CSV 首行为表头；引号内的换行通过引号计数识别，跨行记录会被合并。
+    空字段按缺失处理。
+
+    Args:
+        chunks: 上传内容的字节块
+        fmt: 格式（csv / ndjson）
+
+    Yields:
+        一批 (起始行号, 记录字典 或 None, 解析错误)
+    """
+    header: list[str] | None = None
+    line_no = 0
+    pending: list[str] = []
+    pending_start = 0
+
+    async for lines in _iter_lines(chunks):
+        parsed: list[ParsedRecord] = []
+        for line in lines:
+            line_no += 1
+            if fmt == "ndjson":
+                if not line.strip():
+                    continue
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError as e:
+                    parsed.append((line_no, None, f"Invalid JSON: {e}"))
+                    continue
+                if isinstance(record, dict):
+                    parsed.append((line_no, record, None))
+                else:
+                    parsed.append((line_no, None, "Each line must be a JSON object"))
+                continue
+
+            # CSV：引号个数为奇数说明字段内含换行，继续拼接下一行
+            if not pending:
+                pending_start = line_no
+            pending.append(line.rstrip("\r"))
+            text = "\n".join(pending)
+            if text.count('"') % 2:
+                continue
+            pending = []
+            if not text.strip():
+                continue
+            values = next(csv.reader([text]))
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                parsed.append(
+                    (pending_start, None, f"Expected {len(header)} columns, got {len(values)}")
+                )
+                continue
+            parsed.append(
+                (pending_start, {k: v for k, v in zip(header, values) if v != ""}, None)
+            )
+        if parsed:
+            yield parsed
+
+    if pending:
+        yield [(pending_start, None, "Unterminated quoted field")]
+
+
+def _field(record: dict[str, Any] | None, name: str) -> str | None:
+    value = record.get(name) if record else None
+    return None if value is None else str(value)
+
+
+def _format_errors(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+class ImportProgress:
+    """导入进度."""
+
+    def __init__(self) -> None:
+        """初始化."""
+        self.started_at = time.perf_counter()
+        self.processed = 0
+        self.staged = 0
+        self.invalid = 0
+
+    @property
+    def elapsed(self) -> float:
+        """已用时间（秒）."""
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        """处理速度（行/秒）."""
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        """导出进度快照.
+
+        Returns:
+            进度字典
+        """
+        return {
+            "processed": self.processed,
+            "staged": self.staged,
+            "invalid": self.invalid,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+ProgressCallback = Callable[[ImportProgress], Awaitable[None]]
+
+
+class UserImporter:
+    """用户批量导入流水线."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        chunk_size: int | None = None,
+        max_issues: int | None = None,
+        on_progress: ProgressCallback | None = None,
+        commit_batches: bool = False,
+    ):
+        """初始化.
+
+        Args:
+            db: 数据库会话（最后的合并由调用方提交）
+            chunk_size: 每批校验、哈希并 COPY 的行数，默认 USER_IMPORT_CHUNK_SIZE
+            max_issues: 报告中最多列出的问题行数，默认 USER_IMPORT_MAX_ISSUES
+            on_progress: 每批写入暂存表后的异步回调
+            commit_batches: 每批写入暂存表后提交。暂存表是连接级的临时表，
+                此时会话须绑定在单个连接上（``AsyncSession(bind=connection)``）
+        """
+        self.db = db
+        self.repository = UserRepository(db)
+        self.chunk_size = chunk_size or settings.USER_IMPORT_CHUNK_SIZE
+        self.max_issues = settings.USER_IMPORT_MAX_ISSUES if max_issues is None else max_issues
+        self.on_progress = on_progress
+        self.commit_batches = commit_batches
+        self.progress = ImportProgress()
+        self.issues: list[UserImportIssue] = []
+        self.issues_truncated = False
+
+    def _add_issue(self, issue: UserImportIssue) -> None:
+        if len(self.issues) < self.max_issues:
+            self.issues.append(issue)
+        else:
+            self.issues_truncated = True
+
+    async def _report_progress(self) -> None:
+        logger.info("User import progress", **self.progress.snapshot())
+        if self.on_progress:
+            await self.on_progress(self.progress)
+
+    async def _stage(self, batch: list[tuple[int, UserCreate]]) -> None:
+        hashed = await hash_passwords([user.password for _, user in batch])
+        await self.repository.copy_to_import_staging(
+            (line, user.email, user.username, hashed_password, user.full_name)
+            for (line, user), hashed_password in zip(batch, hashed)
+        )
+        if self.commit_batches:
+            await commit_session(self.db)
+        self.progress.staged += len(batch)
+        await self._report_progress()
+
+    async def run(self, chunks: AsyncIterator[bytes], fmt: ImportFormat) -> UserImportReport:
+        """执行导入.
+
+        下一批的解析与校验和上一批的密码哈希（进程池）、COPY 并行进行，
+        数据库连接上同一时刻只有一条 COPY。
+
+        Args:
+            chunks: 上传内容的字节块
+            fmt: 格式（csv / ndjson）
+
+        Returns:
+            导入报告
+        """
+        await self.repository.create_import_staging()
+        if self.commit_batches:
+            await commit_session(self.db)
+
+        batch: list[tuple[int, UserCreate]] = []
+        copying: asyncio.Task[None] | None = None
+        try:
+            async for records in parse_records(chunks, fmt):
+                for line, record, parse_error in records:
+                    self.progress.processed += 1
+                    error = parse_error
+                    if record is not None:
+                        try:
+                            batch.append((line, UserCreate.model_validate(record)))
+                            continue
+                        except ValidationError as e:
+                            error = _format_errors(e)
+                    self.progress.invalid += 1
+                    self._add_issue(
+                        UserImportIssue(
+                            line=line,
+                            status="invalid",
+                            email=_field(record, "email"),
+                            username=_field(record, "username"),
+                            error=error or "Invalid record",
+                        )
+                    )
+
+                if len(batch) >= self.chunk_size:
+                    if copying:
+                        await copying
+                    copying = asyncio.create_task(self._stage(batch))
+                    batch = []
+
+            if copying:
+                await copying
+                copying = None
+            if batch:
+                await self._stage(batch)
+        finally:
+            if copying and not copying.done():
+                copying.cancel()
+
+        duplicate, conflict = await self._resolve()
+        imported = await self.repository.insert_from_import_staging()
+        await self.repository.drop_import_staging()
+        # 检查之后、合并之前被并发写入占用的记录也计为冲突
+        conflict += self.progress.staged - duplicate - conflict - imported
+
+        elapsed = self.progress.elapsed
+        report = UserImportReport(
+            processed=self.progress.processed,
+            imported=imported,
+            invalid=self.progress.invalid,
+            duplicate=duplicate,
+            conflict=conflict,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(self.progress.processed / elapsed, 1) if elapsed > 0 else 0.0,
+            issues=sorted(self.issues, key=lambda issue: issue.line),
+            issues_truncated=self.issues_truncated,
+        )
+        logger.info(
+            "User import finished",
+            **report.model_dump(exclude={"issues", "issues_truncated"}),
+        )
+        return report
+
+    async def _resolve(self) -> tuple[int, int]:
+        """剔除暂存表中的重复与冲突记录.
+
+        Returns:
+            (文件内重复数, 与已有用户冲突数)
+        """
+        await self.repository.analyze_import_staging()
+        totals = {"duplicate": 0, "conflict": 0}
+        for status, remove in (
+            ("duplicate", self.repository.remove_staged_duplicates),
+            ("conflict", self.repository.remove_staged_conflicts),
+        ):
+            for field in ("email", "username"):
+                total, rows = await remove(field, limit=self.max_issues)
+                totals[status] += total
+                message = (
+                    f"Duplicate {field} within the file"
+                    if status == "duplicate"
+                    else f"{field.capitalize()} already registered"
+                )
+                for row in rows:
+                    self._add_issue(
+                        UserImportIssue(
+                            line=row.line,
+                            status=status,
+                            email=row.email,
+                            username=row.username,
+                            error=message,
+                        )
+                    )
+                if total > len(rows):
+                    self.issues_truncated = True
+        return totals["duplicate"], totals["conflict"]
@@ -0,0 +1,174 @@
+"""用户导入后台任务.
+
+哈希每行密码使整个导入远超网关的请求超时，因此接口只把上传内容落盘到临时文件并返回
+任务 ID，导入在当前 worker 的后台任务中进行。任务状态（进度与最终报告）写入 Redis，
+任意 worker 都能查询。
+
+导入使用独占的数据库连接：暂存阶段每批提交一次，连接级的暂存表跨事务保留；
+失败时连接被丢弃，不会把暂存表带回连接池。进程退出时未完成的任务标记为失败。
+"""
+import asyncio
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import AppException, ServiceUnavailableException
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+from app.db.session import commit_session, engine
+from app.services.user_import import ImportFormat, ImportProgress, UserImporter
+
+logger = get_logger(__name__)
+
+# 读取临时文件时每块的字节数
+READ_SIZE = 1024 * 1024
+
+
+async def _read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, READ_SIZE):
+            yield chunk
+
+
+class UserImportJobs:
+    """导入任务的提交、执行与状态查询."""
+
+    def __init__(
+        self,
+        redis: Callable[[], Redis],
+        db_engine: AsyncEngine,
+        ttl: int,
+        namespace: str = "user_import",
+    ):
+        """初始化.
+
+        Args:
+            redis: 返回 Redis 客户端的函数（客户端可能在关闭后重建）
+            db_engine: 执行导入的数据库引擎（主库）
+            ttl: 任务状态的保留时间（秒）
+            namespace: Redis key 前缀
+        """
+        self.redis = redis
+        self.db_engine = db_engine
+        self.ttl = ttl
+        self.namespace = namespace
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.namespace}:{job_id}"
+
+    async def _save(self, job: dict[str, Any]) -> None:
+        await self.redis().set(self._key(job["id"]), orjson.dumps(job), ex=self.ttl)
+
+    async def submit(self, chunks: AsyncIterator[bytes], fmt: ImportFormat) -> dict[str, Any]:
+        """保存上传内容并启动导入任务.
+
+        Args:
+            chunks: 上传内容的字节块
+            fmt: 格式（csv / ndjson）
+
+        Returns:
+            任务状态（pending）
+
+        Raises:
+            ServiceUnavailableException: Redis 不可用，无法记录任务状态
+        """
+        job: dict[str, Any] = {"id": uuid.uuid4().hex, "status": "pending"}
+        with tempfile.NamedTemporaryFile(prefix="user-import-", delete=False) as file:
+            path = Path(file.name)
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(file.write, chunk)
+            except BaseException:
+                path.unlink(missing_ok=True)
+                raise
+        try:
+            await self._save(job)
+        except RedisError as e:
+            path.unlink(missing_ok=True)
+            logger.error("User import job store unavailable", error=str(e))
+            raise ServiceUnavailableException(message="User import unavailable") from e
+
+        task = asyncio.create_task(self._run(dict(job), path, fmt), name=f"user-import-{job['id']}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info("User import job submitted", job_id=job["id"], format=fmt)
+        return job
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        """查询任务状态.
+
+        Args:
+            job_id: 任务 ID
+
+        Returns:
+            任务状态，不存在或已过期时为 None
+
+        Raises:
+            ServiceUnavailableException: Redis 不可用
+        """
+        try:
+            raw = await self.redis().get(self._key(job_id))
+        except RedisError as e:
+            raise ServiceUnavailableException(message="User import unavailable") from e
+        return orjson.loads(raw) if raw is not None else None
+
+    async def stop(self) -> None:
+        """取消未完成的任务并等待其记录失败状态."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _update(self, job: dict[str, Any], **fields: Any) -> None:
+        job.update(fields)
+        try:
+            await self._save(job)
+        except RedisError as e:
+            # 状态写入失败不中断导入，下一次更新时再写
+            logger.warning("User import status update failed", job_id=job["id"], error=str(e))
+
+    async def _run(self, job: dict[str, Any], path: Path, fmt: ImportFormat) -> None:
+        async def report_progress(progress: ImportProgress) -> None:
+            await self._update(job, progress=progress.snapshot())
+
+        await self._update(job, status="running")
+        try:
+            async with self.db_engine.connect() as connection:
+                try:
+                    async with AsyncSession(bind=connection, expire_on_commit=False) as session:
+                        importer = UserImporter(
+                            session, on_progress=report_progress, commit_batches=True
+                        )
+                        report = await importer.run(_read_file(path), fmt)
+                        await commit_session(session)
+                except BaseException:
+                    # 连接上可能留有已提交的暂存表，不归还连接池
+                    await connection.invalidate()
+                    raise
+        except asyncio.CancelledError:
+            await self._update(job, status="failed", error="Import interrupted")
+            raise
+        except Exception as e:
+            logger.exception("User import job failed", job_id=job["id"])
+            error = e.message if isinstance(e, AppException) else "Import failed"
+            await self._update(job, status="failed", error=error)
+        else:
+            await self._update(
+                job,
+                status="completed",
+                progress=importer.progress.snapshot(),
+                report=report.model_dump(mode="json"),
+            )
+        finally:
+            path.unlink(missing_ok=True)
+
+
+user_import_jobs = UserImportJobs(get_redis, engine, ttl=settings.USER_IMPORT_JOB_TTL)
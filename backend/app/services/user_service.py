@@ -1,26 +1,72 @@
 """用户业务逻辑服务."""
+import csv
+import io
+from datetime import datetime
+from functools import partial
+from typing import Any, AsyncIterator, Literal, Mapping, Sequence
+
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import ConflictException, NotFoundException
+from app.core.dataloader import DataLoader
+from app.core.etag import check_if_match, resource_etag
+from app.core.exceptions import (
+    ConflictException,
+    NotFoundException,
+    PreconditionFailedException,
+    ValidationException,
+)
+from app.core.hashing import hash_password, hash_passwords, verify_password
 from app.core.logging import get_logger
-from app.core.security import get_password_hash, verify_password
+from app.core.pagination import CountStrategy
+from app.db.session import after_commit, is_replica_session
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import UserBulkItemResult, UserCreate, UserUpdate
+from app.services.user_cache import UserCache, current_user_cache, get_user_cache
 
 logger = get_logger(__name__)
 
+ExportFormat = Literal["ndjson", "csv"]
+
+# 列表排序（对应 UserRepository.sort_keys）
+UserSort = Literal["created_at", "id", "username"]
+
+# 对外公开的字段（不包含密码哈希），用于导出与列表快速路径
+PUBLIC_COLUMNS = (
+    "id",
+    "email",
+    "username",
+    "full_name",
+    "is_active",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+)
+
+# 搜索词去除首尾空白后的最小长度（过短的词三元组匹配几乎命中全表）
+SEARCH_MIN_LENGTH = 2
+
 
 class UserService:
     """用户业务逻辑层."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: UserCache | None = None):
         """初始化.
 
         Args:
             db: 数据库会话
+            cache: 用户缓存，默认使用全局缓存（未启用时为 None）
         """
         self.repository = UserRepository(db)
+        self.cache = cache or get_user_cache()
+        # 副本上的数据可能滞后，读到的旧版本不能写回共享缓存（否则会覆盖刚做的失效）
+        self.fill_cache = not is_replica_session(db)
+        # 服务实例随请求创建，加载器即为请求级：同一轮次的 get_user 合并为一次查询
+        self._users: DataLoader[int, User] = DataLoader(self._load_users)
+
+    async def _load_users(self, user_ids: list[int]) -> dict[int, User]:
+        return {user.id: user for user in await self.repository.get_many(user_ids)}
 
     async def create_user(self, user_data: UserCreate) -> User:
         """创建用户.
@@ -34,37 +80,114 @@ class UserService:
         Raises:
             ConflictException: 邮箱或用户名已存在
         """
-        # 检查邮箱是否存在
-        if await self.repository.exists_by_email(user_data.email):
-            logger.warning("Attempt to create user with existing email", email=user_data.email)
-            raise ConflictException(
-                message="Email already registered", details={"email": user_data.email}
+        # 邮箱/用户名是否已存在由唯一约束判定，不做预查询
+        hashed_password = await hash_password(user_data.password)
+        try:
+            user = await self.repository.create(
+                email=user_data.email,
+                username=user_data.username,
+                hashed_password=hashed_password,
+                full_name=user_data.full_name,
             )
+        except ConflictException as e:
+            logger.warning("Attempt to create user with existing value", **e.details)
+            raise
 
-        # 检查用户名是否存在
-        if await self.repository.exists_by_username(user_data.username):
-            logger.warning(
-                "Attempt to create user with existing username", username=user_data.username
-            )
-            raise ConflictException(
-                message="Username already taken", details={"username": user_data.username}
-            )
+        logger.info("User created successfully", user_id=user.id, username=user.username)
+        return user
+
+    async def create_users_bulk(self, users_data: list[UserCreate]) -> list[UserBulkItemResult]:
+        """批量创建用户.
+
+        批内重复与已存在的邮箱/用户名会先被剔除（一次查询），其余记录的密码
+        并行哈希后以多行 INSERT 写入；并发写入导致的唯一约束冲突由
+        ON CONFLICT DO NOTHING 兜底，并在结果中标记为 conflict。
 
-        # 创建用户
-        hashed_password = get_password_hash(user_data.password)
-        user = await self.repository.create(
-            email=user_data.email,
-            username=user_data.username,
-            hashed_password=hashed_password,
-            full_name=user_data.full_name,
+        Args:
+            users_data: 用户创建数据列表
+
+        Returns:
+            与输入顺序一致的逐条结果
+        """
+        results: list[UserBulkItemResult | None] = [None] * len(users_data)
+
+        # 批内去重：同一邮箱或用户名只保留第一次出现
+        seen_emails: set[str] = set()
+        seen_usernames: set[str] = set()
+        unique: list[int] = []
+        for index, item in enumerate(users_data):
+            if item.email in seen_emails or item.username in seen_usernames:
+                results[index] = UserBulkItemResult(
+                    index=index,
+                    status="duplicate",
+                    email=item.email,
+                    username=item.username,
+                    error="Duplicate email or username within the batch",
+                )
+                continue
+            seen_emails.add(item.email)
+            seen_usernames.add(item.username)
+            unique.append(index)
+
+        # 与数据库中已有数据比对
+        taken_emails, taken_usernames = await self.repository.find_taken(
+            [users_data[i].email for i in unique], [users_data[i].username for i in unique]
+        )
+        pending: list[int] = []
+        for index in unique:
+            item = users_data[index]
+            if item.email in taken_emails or item.username in taken_usernames:
+                field = "Email" if item.email in taken_emails else "Username"
+                results[index] = UserBulkItemResult(
+                    index=index,
+                    status="conflict",
+                    email=item.email,
+                    username=item.username,
+                    error=f"{field} already registered",
+                )
+            else:
+                pending.append(index)
+
+        hashed = await hash_passwords([users_data[i].password for i in pending])
+        created = await self.repository.create_many(
+            [
+                {
+                    "email": users_data[i].email,
+                    "username": users_data[i].username,
+                    "hashed_password": hashed_password,
+                    "full_name": users_data[i].full_name,
+                }
+                for i, hashed_password in zip(pending, hashed)
+            ],
+            skip_conflicts=True,
         )
 
-        logger.info("User created successfully", user_id=user.id, username=user.username)
-        return user
+        created_by_email = {user.email: user for user in created}
+        for index in pending:
+            item = users_data[index]
+            user = created_by_email.get(item.email)
+            results[index] = UserBulkItemResult(
+                index=index,
+                status="created" if user else "conflict",
+                id=user.id if user else None,
+                email=item.email,
+                username=item.username,
+                error=None if user else "Email or username already registered",
+            )
+
+        logger.info(
+            "Bulk user creation finished",
+            requested=len(users_data),
+            created=len(created),
+        )
+        return [result for result in results if result is not None]
 
     async def get_user(self, user_id: int) -> User:
         """获取用户.
 
+        缓存未命中时经请求级加载器查询，并发的多次调用（如 asyncio.gather）
+        只发出一条 ``id = ANY(...)`` 查询。
+
         Args:
             user_id: 用户 ID
 
@@ -74,29 +197,194 @@ class UserService:
         Raises:
             NotFoundException: 用户不存在
         """
-        user = await self.repository.get(user_id)
+        loader = partial(self._users.load, user_id)
+        if self.cache:
+            user = await self.cache.get_by_id(user_id, loader, fill=self.fill_cache)
+        else:
+            user = await loader()
         if not user:
             raise NotFoundException(message="User not found", details={"user_id": user_id})
         return user
 
-    async def get_users(self, skip: int = 0, limit: int = 20) -> list[User]:
-        """获取用户列表.
+    async def get_user_version(self, user_id: int) -> datetime:
+        """只查询用户的最后更新时间（用于 ETag 校验，不读取缓存）.
+
+        Args:
+            user_id: 用户 ID
+
+        Returns:
+            最后更新时间
+
+        Raises:
+            NotFoundException: 用户不存在
+        """
+        version = await self.repository.get_version(user_id)
+        if version is None:
+            raise NotFoundException(message="User not found", details={"user_id": user_id})
+        return version
+
+    async def get_users_by_ids(self, user_ids: Sequence[int]) -> list[User]:
+        """按 ID 批量获取用户（一次查询，不逐个访问缓存）.
+
+        Args:
+            user_ids: 用户 ID（可重复）
+
+        Returns:
+            存在的用户，按 user_ids 中首次出现的顺序排列
+        """
+        found = await self._users.load_many(user_ids)
+        return [found[user_id] for user_id in dict.fromkeys(user_ids) if user_id in found]
+
+    async def get_user_by_username(self, username: str) -> User | None:
+        """根据用户名获取用户.
+
+        Args:
+            username: 用户名
+
+        Returns:
+            用户实例 或 None
+        """
+        loader = partial(self.repository.get_by_username, username)
+        if not self.cache:
+            return await loader()
+        return await self.cache.get_by_username(username, loader, fill=self.fill_cache)
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        """根据邮箱获取用户.
+
+        Args:
+            email: 邮箱地址
+
+        Returns:
+            用户实例 或 None
+        """
+        loader = partial(self.repository.get_by_email, email)
+        if not self.cache:
+            return await loader()
+        return await self.cache.get_by_email(email, loader, fill=self.fill_cache)
+
+    async def get_users(
+        self,
+        cursor: str | None = None,
+        limit: int = 20,
+        filters: Mapping[str, Any] | None = None,
+        sort: UserSort = "created_at",
+        descending: bool = False,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """获取用户列表（游标分页）.
+
+        只查询公开字段并返回普通字典，不构建 ORM 对象，可直接交给响应序列化。
 
         Args:
-            skip: 跳过数量
+            cursor: 上一页返回的游标
             limit: 限制数量
+            filters: 过滤条件（is_active / is_superuser / created_after / created_before）
+            sort: 排序字段
+            descending: 是否倒序
+
+        Returns:
+            (用户字典列表, 下一页游标)
+        """
+        return await self.repository.get_page_rows(
+            PUBLIC_COLUMNS,
+            cursor=cursor,
+            limit=limit,
+            filters=filters,
+            sort=sort,
+            descending=descending,
+        )
+
+    async def search_users(self, query: str, limit: int) -> list[dict[str, Any]]:
+        """按用户名、邮箱、姓名搜索用户（前缀与模糊匹配）.
+
+        Args:
+            query: 搜索词
+            limit: 最多返回的条数
+
+        Returns:
+            公开字段加 score 的行字典，按相关度降序
+
+        Raises:
+            ValidationException: 去除首尾空白后搜索词过短
+        """
+        term = query.strip()
+        if len(term) < SEARCH_MIN_LENGTH:
+            raise ValidationException(
+                message="Search query too short",
+                details={"min_length": SEARCH_MIN_LENGTH},
+            )
+        return await self.repository.search(term, PUBLIC_COLUMNS, limit)
+
+    async def count_users(
+        self,
+        strategy: CountStrategy | None = None,
+        filters: Mapping[str, Any] | None = None,
+    ) -> tuple[int | None, CountStrategy | None]:
+        """统计用户总数.
+
+        带过滤条件时估算与缓存计数都不适用，只在显式要求 exact 时精确计数，
+        否则不返回总数（过滤后的 count(*) 可能扫描大量行）。
+
+        Args:
+            strategy: 计数策略，默认使用配置
+            filters: 过滤条件
 
         Returns:
-            用户列表
+            (总数, 实际使用的策略)，不统计时均为 None
         """
-        return await self.repository.get_multi(skip=skip, limit=limit)
+        active = {name: value for name, value in (filters or {}).items() if value is not None}
+        if active:
+            if strategy != "exact":
+                return None, None
+            return await self.repository.count_filtered(active), "exact"
+        return await self.repository.count_with_strategy(strategy)
+
+    async def export_users(
+        self, fmt: ExportFormat = "ndjson", batch_size: int = 1000
+    ) -> AsyncIterator[bytes]:
+        """流式导出全部用户.
 
-    async def update_user(self, user_id: int, user_data: UserUpdate) -> User:
+        Args:
+            fmt: 导出格式（ndjson / csv）
+            batch_size: 每批读取的行数，每批编码为一个数据块
+
+        Yields:
+            编码后的数据块
+        """
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(PUBLIC_COLUMNS)
+            yield buffer.getvalue().encode()
+
+        exported = 0
+        async for rows in self.repository.stream_rows(PUBLIC_COLUMNS, batch_size=batch_size):
+            if fmt == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(
+                    [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+                    for row in rows
+                )
+                yield buffer.getvalue().encode()
+            else:
+                yield b"".join(
+                    orjson.dumps(dict(zip(PUBLIC_COLUMNS, row))) + b"\n" for row in rows
+                )
+            exported += len(rows)
+
+        logger.info("User export finished", format=fmt, rows=exported)
+
+    async def update_user(
+        self, user_id: int, user_data: UserUpdate, expected_etag: str | None = None
+    ) -> User:
         """更新用户.
 
         Args:
             user_id: 用户 ID
             user_data: 更新数据
+            expected_etag: If-Match 请求头；指定时先锁定该行并核对版本，
+                不一致则拒绝更新（乐观并发控制）
 
         Returns:
             更新后的用户
@@ -104,36 +392,40 @@ class UserService:
         Raises:
             NotFoundException: 用户不存在
             ConflictException: 邮箱或用户名已被其他用户使用
+            PreconditionFailedException: 用户已被他人修改
         """
-        # 检查用户是否存在
-        user = await self.get_user(user_id)
+        if expected_etag is not None:
+            # 行锁保持到事务结束，核对与更新之间不会插入其他修改
+            version = await self.repository.get_version(user_id, for_update=True)
+            if version is None:
+                raise NotFoundException(message="User not found", details={"user_id": user_id})
+            current = resource_etag(user_id, version)
+            if not check_if_match(expected_etag, current):
+                raise PreconditionFailedException(
+                    message="User has been modified",
+                    details={"user_id": user_id, "etag": current},
+                )
 
         # 准备更新数据
         update_data = user_data.model_dump(exclude_unset=True)
-
-        # 检查邮箱冲突
-        if "email" in update_data and update_data["email"] != user.email:
-            if await self.repository.exists_by_email(update_data["email"]):
-                raise ConflictException(
-                    message="Email already in use", details={"email": update_data["email"]}
-                )
-
-        # 检查用户名冲突
-        if "username" in update_data and update_data["username"] != user.username:
-            if await self.repository.exists_by_username(update_data["username"]):
-                raise ConflictException(
-                    message="Username already taken", details={"username": update_data["username"]}
-                )
+        if not update_data:
+            return await self.get_user(user_id)
 
         # 处理密码更新
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await hash_password(update_data.pop("password"))
 
-        # 更新用户
+        # 存在性与唯一性均由 UPDATE ... RETURNING 一次判定
         updated_user = await self.repository.update(user_id, **update_data)
+        self._users.clear(user_id)
+        if updated_user is None:
+            raise NotFoundException(message="User not found", details={"user_id": user_id})
+
+        # 旧的用户名/邮箱索引无需删除：读取时会核对并自行清理
+        await self._invalidate_cache(updated_user)
 
         logger.info("User updated successfully", user_id=user_id)
-        return updated_user  # type: ignore
+        return updated_user
 
     async def delete_user(self, user_id: int) -> None:
         """删除用户.
@@ -144,16 +436,34 @@ class UserService:
         Raises:
             NotFoundException: 用户不存在
         """
-        # 检查用户是否存在
-        await self.get_user(user_id)
-
-        # 删除用户
-        await self.repository.delete(user_id)
+        user = await self.repository.delete(user_id)
+        self._users.clear(user_id)
+        if user is None:
+            raise NotFoundException(message="User not found", details={"user_id": user_id})
+        await self._invalidate_cache(user)
         logger.info("User deleted successfully", user_id=user_id)
 
+    async def _invalidate_cache(self, *users: User) -> None:
+        """失效用户缓存（Redis 用户缓存与本进程的当前用户缓存）.
+
+        立即删除一次，事务提交后再删除一次，避免提交前的并发读取把旧数据回填到缓存.
+
+        Args:
+            *users: 受影响的用户
+        """
+        await self._evict(*users)
+        after_commit(self.repository.db, partial(self._evict, *users))
+
+    async def _evict(self, *users: User) -> None:
+        current_user_cache.invalidate(*(user.id for user in users))
+        if self.cache:
+            await self.cache.invalidate(*users)
+
     async def authenticate(self, username: str, password: str) -> User | None:
         """认证用户.
 
+        用户缓存不保存密码哈希，因此直接查询数据库。
+
         Args:
             username: 用户名
             password: 密码
@@ -165,7 +475,7 @@ class UserService:
         if not user:
             return None
 
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password(password, user.hashed_password):
             return None
 
         return user
@@ -0,0 +1,57 @@
+"""基准测试公共工具."""
+import statistics
+from typing import Iterable
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """计算分位数.
+
+    Args:
+        samples: 样本
+        q: 分位（0-1）
+
+    Returns:
+        分位数值，无样本时返回 0
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label: str, latencies: list[float]) -> str:
+    """格式化延迟统计（输入单位为秒，输出单位为毫秒）.
+
+    Args:
+        label: 场景名称
+        latencies: 延迟样本
+
+    Returns:
+        单行统计文本
+    """
+    if not latencies:
+        return f"{label:<32} no samples"
+    return (
+        f"{label:<32} n={len(latencies):<7} "
+        f"mean={statistics.fmean(latencies) * 1000:8.2f}ms "
+        f"p50={percentile(latencies, 0.50) * 1000:8.2f}ms "
+        f"p95={percentile(latencies, 0.95) * 1000:8.2f}ms "
+        f"p99={percentile(latencies, 0.99) * 1000:8.2f}ms"
+    )
+
+
+def print_table(headers: Iterable[str], rows: Iterable[Iterable[object]]) -> None:
+    """打印简单的对齐表格.
+
+    Args:
+        headers: 表头
+        rows: 数据行
+    """
+    headers = [str(h) for h in headers]
+    rows = [[str(c) for c in row] for row in rows]
+    widths = [max([len(h)] + [len(r[i]) for r in rows]) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(c.ljust(w) for c, w in zip(row, widths)))
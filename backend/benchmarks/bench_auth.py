@@ -0,0 +1,117 @@
+"""认证依赖的每请求开销：有无令牌声明缓存与当前用户缓存.
+
+逐个执行 ``verify_access_token`` + ``resolve_user``（即 CurrentUser 依赖的主体），
+每个场景轮流使用 ``--users`` 个用户的令牌：
+
+- ``no-cache``：每次校验签名、解码 JSON，并打开只读会话按主键查询用户
+- ``token-cache``：令牌声明命中缓存，用户仍每次查询数据库
+- ``both``：令牌与用户均命中进程内缓存，不访问数据库
+
+不经过 Redis 用户缓存（USER_CACHE_ENABLED 置为关闭），合成用户在开始时提交、结束时删除。
+
+用法（需要已迁移的可写 PostgreSQL，使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_auth --requests 5000 --users 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.core.security import create_access_token, token_claims_cache, verify_access_token
+from app.db.session import AsyncSessionLocal, close_db
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from app.services.auth_service import resolve_user
+from app.services.user_cache import current_user_cache
+from benchmarks._common import percentile, print_table
+
+HASHED_PASSWORD = "$2b$12$" + "x" * 53
+
+# 场景 -> (令牌缓存容量, 用户缓存容量)
+SCENARIOS = {
+    "no-cache": (0, 0),
+    "token-cache": (settings.AUTH_TOKEN_CACHE_SIZE, 0),
+    "both": (settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_USER_CACHE_SIZE),
+}
+
+
+async def _measure(tokens: list[str], requests: int) -> tuple[list[float], list[float]]:
+    verify, total = [], []
+    for i in range(requests):
+        token = tokens[i % len(tokens)]
+        start = time.perf_counter()
+        claims = verify_access_token(token)
+        verified = time.perf_counter()
+        await resolve_user(claims)
+        end = time.perf_counter()
+        verify.append(verified - start)
+        total.append(end - start)
+    return verify, total
+
+
+async def _run(args: argparse.Namespace) -> None:
+    settings.USER_CACHE_ENABLED = False
+    current_user_cache.ttl = max(current_user_cache.ttl, 60.0)
+    tag = f"auth_{uuid.uuid4().hex[:8]}"
+    users: list[User] = []
+    try:
+        async with AsyncSessionLocal() as session:
+            users = await UserRepository(session).create_many(
+                [
+                    {
+                        "email": f"{tag}_{i}@example.com",
+                        "username": f"{tag}_{i}",
+                        "hashed_password": HASHED_PASSWORD,
+                    }
+                    for i in range(args.users)
+                ]
+            )
+            await session.commit()
+            user_ids = [user.id for user in users]
+        tokens = [create_access_token({"sub": str(user_id)}) for user_id in user_ids]
+
+        rows = []
+        for name, (token_size, user_size) in SCENARIOS.items():
+            token_claims_cache.clear()
+            current_user_cache.entries.clear()
+            token_claims_cache.maxsize = token_size
+            current_user_cache.entries.maxsize = user_size
+            await _measure(tokens, len(tokens))  # 预热（填充缓存、建立连接）
+            verify, total = await _measure(tokens, args.requests)
+            rows.append(
+                [
+                    name,
+                    f"{statistics.fmean(verify) * 1e6:.1f}",
+                    f"{statistics.fmean(total) * 1e6:.1f}",
+                    f"{percentile(total, 0.50) * 1e6:.1f}",
+                    f"{percentile(total, 0.99) * 1e6:.1f}",
+                    f"{args.requests / sum(total):,.0f}",
+                ]
+            )
+        print_table(
+            ["scenario", "verify mean us", "total mean us", "p50 us", "p99 us", "auth/sec"], rows
+        )
+    finally:
+        if users:
+            async with AsyncSessionLocal() as session:
+                await session.execute(delete(User).where(User.username.startswith(tag)))
+                await session.commit()
+        await close_db()
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
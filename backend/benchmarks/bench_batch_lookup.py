@@ -0,0 +1,120 @@
+"""按 ID 批量取用户基准：N 次单条查询 vs 一次批量查询.
+
+- ``single``：模拟客户端逐个调用 ``GET /users/{id}``，每个 ID 新开会话并查询一次
+- ``single-session``：同一会话内逐个 ``get``（仍是 N 次往返）
+- ``dataloader``：同一会话内 ``asyncio.gather`` N 次 ``UserService.get_user``，
+  请求级加载器合并为一条查询
+- ``batch``：``GET /users?ids=...`` 的路径，一条 ``id = ANY(:ids)`` 查询
+
+合成用户在开始时提交、结束时删除。
+
+用法（需要已迁移的可写 PostgreSQL，默认使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_batch_lookup --n 10 50 100 --repeat 20
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from app.services.user_service import UserService
+from benchmarks._common import print_table
+
+HASHED_PASSWORD = "$2b$12$" + "x" * 53
+
+
+async def _run(database_url: str, sizes: list[int], repeat: int) -> None:
+    # 只比较数据库访问方式，不经过 Redis 缓存
+    settings.USER_CACHE_ENABLED = False
+    engine = create_async_engine(database_url)
+    statements = 0
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args: Any) -> None:
+        nonlocal statements
+        statements += 1
+
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    tag = f"bl_{uuid.uuid4().hex[:8]}"
+    rows = []
+    try:
+        async with sessions() as session:
+            users = await UserRepository(session).create_many(
+                [
+                    {
+                        "email": f"{tag}_{i}@example.com",
+                        "username": f"{tag}_{i}",
+                        "hashed_password": HASHED_PASSWORD,
+                    }
+                    for i in range(max(sizes))
+                ]
+            )
+            await session.commit()
+        all_ids = [user.id for user in users]
+
+        async def single(ids: list[int]) -> int:
+            found = 0
+            for user_id in ids:
+                async with sessions() as session:
+                    found += await UserRepository(session).get(user_id) is not None
+            return found
+
+        async def single_session(ids: list[int]) -> int:
+            async with sessions() as session:
+                repo = UserRepository(session)
+                return sum([await repo.get(user_id) is not None for user_id in ids])
+
+        async def dataloader(ids: list[int]) -> int:
+            async with sessions() as session:
+                service = UserService(session)
+                return len(await asyncio.gather(*(service.get_user(i) for i in ids)))
+
+        async def batch(ids: list[int]) -> int:
+            async with sessions() as session:
+                return len(await UserService(session).get_users_by_ids(ids))
+
+        variants: dict[str, Callable[[list[int]], Awaitable[int]]] = {
+            "single": single,
+            "single-session": single_session,
+            "dataloader": dataloader,
+            "batch": batch,
+        }
+        for n in sizes:
+            ids = all_ids[:n]
+            for name, run in variants.items():
+                assert await run(ids) == n  # 预热并校验结果
+                statements = 0
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    await run(ids)
+                elapsed = (time.perf_counter() - start) / repeat
+                rows.append([n, name, f"{elapsed * 1000:.2f}", statements // repeat])
+
+        async with sessions() as session:
+            await session.execute(delete(User).where(User.id.in_(all_ids)))
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+    print_table(["ids", "variant", "ms/lookup", "statements"], rows)
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--n", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_run(args.database_url, args.n, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""批量创建用户吞吐量基准.
+
+对比逐条 ``POST /api/v1/users`` 与 ``POST /api/v1/users/bulk`` 导入同样数量用户的
+吞吐量（users/sec）。两种方式都包含 bcrypt 哈希，因此结果主要受进程池大小
+（HASH_POOL_WORKERS）影响；批量接口节省的是逐条请求的存在性检查、INSERT、
+refresh 与 HTTP 往返。
+
+用法（需先启动后端服务）::
+
+    python -m benchmarks.bench_bulk_create --users 2000 --batch-size 200
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from benchmarks._common import print_table
+
+
+def _payloads(count: int, tag: str) -> list[dict[str, str]]:
+    run = uuid.uuid4().hex[:8]
+    return [
+        {
+            "email": f"{tag}_{run}_{i}@example.com",
+            "username": f"{tag}_{run}_{i}",
+            "password": "benchmark-password",
+        }
+        for i in range(count)
+    ]
+
+
+async def _single(
+    client: httpx.AsyncClient, users: list[dict[str, str]], concurrency: int
+) -> int:
+    queue: asyncio.Queue[dict[str, str]] = asyncio.Queue()
+    for user in users:
+        queue.put_nowait(user)
+    created = 0
+
+    async def worker() -> None:
+        nonlocal created
+        while not queue.empty():
+            response = await client.post("/api/v1/users", json=queue.get_nowait())
+            created += response.status_code == 201
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return created
+
+
+async def _bulk(client: httpx.AsyncClient, users: list[dict[str, str]], batch_size: int) -> int:
+    created = 0
+    for start in range(0, len(users), batch_size):
+        response = await client.post(
+            "/api/v1/users/bulk", json={"users": users[start : start + batch_size]}
+        )
+        response.raise_for_status()
+        created += response.json()["created"]
+    return created
+
+
+async def _run(base_url: str, count: int, batch_size: int, concurrency: int) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        rows = []
+        start = time.perf_counter()
+        created = await _single(client, _payloads(count, "single"), concurrency)
+        elapsed = time.perf_counter() - start
+        rate = created / elapsed
+        rows.append([f"single x{concurrency}", created, f"{elapsed:.2f}", f"{rate:.1f}"])
+
+        start = time.perf_counter()
+        created = await _bulk(client, _payloads(count, "bulk"), batch_size)
+        elapsed = time.perf_counter() - start
+        rate = created / elapsed
+        rows.append([f"bulk /{batch_size}", created, f"{elapsed:.2f}", f"{rate:.1f}"])
+    print_table(["mode", "created", "seconds", "users/s"], rows)
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="逐条创建的并发数")
+    args = parser.parse_args()
+    asyncio.run(_run(args.base_url, args.users, args.batch_size, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""列表总数统计策略基准.
+
+在独立的临时表 ``bench_count_rows`` 中用 generate_series 生成 N 行数据并 ANALYZE，
+分别测量 BaseRepository 的三种计数策略的耗时：
+
+- ``exact``：``SELECT count(*)``
+- ``estimate``：读取 ``pg_class.reltuples``
+- ``cached``：首次精确计数（miss）与后续命中（hit）
+
+用法（需要可写的 PostgreSQL，默认使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_count --rows 1000000 10000000
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import BigInteger, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.core.config import settings
+from app.repositories.base import BaseRepository
+from benchmarks._common import print_table, summarize
+
+TABLE = "bench_count_rows"
+
+
+class _BenchBase(DeclarativeBase):
+    pass
+
+
+class BenchRow(_BenchBase):
+    """基准测试用的临时表."""
+
+    __tablename__ = TABLE
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+
+async def _seed(session: AsyncSession, rows: int) -> None:
+    await session.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    await session.execute(text(f"CREATE TABLE {TABLE} (id bigint PRIMARY KEY, payload text)"))
+    await session.execute(
+        text(f"INSERT INTO {TABLE} SELECT g, md5(g::text) FROM generate_series(1, :n) AS g"),
+        {"n": rows},
+    )
+    await session.commit()
+    await session.execute(text(f"ANALYZE {TABLE}"))
+    await session.commit()
+
+
+async def _time(
+    coro_factory: Callable[[], Awaitable[tuple[int, str]]], repeat: int
+) -> tuple[list[float], int]:
+    samples = []
+    value = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value, _strategy = await coro_factory()
+        samples.append(time.perf_counter() - start)
+    return samples, value
+
+
+async def _run(database_url: str, sizes: list[int], repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    rows = []
+    try:
+        async with AsyncSession(engine) as session:
+            for size in sizes:
+                print(f"seeding {size:,} rows ...")
+                await _seed(session, size)
+                repo = BaseRepository(BenchRow, session)
+
+                exact, exact_value = await _time(lambda: repo.count_with_strategy("exact"), repeat)
+                estimate, estimate_value = await _time(
+                    lambda: repo.count_with_strategy("estimate"), repeat
+                )
+                repo.invalidate_count()
+                miss, _ = await _time(lambda: repo.count_with_strategy("cached"), 1)
+                hit, _ = await _time(lambda: repo.count_with_strategy("cached"), repeat)
+
+                for label, samples, value in (
+                    ("exact", exact, exact_value),
+                    ("estimate", estimate, estimate_value),
+                    ("cached (miss)", miss, exact_value),
+                    ("cached (hit)", hit, exact_value),
+                ):
+                    print(summarize(f"{size:,} rows {label}", samples))
+                    rows.append([f"{size:,}", label, f"{value:,}", f"{min(samples) * 1000:.3f}"])
+            await session.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+    print()
+    print_table(["rows", "strategy", "total", "best ms"], rows)
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_run(args.database_url, args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""用户流式导出内存基准.
+
+在一个事务中用 generate_series 向 users 表插入 N 行合成数据，通过
+UserService.export_users 完整消费导出流（与 /users/export 相同的代码路径），
+用 tracemalloc 统计 Python 内存峰值；结束后回滚事务，不留下任何数据。
+内存上限的回归断言见 ``tests/test_export.py``。
+
+用法（需要已迁移的可写 PostgreSQL，默认使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_export --rows 1000000 --format ndjson csv
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.services.user_service import UserService
+from benchmarks._common import print_table
+
+_SEED_SQL = """
+INSERT INTO users (email, username, hashed_password, full_name, is_active, is_superuser)
+SELECT
+    'bench_export_' || g || '@example.com',
+    'bench_export_' || g,
+    'x',
+    'Bench User ' || g,
+    true,
+    false
+FROM generate_series(1, :n) AS g
+"""
+
+
+async def _export(session: AsyncSession, fmt: str) -> tuple[int, int, float, float]:
+    service = UserService(session, cache=None)
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = 0
+    size = 0
+    try:
+        async for chunk in service.export_users(fmt):
+            chunks += 1
+            size += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return chunks, size, time.perf_counter() - start, peak / 1024 / 1024
+
+
+async def _run(database_url: str, rows: int, formats: list[str]) -> None:
+    engine = create_async_engine(database_url)
+    results = []
+    try:
+        async with AsyncSession(engine) as session:
+            print(f"seeding {rows:,} rows ...")
+            await session.execute(text(_SEED_SQL), {"n": rows})
+            for fmt in formats:
+                chunks, size, elapsed, peak_mb = await _export(session, fmt)
+                results.append(
+                    [
+                        fmt,
+                        f"{chunks:,}",
+                        f"{size / 1024 / 1024:.1f}",
+                        f"{elapsed:.2f}",
+                        f"{peak_mb:.1f}",
+                    ]
+                )
+            # 合成数据只存在于本事务中
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+    print()
+    print_table(["format", "chunks", "MB out", "seconds", "peak MB"], results)
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", nargs="+", default=["ndjson", "csv"], choices=["ndjson", "csv"])
+    args = parser.parse_args()
+    asyncio.run(_run(args.database_url, args.rows, args.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""注册压测下的读请求延迟基准.
+
+在大量并发注册（bcrypt 哈希）的同时，持续请求 ``GET /api/v1/users/{id}``，
+统计读请求的 p50/p95/p99。分别对比「无注册负载」与「有注册负载」两种场景，
+用于验证哈希运算已移出事件循环。
+
+用法（需先启动后端服务，建议单 worker 以放大阻塞效果）::
+
+    uvicorn app.main:app --workers 1
+    python -m benchmarks.bench_hashing --base-url http://localhost:8000 --duration 10
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from benchmarks._common import summarize
+
+
+async def _reader(
+    client: httpx.AsyncClient, user_id: int, deadline: float, out: list[float]
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(f"/api/v1/users/{user_id}")
+        response.raise_for_status()
+        out.append(time.perf_counter() - start)
+
+
+async def _signup(client: httpx.AsyncClient, deadline: float, out: list[float]) -> None:
+    while time.perf_counter() < deadline:
+        suffix = uuid.uuid4().hex[:12]
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/v1/users",
+            json={
+                "email": f"bench_{suffix}@example.com",
+                "username": f"bench_{suffix}",
+                "password": "benchmark-password",
+            },
+        )
+        if response.status_code == 201:
+            out.append(time.perf_counter() - start)
+
+
+async def _run(base_url: str, duration: float, readers: int, signups: int, user_id: int) -> None:
+    limits = httpx.Limits(max_connections=readers + signups + 4)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for label, signup_count in (("idle", 0), (f"{signups} signup loops", signups)):
+            read_latencies: list[float] = []
+            signup_latencies: list[float] = []
+            deadline = time.perf_counter() + duration
+            tasks = [_reader(client, user_id, deadline, read_latencies) for _ in range(readers)]
+            tasks += [_signup(client, deadline, signup_latencies) for _ in range(signup_count)]
+            await asyncio.gather(*tasks)
+            print(summarize(f"GET /users/{{id}} [{label}]", read_latencies))
+            if signup_count:
+                print(summarize("POST /users", signup_latencies))
+
+
+async def _ensure_user(base_url: str) -> int:
+    suffix = uuid.uuid4().hex[:12]
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        response = await client.post(
+            "/api/v1/users",
+            json={
+                "email": f"reader_{suffix}@example.com",
+                "username": f"reader_{suffix}",
+                "password": "benchmark-password",
+            },
+        )
+        response.raise_for_status()
+        return int(response.json()["id"])
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=10.0, help="每个场景持续秒数")
+    parser.add_argument("--readers", type=int, default=16, help="并发读协程数")
+    parser.add_argument("--signups", type=int, default=8, help="并发注册协程数")
+    parser.add_argument("--user-id", type=int, default=None, help="读取的用户 ID，缺省时自动创建")
+    args = parser.parse_args()
+
+    user_id = args.user_id or asyncio.run(_ensure_user(args.base_url))
+    asyncio.run(_run(args.base_url, args.duration, args.readers, args.signups, user_id))
+
+
+if __name__ == "__main__":
+    main()
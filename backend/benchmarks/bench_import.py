@@ -0,0 +1,103 @@
+"""用户 COPY 导入吞吐量基准.
+
+生成 N 行合成 CSV（含少量非法行与文件内重复行），分块喂给 UserImporter，
+过程中打印进度与行/秒；导入在单个事务中进行，结束后回滚，不留下任何数据。
+
+吞吐量通常受 bcrypt 哈希限制（HASH_POOL_WORKERS），``--skip-hash`` 以固定
+哈希值替换进程池哈希，用于单独观察解析、校验与 COPY 的速度。
+
+用法（需要已迁移的可写 PostgreSQL，默认使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_import --rows 100000 --skip-hash
+"""
+import argparse
+import asyncio
+import uuid
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.core.hashing import hashing_executor
+from app.services import user_import
+from app.services.user_import import ImportProgress, UserImporter
+from benchmarks._common import print_table
+
+# 每个字节块包含的行数
+LINES_PER_CHUNK = 10_000
+
+
+async def _csv_chunks(rows: int) -> AsyncIterator[bytes]:
+    run = uuid.uuid4().hex[:8]
+    yield b"email,username,password,full_name\n"
+    for start in range(0, rows, LINES_PER_CHUNK):
+        lines = []
+        for i in range(start, min(start + LINES_PER_CHUNK, rows)):
+            if i % 1000 == 999:
+                lines.append(f"invalid-{i},x,short,")
+            elif i % 1000 == 998:
+                lines.append(f"imp_{run}_0@example.com,imp_{run}_dup_{i},benchmark-password,")
+            else:
+                lines.append(f"imp_{run}_{i}@example.com,imp_{run}_{i},benchmark-password,User {i}")
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def _fixed_hashes(passwords: Sequence[str]) -> list[str]:
+    return ["$2b$12$" + "x" * 53] * len(passwords)
+
+
+async def _print_progress(progress: ImportProgress) -> None:
+    snapshot = progress.snapshot()
+    print(
+        f"  {snapshot['processed']:>10,} rows  {snapshot['rows_per_second']:>10,.0f} rows/s"
+        f"  staged={snapshot['staged']:,} invalid={snapshot['invalid']:,}"
+    )
+
+
+async def _run(database_url: str, rows: int, chunk_size: int, skip_hash: bool) -> None:
+    if skip_hash:
+        user_import.hash_passwords = _fixed_hashes
+    else:
+        hashing_executor.start()
+
+    engine = create_async_engine(database_url)
+    try:
+        async with AsyncSession(engine) as session:
+            importer = UserImporter(session, chunk_size=chunk_size, on_progress=_print_progress)
+            report = await importer.run(_csv_chunks(rows), "csv")
+            await session.rollback()
+    finally:
+        await engine.dispose()
+        if not skip_hash:
+            await hashing_executor.shutdown()
+
+    print()
+    print_table(
+        ["processed", "imported", "invalid", "duplicate", "conflict", "seconds", "rows/s"],
+        [
+            [
+                f"{report.processed:,}",
+                f"{report.imported:,}",
+                f"{report.invalid:,}",
+                f"{report.duplicate:,}",
+                f"{report.conflict:,}",
+                f"{report.elapsed_seconds:.2f}",
+                f"{report.rows_per_second:,.0f}",
+            ]
+        ],
+    )
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=settings.USER_IMPORT_CHUNK_SIZE)
+    parser.add_argument("--skip-hash", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(_run(args.database_url, args.rows, args.chunk_size, args.skip_hash))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""用户列表页 CPU 开销基准：ORM 路径 vs Core 行映射快速路径.
+
+每次迭代读取一页（默认 1000 行）并经过与 ``GET /api/v1/users`` 相同的
+response_model 校验与序列化：
+
+- ``orm``：``get_page`` 构建 ORM 对象 → ``PaginatedResponse[User]``（from_attributes）
+  → FastAPI 转回字典再按 response_model 校验、序列化
+- ``core``：``get_page_rows`` 只查公开列返回普通字典 → 按 response_model
+  校验、序列化一次
+
+以 ``time.process_time`` 统计本进程 CPU 时间（不含等待数据库的时间）。
+合成数据在事务内插入，结束后回滚。
+
+用法（需要已迁移的可写 PostgreSQL，默认使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_list_page --rows 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.main import app
+from app.repositories.user_repository import UserRepository
+from app.schemas.base import PaginatedResponse
+from app.schemas.user import User
+from app.services.user_service import PUBLIC_COLUMNS
+from benchmarks._common import print_table
+
+_SEED_SQL = """
+INSERT INTO users (email, username, hashed_password, full_name, is_active, is_superuser)
+SELECT 'bench_list_' || g || '@example.com', 'bench_list_' || g, 'x', 'Bench User ' || g,
+       true, false
+FROM generate_series(1, :n) AS g
+"""
+
+
+def _response_field() -> Any:
+    for route in app.routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.path == f"{settings.API_V1_PREFIX}/users"
+            and "GET" in route.methods
+        ):
+            return route.response_field
+    raise RuntimeError("GET /users route not found")
+
+
+async def _orm_page(repo: UserRepository, rows: int) -> Any:
+    users, next_cursor = await repo.get_page(limit=rows)
+    return PaginatedResponse[User](items=users, next_cursor=next_cursor, limit=rows)
+
+
+async def _core_page(repo: UserRepository, rows: int) -> Any:
+    users, next_cursor = await repo.get_page_rows(PUBLIC_COLUMNS, limit=rows)
+    return {"items": users, "next_cursor": next_cursor, "limit": rows}
+
+
+async def _run(database_url: str, rows: int, repeat: int) -> None:
+    field = _response_field()
+    engine = create_async_engine(database_url)
+    results = []
+    try:
+        async with AsyncSession(engine) as session:
+            await session.execute(text(_SEED_SQL), {"n": rows})
+            repo = UserRepository(session)
+            paths: dict[str, Callable[[UserRepository, int], Awaitable[Any]]] = {
+                "orm": _orm_page,
+                "core": _core_page,
+            }
+            cpu: dict[str, float] = {}
+            for name, page in paths.items():
+                # 预热：编译缓存、预编译语句
+                await serialize_response(field=field, response_content=await page(repo, rows))
+                session.expunge_all()
+                start = time.process_time()
+                for _ in range(repeat):
+                    content = await page(repo, rows)
+                    await serialize_response(field=field, response_content=content)
+                    session.expunge_all()
+                cpu[name] = (time.process_time() - start) / repeat * 1000
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+    for name, ms in cpu.items():
+        results.append([name, f"{ms:.2f}", f"{ms / rows * 1000:.2f}"])
+    print_table([f"path ({rows} rows/page)", "CPU ms/page", "CPU ms/1000 rows"], results)
+    saved = cpu["orm"] - cpu["core"]
+    print(f"\nsaved: {saved:.2f} ms CPU per page ({saved / cpu['orm'] * 100:.0f}%)")
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_run(args.database_url, args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
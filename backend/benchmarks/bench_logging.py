@@ -0,0 +1,95 @@
+"""日志处理器链基准.
+
+对比改造前后 structlog 处理器链的事件吞吐量（events/sec）：
+
+- ``legacy``：每次调用都创建 ZoneInfo 并 strftime + isoformat 的时间戳处理器，
+  加上 ``JSONRenderer(indent=2, sort_keys=True)``
+- ``json``：按秒缓存的时间戳处理器 + orjson 单行渲染（生产格式）
+- ``json_pretty``：按秒缓存的时间戳处理器 + 缩进 JSON（开发格式）
+
+渲染结果由 ReturnLogger 直接返回，不包含 I/O。
+
+用法::
+
+    python -m benchmarks.bench_logging --events 200000
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import structlog
+from structlog.types import EventDict, Processor
+
+from app.core.logging import build_processors
+from benchmarks._common import print_table
+
+
+def legacy_china_timestamp(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    """改造前的时间戳处理器."""
+    now = datetime.now(ZoneInfo("Asia/Shanghai"))
+    event_dict["timestamp"] = now.strftime("%Y-%m-%d %H:%M:%S")
+    event_dict["timestamp_iso"] = now.isoformat()
+    return event_dict
+
+
+def legacy_processors() -> list[Processor]:
+    """改造前的 JSON 处理器链."""
+    return [
+        structlog.contextvars.merge_contextvars,
+        structlog.stdlib.add_log_level,
+        legacy_china_timestamp,
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+        structlog.processors.JSONRenderer(indent=2, ensure_ascii=False, sort_keys=True),
+    ]
+
+
+def _measure(processors: list[Processor], events: int) -> float:
+    log = structlog.wrap_logger(structlog.ReturnLogger(), processors=processors)
+    for _ in range(1000):
+        log.info("warmup", request_id="abc", method="GET", path="/api/v1/health")
+    start = time.perf_counter()
+    for i in range(events):
+        log.info(
+            "Request completed",
+            request_id="4f1c2b9e-6d1a-4f7e-9d3b-1c2e3f4a5b6c",
+            method="GET",
+            path="/api/v1/users/42",
+            status_code=200,
+            process_time="0.003s",
+            seq=i,
+        )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200000)
+    args = parser.parse_args()
+
+    # 去掉依赖 stdlib logger 的 add_logger_name，其余与应用配置一致
+    def current(log_format: str) -> list[Processor]:
+        chain = build_processors(log_format)
+        return [p for p in chain if p is not structlog.stdlib.add_logger_name]
+
+    chains = {
+        "legacy": legacy_processors(),
+        "json": current("json"),
+        "json_pretty": current("json_pretty"),
+    }
+    results = {name: _measure(chain, args.events) for name, chain in chains.items()}
+
+    baseline = args.events / results["legacy"]
+    rows = []
+    for name, elapsed in results.items():
+        rate = args.events / elapsed
+        per_event = elapsed / args.events * 1e6
+        rows.append([name, f"{rate:,.0f}", f"{per_event:.2f}", f"{rate / baseline:.2f}x"])
+    print_table(["chain", "events/s", "us/event", "vs legacy"], rows)
+
+
+if __name__ == "__main__":
+    main()
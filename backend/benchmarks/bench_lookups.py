@@ -0,0 +1,126 @@
+"""用户查询语句吞吐量基准（statements/sec）.
+
+对比每次调用新建 ``select()`` 与使用 BaseRepository 预构建语句注册表的
+get / get_by_email / get_by_username：
+
+- ``--offline``：不连数据库，只测量 SQLAlchemy 在执行前的 CPU 开销
+  （构造语句 + 生成缓存键 + 命中编译缓存），反映注册表本身的收益；
+- 默认：对数据库执行查询，可用 ``--pgbouncer`` 切换到 PgBouncer 兼容的连接参数，
+  观察关闭预编译语句缓存的代价。
+
+用法::
+
+    python -m benchmarks.bench_lookups --offline --iterations 100000
+    python -m benchmarks.bench_lookups --iterations 5000 [--pgbouncer]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import Executable, bindparam, delete, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db.session import build_connect_args
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from benchmarks._common import print_table
+
+HASHED_PASSWORD = "$2b$12$" + "x" * 53
+
+_INLINE: dict[str, Callable[[Any], Executable]] = {
+    "get": lambda value: select(User).where(User.id == value),
+    "get_by_email": lambda value: select(User).where(User.email == value),
+    "get_by_username": lambda value: select(User).where(User.username == value),
+}
+_PREBUILT: dict[str, Executable] = {
+    "get": select(User).where(User.id == bindparam("id")),
+    "get_by_email": select(User).where(User.email == bindparam("email")),
+    "get_by_username": select(User).where(User.username == bindparam("username")),
+}
+
+
+def _offline(iterations: int) -> list[list[str]]:
+    dialect = postgresql.asyncpg.dialect()
+    cache: dict[Any, Any] = {}
+
+    def compiled(stmt: Executable) -> Any:
+        # 与 Connection 执行路径相同：以缓存键查找已编译的语句
+        key = stmt._generate_cache_key().key
+        if key not in cache:
+            cache[key] = stmt.compile(dialect=dialect)
+        return cache[key]
+
+    rows = []
+    for name, build in _INLINE.items():
+        for variant, run in (
+            ("inline", lambda: compiled(build(1 if name == "get" else "someone"))),
+            ("registry", lambda: compiled(_PREBUILT[name])),
+        ):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                run()
+            elapsed = time.perf_counter() - start
+            rows.append([name, variant, f"{iterations / elapsed:,.0f}"])
+    return rows
+
+
+async def _online(database_url: str, iterations: int, pgbouncer: bool) -> list[list[str]]:
+    engine = create_async_engine(database_url, connect_args=build_connect_args(pgbouncer))
+    tag = f"lk_{uuid.uuid4().hex[:8]}"
+    rows = []
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            repo = UserRepository(session)
+            user = await repo.create(
+                email=f"{tag}@example.com", username=tag, hashed_password=HASHED_PASSWORD
+            )
+            await session.commit()
+            args = {"get": user.id, "get_by_email": user.email, "get_by_username": tag}
+
+            async def inline(name: str) -> None:
+                await session.execute(_INLINE[name](args[name]))
+
+            async def registry(name: str) -> None:
+                await getattr(repo, name)(args[name])
+
+            variants: dict[str, Callable[[str], Awaitable[None]]] = {
+                "inline": inline,
+                "registry": registry,
+            }
+            for name in _INLINE:
+                for variant, run in variants.items():
+                    session.expunge_all()
+                    start = time.perf_counter()
+                    for _ in range(iterations):
+                        await run(name)
+                    elapsed = time.perf_counter() - start
+                    rows.append([name, variant, f"{iterations / elapsed:,.0f}"])
+
+            await session.execute(delete(User).where(User.id == user.id))
+            await session.commit()
+    finally:
+        await engine.dispose()
+    return rows
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("--pgbouncer", action="store_true")
+    args = parser.parse_args()
+    if args.offline:
+        rows = _offline(args.iterations)
+    else:
+        rows = asyncio.run(_online(args.database_url, args.iterations, args.pgbouncer))
+    print_table(["lookup", "variant", "statements/sec"], rows)
+
+
+if __name__ == "__main__":
+    main()
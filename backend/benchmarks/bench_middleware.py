@@ -0,0 +1,160 @@
+"""中间件开销基准.
+
+对比三种中间件栈在 ``GET /api/v1/health`` 上的吞吐量与单请求附加延迟：
+
+- ``none``：不挂载任何自定义中间件（基线）
+- ``base_http``：改造前基于 BaseHTTPMiddleware 的实现（在本脚本中内联保留）
+- ``asgi``：当前的纯 ASGI 实现
+
+直接以 ASGI 协议调用应用，不经过网络与服务器，因此结果只反映中间件本身的开销。
+日志级别被提升到 WARNING，避免 I/O 干扰。
+
+用法::
+
+    python -m benchmarks.bench_middleware --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any
+
+import structlog
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message
+
+from app.api.v1.endpoints import health
+from app.middleware.correlation_id import CorrelationIdMiddleware
+from app.middleware.logging_middleware import LoggingMiddleware
+from benchmarks._common import print_table
+
+logger = structlog.get_logger("benchmarks.middleware")
+
+
+class LegacyCorrelationIdMiddleware(BaseHTTPMiddleware):
+    """改造前的关联 ID 中间件."""
+
+    async def dispatch(self, request: Request, call_next: Any) -> Response:
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        request.state.request_id = request_id
+        response: Response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """改造前的请求日志中间件."""
+
+    async def dispatch(self, request: Request, call_next: Any) -> Response:
+        start_time = time.time()
+        logger.info("Request started", method=request.method, path=request.url.path)
+        response: Response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.info("Request completed", status_code=response.status_code)
+        response.headers["X-Process-Time"] = f"{process_time:.3f}"
+        return response
+
+
+def build_app(stack: str) -> ASGIApp:
+    """构建只包含健康检查路由的应用.
+
+    Args:
+        stack: 中间件栈名称
+
+    Returns:
+        ASGI 应用
+    """
+    app = FastAPI()
+    app.include_router(health.router, prefix="/api/v1/health")
+    if stack == "base_http":
+        app.add_middleware(LegacyLoggingMiddleware)
+        app.add_middleware(LegacyCorrelationIdMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(CorrelationIdMiddleware)
+    return app
+
+
+async def _call(app: ASGIApp) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/health",
+        "raw_path": b"/api/v1/health",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("bench", 80),
+    }
+    sent_request = False
+
+    async def receive() -> Message:
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _measure(app: ASGIApp, requests: int, concurrency: int) -> float:
+    per_worker = requests // concurrency
+
+    async def worker() -> None:
+        for _ in range(per_worker):
+            await _call(app)
+
+    # 预热
+    for _ in range(200):
+        await _call(app)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    total = (args.requests // args.concurrency) * args.concurrency
+
+    results: dict[str, float] = {}
+    for stack in ("none", "base_http", "asgi"):
+        results[stack] = asyncio.run(_measure(build_app(stack), args.requests, args.concurrency))
+
+    baseline = results["none"] / total
+    rows = []
+    for stack, elapsed in results.items():
+        per_request = elapsed / total
+        rows.append(
+            [
+                stack,
+                f"{total / elapsed:,.0f}",
+                f"{per_request * 1e6:.1f}",
+                f"{(per_request - baseline) * 1e6:+.1f}",
+            ]
+        )
+    print_table(["stack", "req/s", "us/req", "added us/req"], rows)
+
+
+if __name__ == "__main__":
+    main()
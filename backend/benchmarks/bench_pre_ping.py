@@ -0,0 +1,77 @@
+"""连接池 pre-ping 对请求延迟的影响.
+
+模拟读请求：打开会话 → 按主键查询一次 → 关闭会话，顺序执行 N 次，分别使用
+
+- ``pre-ping``：``pool_pre_ping=True``，每次取出连接先 ping 一次
+- ``monitor``：关闭 pre-ping，依赖本地断连检查与后台空闲连接探测
+
+并输出两种模式的连接池指标。
+
+用法（默认使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_pre_ping --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db.pool import MonitoredQueuePool, PoolMonitor, instrument_engine
+from app.repositories.user_repository import UserRepository
+from benchmarks._common import print_table, summarize
+
+
+async def _measure(database_url: str, pre_ping: bool, requests: int) -> tuple[list[float], dict]:
+    engine = create_async_engine(
+        database_url, poolclass=MonitoredQueuePool, pool_size=5, pool_pre_ping=pre_ping
+    )
+    metrics = instrument_engine(engine)
+    monitor = None if pre_ping else PoolMonitor([engine], interval=1.0)
+    latencies = []
+    try:
+        if monitor:
+            monitor.start()
+        for _ in range(requests + 50):
+            start = time.perf_counter()
+            async with AsyncSession(engine) as session:
+                await UserRepository(session).get(1)
+            latencies.append(time.perf_counter() - start)
+        return latencies[50:], metrics.snapshot(engine.sync_engine.pool)
+    finally:
+        if monitor:
+            await monitor.stop()
+        await engine.dispose()
+
+
+async def _run(database_url: str, requests: int) -> None:
+    rows = []
+    for label, pre_ping in (("pre-ping", True), ("monitor", False)):
+        latencies, stats = await _measure(database_url, pre_ping, requests)
+        print(summarize(label, latencies))
+        ordered = sorted(latencies)
+        rows.append(
+            [
+                label,
+                f"{ordered[len(ordered) // 2] * 1000:.3f}",
+                f"{ordered[int(len(ordered) * 0.99)] * 1000:.3f}",
+                str(stats["connects"]),
+                str(stats["probes"]),
+            ]
+        )
+    print()
+    print_table(["mode", "p50 ms", "p99 ms", "connects", "probes"], rows)
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.database_url, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""限流中间件的单请求附加延迟.
+
+对比三种配置在 ``GET /api/v1/health`` 上的吞吐量与单请求附加延迟：
+
+- ``none``：不挂载限流中间件（基线）
+- ``redis``：Redis 令牌桶，每个请求一次 EVALSHA 往返
+- ``local``：Redis 不可用时的进程内令牌桶（强制处于降级状态）
+
+直接以 ASGI 协议调用应用，不经过网络与服务器；请求轮流使用 ``--clients`` 个客户端地址，
+配额足够大，不会触发 429。``redis`` 场景使用 REDIS_URL（或 ``--redis-url``），
+结果包含到该 Redis 的网络往返，测试结束时删除本次写入的令牌桶。
+
+用法（redis 场景需要可访问的 Redis）::
+
+    python -m benchmarks.bench_rate_limit --requests 20000 --concurrency 16
+"""
+import argparse
+import asyncio
+import logging
+import math
+import time
+import uuid
+
+import structlog
+from fastapi import FastAPI
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Message
+
+from app.api.v1.endpoints import health
+from app.core.config import settings
+from app.core.rate_limit import RateLimit, RateLimiter
+from app.middleware.rate_limit import RateLimitMiddleware
+from benchmarks._common import percentile, print_table
+
+# 足够大的配额，基准过程中不会被拒绝
+BENCH_LIMIT = RateLimit(10**9, 60)
+
+
+def build_app(limiter: RateLimiter | None) -> ASGIApp:
+    """构建只包含健康检查路由的应用.
+
+    Args:
+        limiter: 限流器，None 表示不挂载限流中间件
+
+    Returns:
+        ASGI 应用
+    """
+    app = FastAPI()
+    app.include_router(health.router, prefix="/api/v1/health")
+    if limiter is not None:
+        app.add_middleware(
+            RateLimitMiddleware,
+            limiter=limiter,
+            routes=app.routes,
+            route_limits={},
+            default_limit=BENCH_LIMIT,
+        )
+    return app
+
+
+async def _call(app: ASGIApp, client: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/health",
+        "raw_path": b"/api/v1/health",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": (client, 12345),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _measure(
+    app: ASGIApp, requests: int, concurrency: int, clients: list[str]
+) -> tuple[float, list[float]]:
+    per_worker = requests // concurrency
+    latencies: list[float] = []
+
+    async def worker(offset: int) -> None:
+        for i in range(per_worker):
+            start = time.perf_counter()
+            status = await _call(app, clients[(offset + i) % len(clients)])
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"Unexpected status {status}")
+
+    # 预热（加载脚本、建立连接）
+    for client in clients:
+        await _call(app, client)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n * per_worker) for n in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+async def _run(args: argparse.Namespace) -> None:
+    clients = [f"10.0.{i // 256}.{i % 256}" for i in range(args.clients)]
+    prefix = f"bench_ratelimit_{uuid.uuid4().hex[:8]}"
+    redis = Redis.from_url(args.redis_url, socket_timeout=settings.REDIS_SOCKET_TIMEOUT)
+    local = RateLimiter(lambda: redis, prefix=prefix)
+    local._bypass_until = math.inf
+
+    scenarios: dict[str, RateLimiter | None] = {"none": None, "local": local}
+    try:
+        await redis.ping()
+        scenarios["redis"] = RateLimiter(lambda: redis, prefix=prefix, bypass_seconds=0)
+    except RedisError as e:
+        print(f"Skipping redis scenario: {e}")
+
+    rows = []
+    baseline = None
+    try:
+        for name, limiter in scenarios.items():
+            elapsed, latencies = await _measure(
+                build_app(limiter), args.requests, args.concurrency, clients
+            )
+            per_request = elapsed / len(latencies)
+            if baseline is None:
+                baseline = per_request
+            rows.append(
+                [
+                    name,
+                    f"{len(latencies) / elapsed:,.0f}",
+                    f"{per_request * 1e6:.1f}",
+                    f"{(per_request - baseline) * 1e6:+.1f}",
+                    f"{percentile(latencies, 0.50) * 1e6:.1f}",
+                    f"{percentile(latencies, 0.99) * 1e6:.1f}",
+                ]
+            )
+        print_table(["scenario", "req/s", "us/req", "added us/req", "p50 us", "p99 us"], rows)
+    finally:
+        if "redis" in scenarios:
+            keys = [key async for key in redis.scan_iter(f"{prefix}:*")]
+            if keys:
+                await redis.delete(*keys)
+        await redis.aclose()
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--redis-url", default=settings.REDIS_URL)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
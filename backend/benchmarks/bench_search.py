@@ -0,0 +1,164 @@
+"""用户搜索延迟基准（默认 500 万行合成数据）.
+
+向 users 表写入合成用户（姓名组合 + 序号，邮箱分布在几个域名下），ANALYZE 后
+对前缀、拼写错误、姓名、无结果等查询词执行 ``UserRepository.search``，
+统计延迟分位数。需要已执行迁移 8b1e4d6c2a90（pg_trgm 与三元组 GIN 索引）。
+
+合成数据按批提交，结束时按 ID 范围删除；``--keep`` 保留数据，
+之后可用 ``--skip-seed`` 直接复用。
+
+用法（需要已迁移的可写 PostgreSQL，默认使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_search --rows 5000000 --repeat 50 [--explain]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from sqlalchemy import delete, event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.user import User
+from app.repositories.user_repository import SEARCH_FIELDS, UserRepository
+from app.services.user_service import PUBLIC_COLUMNS
+from benchmarks._common import print_table, summarize
+
+_FIRST_NAMES = (
+    "Alexander Olivia Liam Emma Noah Ava Oliver Sophia Elijah Isabella James Mia William "
+    "Charlotte Benjamin Amelia Lucas Harper Henry Evelyn Michael Abigail Daniel Emily Mateo "
+    "Elizabeth Jackson Sofia Sebastian Avery Jack Ella Aiden Scarlett Owen Grace Samuel Chloe"
+).split()
+_LAST_NAMES = (
+    "Smith Johnson Williams Brown Jones Garcia Miller Davis Rodriguez Martinez Hernandez Lopez "
+    "Gonzalez Wilson Anderson Thomas Taylor Moore Jackson Martin Lee Perez Thompson White "
+    "Harris Sanchez Clark Ramirez Lewis Robinson Walker Young Allen King Wright Scott Torres"
+).split()
+
+_SEED_SQL = """
+INSERT INTO users (email, username, hashed_password, full_name, is_active, is_superuser)
+SELECT lower(f) || '.' || lower(l) || g || '@' || (ARRAY['example.com', 'mail.test',
+           'corp.local', 'inbox.dev'])[g % 4 + 1],
+       lower(f) || '.' || lower(l) || g, 'x', f || ' ' || l, true, false
+FROM (
+    SELECT g, (CAST(:first AS text[]))[g % cardinality(CAST(:first AS text[])) + 1] AS f,
+           (CAST(:last AS text[]))[
+               (g / cardinality(CAST(:first AS text[]))) % cardinality(CAST(:last AS text[])) + 1
+           ] AS l
+    FROM generate_series(CAST(:start AS bigint), CAST(:stop AS bigint)) AS g
+) AS s
+"""
+
+# (场景, 查询词)
+QUERIES = (
+    ("prefix", "alexander.sm"),
+    ("prefix-short", "ol"),
+    ("typo", "alexnader"),
+    ("email", "olivia.brown12"),
+    ("full-name", "harris"),
+    ("exact", "mia.lee1000"),
+    ("no-hit", "qqxzvw"),
+)
+
+
+async def _seed(session: AsyncSession, rows: int, chunk: int) -> None:
+    params = {"first": _FIRST_NAMES, "last": _LAST_NAMES}
+    start_time = time.perf_counter()
+    for start in range(1, rows + 1, chunk):
+        stop = min(start + chunk - 1, rows)
+        await session.execute(text(_SEED_SQL), {**params, "start": start, "stop": stop})
+        await session.commit()
+        print(f"seeded {stop:,}/{rows:,} rows ({time.perf_counter() - start_time:.0f}s)")
+    await session.execute(text("ANALYZE users"))
+    await session.commit()
+
+
+async def _explain(session: AsyncSession, query: str, limit: int) -> None:
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any) -> None:
+        captured.append((statement, parameters))
+
+    sync_engine = session.bind.sync_engine  # type: ignore[union-attr]
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        await UserRepository(session).search(query, PUBLIC_COLUMNS, limit)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+    statement, parameters = captured[-1]
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+    print(f"\nEXPLAIN {query!r}:")
+    for (line,) in result:
+        print(f"  {line}")
+
+
+async def _measure(session: AsyncSession, args: argparse.Namespace) -> None:
+    total = await session.scalar(select(func.count()).select_from(User))
+    print(f"users: {total:,} rows\n")
+
+    repo = UserRepository(session)
+    stats = []
+    for name, query in QUERIES:
+        hits = len(await repo.search(query, PUBLIC_COLUMNS, args.limit))  # 预热
+        latencies = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            await repo.search(query, PUBLIC_COLUMNS, args.limit)
+            latencies.append(time.perf_counter() - start)
+        print(summarize(f"{name} ({query})", latencies))
+        stats.append([name, query, hits])
+
+    print()
+    print_table(["scenario", "query", f"hits (limit {args.limit})"], stats)
+    if args.explain:
+        for _, query in QUERIES[:3]:
+            await _explain(session, query, args.limit)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_url)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            indexes = set(
+                await session.scalars(
+                    text("SELECT indexname FROM pg_indexes WHERE tablename = 'users'")
+                )
+            )
+            missing = [f"ix_users_{field}_trgm" for field in SEARCH_FIELDS]
+            missing = [name for name in missing if name not in indexes]
+            if missing:
+                print(f"WARNING: missing search indexes {missing}, run `alembic upgrade head`")
+
+            baseline = await session.scalar(select(func.coalesce(func.max(User.id), 0)))
+            try:
+                if not args.skip_seed:
+                    await _seed(session, args.rows, args.chunk)
+                await _measure(session, args)
+            finally:
+                await session.rollback()
+                if not args.keep and not args.skip_seed:
+                    await session.execute(delete(User).where(User.id > baseline))
+                    await session.commit()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--chunk", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--explain", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="保留合成数据")
+    parser.add_argument("--skip-seed", action="store_true", help="复用已有数据")
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
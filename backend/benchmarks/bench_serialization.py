@@ -0,0 +1,132 @@
+"""列表响应序列化吞吐基准：FastAPI 默认路径 vs TypeAdapter 快速路径.
+
+对 ``GET /api/v1/users`` 的分页响应，分别以 ORM 对象与行字典两种输入测量：
+
+- ``default``：按路由 response_model 校验并转为 JSON 兼容对象（``serialize_response``），
+  再由 ``JSONResponse`` 编码
+- ``fast``：``fast_json_response`` 经预构建的 TypeAdapter 校验一次后直接输出 JSON 字节
+
+不访问数据库，数据在内存中合成。
+
+用法::
+
+    python -m benchmarks.bench_serialization --rows 100 1000 --repeat 200
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.core.config import settings
+from app.core.responses import fast_json_response
+from app.main import app
+from app.models.user import User as UserModel
+from app.schemas.user import UserPageAdapter
+from app.services.user_service import PUBLIC_COLUMNS
+from benchmarks._common import print_table
+
+
+def _response_field() -> Any:
+    for route in app.routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.path == f"{settings.API_V1_PREFIX}/users"
+            and "GET" in route.methods
+        ):
+            return route.response_field
+    raise RuntimeError("GET /users route not found")
+
+
+def _rows(n: int) -> list[dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "email": f"bench_ser_{i}@example.com",
+            "username": f"bench_ser_{i}",
+            "full_name": f"Bench User {i}",
+            "is_active": True,
+            "is_superuser": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def _page(items: list[Any]) -> dict[str, Any]:
+    return {
+        "items": items,
+        "next_cursor": "eyJpZCI6MX0",
+        "limit": len(items),
+        "total": len(items),
+        "total_strategy": "exact",
+    }
+
+
+def _measure(render: Callable[[], bytes], repeat: int) -> tuple[float, int]:
+    size = len(render())  # 预热
+    start = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return (time.perf_counter() - start) / repeat, size
+
+
+def _run(row_counts: list[int], repeat: int) -> None:
+    field = _response_field()
+    loop = asyncio.new_event_loop()
+
+    def default(content: dict[str, Any]) -> bytes:
+        data = loop.run_until_complete(serialize_response(field=field, response_content=content))
+        return JSONResponse(data).body
+
+    def fast(content: dict[str, Any]) -> bytes:
+        settings.API_FAST_SERIALIZATION = True
+        try:
+            return fast_json_response(UserPageAdapter, content).body
+        finally:
+            settings.API_FAST_SERIALIZATION = False
+
+    results = []
+    for n in row_counts:
+        rows = _rows(n)
+        inputs = {
+            "orm": _page([UserModel(hashed_password="x", **row) for row in rows]),
+            "dict": _page([{column: row[column] for column in PUBLIC_COLUMNS} for row in rows]),
+        }
+        for input_name, content in inputs.items():
+            timings: dict[str, float] = {}
+            for path_name, render in (("default", default), ("fast", fast)):
+                seconds, size = _measure(lambda: render(content), repeat)
+                timings[path_name] = seconds
+                results.append(
+                    [
+                        n,
+                        input_name,
+                        path_name,
+                        f"{seconds * 1000:.3f}",
+                        f"{n / seconds:,.0f}",
+                        size,
+                    ]
+                )
+            speedup = timings["default"] / timings["fast"]
+            results.append([n, input_name, "speedup", f"{speedup:.2f}x", "", ""])
+    loop.close()
+    print_table(["rows", "input", "path", "ms/response", "rows/s", "bytes"], results)
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    _run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
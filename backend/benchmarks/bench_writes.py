@@ -0,0 +1,148 @@
+"""用户写路径往返次数与延迟基准.
+
+对比改造前后的单条写操作：
+
+- ``before``：create 先用两次整行查询检查邮箱/用户名，再 add + flush + refresh；
+  update 先 get 再 UPDATE 再 get；delete 先 get 再 DELETE
+- ``after``：BaseRepository 的 INSERT/UPDATE/DELETE ... RETURNING，每个操作一条语句
+
+往返次数为每个操作发出的 SQL 语句数（通过 ``before_cursor_execute`` 事件统计，
+不含每个事务的 BEGIN/COMMIT）。每个操作在独立事务中执行并提交，测试数据最后删除。
+绕过密码哈希与缓存，只测量数据库部分。
+
+用法（需要已迁移的可写 PostgreSQL，默认使用 DATABASE_URL）::
+
+    python -m benchmarks.bench_writes --ops 500
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from benchmarks._common import print_table, summarize
+
+HASHED_PASSWORD = "$2b$12$" + "x" * 53
+
+
+async def _before_create(session: AsyncSession, values: dict[str, Any]) -> User:
+    repo = UserRepository(session)
+    await repo.get_by_email(values["email"])
+    await repo.get_by_username(values["username"])
+    user = User(**values)
+    session.add(user)
+    await session.flush()
+    await session.refresh(user)
+    return user
+
+
+async def _before_update(session: AsyncSession, user_id: int, values: dict[str, Any]) -> None:
+    await session.get(User, user_id)
+    await session.execute(update(User).where(User.id == user_id).values(**values))
+    result = await session.execute(select(User).where(User.id == user_id))
+    result.scalar_one()
+
+
+async def _before_delete(session: AsyncSession, user_id: int) -> None:
+    await session.get(User, user_id)
+    await session.execute(delete(User).where(User.id == user_id))
+
+
+async def _after_create(session: AsyncSession, values: dict[str, Any]) -> User:
+    return await UserRepository(session).create(**values)
+
+
+async def _after_update(session: AsyncSession, user_id: int, values: dict[str, Any]) -> None:
+    await UserRepository(session).update(user_id, **values)
+
+
+async def _after_delete(session: AsyncSession, user_id: int) -> None:
+    await UserRepository(session).delete(user_id)
+
+
+async def _measure(
+    engine: Any, op: Callable[[AsyncSession], Awaitable[Any]], counter: list[int]
+) -> tuple[Any, float, int]:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        counter[0] = 0
+        start = time.perf_counter()
+        result = await op(session)
+        statements = counter[0]
+        await session.commit()
+        return result, time.perf_counter() - start, statements
+
+
+async def _run(database_url: str, ops: int) -> None:
+    engine = create_async_engine(database_url)
+    counter = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(*_: Any) -> None:
+        counter[0] += 1
+
+    run = uuid.uuid4().hex[:8]
+    rows = []
+    try:
+        for variant, create, update_op, delete_op in (
+            ("before", _before_create, _before_update, _before_delete),
+            ("after", _after_create, _after_update, _after_delete),
+        ):
+            latencies: dict[str, list[float]] = {"create": [], "update": [], "delete": []}
+            statements: dict[str, int] = {}
+            ids = []
+            for i in range(ops):
+                values = {
+                    "email": f"w_{run}_{variant}_{i}@example.com",
+                    "username": f"w_{run}_{variant}_{i}",
+                    "hashed_password": HASHED_PASSWORD,
+                }
+                user, elapsed, count = await _measure(
+                    engine, lambda s: create(s, values), counter
+                )
+                latencies["create"].append(elapsed)
+                statements["create"] = count
+                ids.append(user.id)
+            for user_id in ids:
+                _, elapsed, count = await _measure(
+                    engine, lambda s: update_op(s, user_id, {"full_name": "Bench"}), counter
+                )
+                latencies["update"].append(elapsed)
+                statements["update"] = count
+            for user_id in ids:
+                _, elapsed, count = await _measure(
+                    engine, lambda s: delete_op(s, user_id), counter
+                )
+                latencies["delete"].append(elapsed)
+                statements["delete"] = count
+
+            for name, samples in latencies.items():
+                print(summarize(f"{variant} {name}", samples))
+                mean_ms = sum(samples) / len(samples) * 1000
+                rows.append([variant, name, str(statements[name]), f"{mean_ms:.3f}"])
+    finally:
+        async with AsyncSession(engine) as session:
+            await session.execute(delete(User).where(User.username.like(f"w_{run}_%")))
+            await session.commit()
+        await engine.dispose()
+
+    print()
+    print_table(["variant", "operation", "statements", "mean ms"], rows)
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=str(settings.DATABASE_URL))
+    parser.add_argument("--ops", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(_run(args.database_url, args.ops))
+
+
+if __name__ == "__main__":
+    main()
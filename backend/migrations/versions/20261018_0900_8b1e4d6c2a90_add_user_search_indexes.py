@@ -0,0 +1,41 @@
+"""add user search indexes
+
+Revision ID: 8b1e4d6c2a90
+Revises: 3f9c2a7d1b4e
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4d6c2a90'
+down_revision: Union[str, None] = '3f9c2a7d1b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 用户搜索（UserRepository.search）使用的三元组 GIN 索引，支持 LIKE 'q%' 前缀匹配与 %> 模糊匹配
+SEARCH_INDEXES = {
+    'ix_users_username_trgm': 'lower(username)',
+    'ix_users_email_trgm': 'lower(email)',
+    'ix_users_full_name_trgm': 'lower(full_name)',
+}
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY 不能在事务内执行；大表建索引期间不阻塞写入
+    with op.get_context().autocommit_block():
+        for name, expression in SEARCH_INDEXES.items():
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON users USING gin ({expression} gin_trgm_ops)'
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in SEARCH_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
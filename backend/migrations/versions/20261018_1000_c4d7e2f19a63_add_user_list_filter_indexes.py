@@ -0,0 +1,58 @@
+"""add user list filter indexes
+
+Revision ID: c4d7e2f19a63
+Revises: 8b1e4d6c2a90
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e2f19a63'
+down_revision: Union[str, None] = '8b1e4d6c2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY 不能在事务内执行；大表建索引期间不阻塞写入
+    with op.get_context().autocommit_block():
+        # is_active 过滤 + created_at 排序 / 区间（两种取值都常用，放在复合索引首列）
+        op.create_index(
+            'ix_users_is_active_created_at_id',
+            'users',
+            ['is_active', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # 超级用户占比很小，部分索引只包含这些行
+        op.create_index(
+            'ix_users_superuser_created_at_id',
+            'users',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('is_superuser'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_superuser_created_at_id',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_users_is_active_created_at_id',
+            table_name='users',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,59 @@
+"""测试公共配置.
+
+在导入应用之前固定测试环境：数据库指向 ``TEST_DATABASE_URL``（未设置时使用不可达的占位地址，
+依赖数据库的测试会被跳过），日志同步写入临时目录。Redis 相关测试使用 fakeredis。
+
+测试数据库在首次使用时迁移到最新版本；每个测试的写入都在会话结束时回滚。
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator
+
+import fakeredis
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+# 无论外部环境如何都覆盖 DATABASE_URL，避免测试写入开发或生产数据库
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql+asyncpg://test@127.0.0.1:1/test"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["LOG_QUEUE_ENABLED"] = "false"
+os.environ["LOG_FILE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="app-test-logs-"), "app.log")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+@pytest.fixture
+def redis() -> fakeredis.FakeAsyncRedis:
+    """进程内 Redis 替身（每个测试独立的数据）."""
+    return fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+
+
+@pytest.fixture(scope="session")
+def database_url() -> str:
+    """已迁移到最新版本的测试数据库地址（未设置 TEST_DATABASE_URL 时跳过）."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    # 不读取 alembic.ini：其日志配置会关闭应用已创建的 logger
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    command.upgrade(config, "head")
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def db_session(database_url: str) -> AsyncIterator[AsyncSession]:
+    """测试数据库会话，测试结束时回滚全部写入."""
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+            await session.rollback()
+    finally:
+        await engine.dispose()
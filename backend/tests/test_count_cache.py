@@ -0,0 +1,24 @@
+"""计数缓存失效时机测试."""
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from app.models.user import User
+from app.repositories import base
+from app.repositories.base import BaseRepository
+
+
+async def test_count_cache_invalidated_only_after_commit() -> None:
+    session: Any = SimpleNamespace(info={})
+    repository = BaseRepository(User, session)
+    key = User.__table__.fullname
+    base._count_cache[key] = (10, time.monotonic() + 60)
+
+    repository.invalidate_count()
+    # 提交前并发请求仍读到旧值，不会以未提交前的计数重新填充缓存
+    assert base._count_cache[key][0] == 10
+
+    # 与 get_db 一致：提交成功后依次执行回调
+    for callback in session.info.pop("after_commit", []):
+        await callback()
+    assert key not in base._count_cache
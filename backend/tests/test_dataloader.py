@@ -0,0 +1,28 @@
+"""请求级批量加载器测试."""
+import asyncio
+
+from app.core.dataloader import DataLoader
+
+
+async def test_batch_tasks_are_held_until_done() -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls: list[list[int]] = []
+
+    async def batch_load(keys: list[int]) -> dict[int, int]:
+        calls.append(keys)
+        started.set()
+        await release.wait()
+        return {key: key * 10 for key in keys}
+
+    loader: DataLoader[int, int] = DataLoader(batch_load, max_batch_size=2)
+    pending = asyncio.ensure_future(loader.load_many([1, 2, 3]))
+    await started.wait()
+
+    # 批量加载进行中，加载器持有全部任务的引用
+    assert len(loader._tasks) == 2
+    release.set()
+
+    assert await asyncio.wait_for(pending, timeout=1) == {1: 10, 2: 20, 3: 30}
+    assert calls == [[1, 2], [3]]
+    assert not loader._tasks
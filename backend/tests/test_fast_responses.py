@@ -0,0 +1,56 @@
+"""快速序列化路径的响应头测试."""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from app.api.v1.endpoints import users
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.user import User
+from app.services.user_service import UserService
+
+
+async def fake_db(response: Response) -> AsyncIterator[Any]:
+    # 依赖设置的响应头须出现在快速路径返回的响应中
+    response.set_cookie("dep_cookie", "1")
+    yield SimpleNamespace(info={})
+
+
+async def fake_create_user(self: UserService, user_data: Any) -> User:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return User(
+        id=1,
+        email=user_data.email,
+        username=user_data.username,
+        full_name=None,
+        is_active=True,
+        is_superuser=False,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.mark.parametrize("fast", [False, True])
+async def test_create_user_keeps_dependency_cookie(
+    monkeypatch: pytest.MonkeyPatch, fast: bool
+) -> None:
+    monkeypatch.setattr(settings, "API_FAST_SERIALIZATION", fast)
+    monkeypatch.setattr(UserService, "create_user", fake_create_user)
+    app = FastAPI()
+    app.include_router(users.router, prefix="/users")
+    app.dependency_overrides[get_db] = fake_db
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/users",
+            json={"email": "a@example.com", "username": "alice", "password": "Passw0rd!"},
+        )
+
+    assert response.status_code == 201
+    assert response.json()["username"] == "alice"
+    assert response.cookies.get("dep_cookie") == "1"
@@ -0,0 +1,37 @@
+"""密码哈希执行器测试."""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import pytest
+
+from app.core import hashing
+from app.core.exceptions import ServiceUnavailableException
+from app.core.hashing import HashingExecutor
+
+
+async def test_broken_pool_is_replaced_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    pools: list[ProcessPoolExecutor] = []
+
+    def track(*args: Any, **kwargs: Any) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(*args, **kwargs)
+        pools.append(pool)
+        return pool
+
+    monkeypatch.setattr(hashing, "ProcessPoolExecutor", track)
+    executor = HashingExecutor(max_workers=2, max_queue=8, queue_timeout=30)
+    try:
+        # 子进程直接退出：同一进程池上的所有在途任务都会收到 BrokenProcessPool
+        results = await asyncio.gather(
+            *(executor.run(os._exit, 1) for _ in range(4)), return_exceptions=True
+        )
+        assert all(isinstance(result, ServiceUnavailableException) for result in results)
+        assert executor.metrics.failed == 4
+
+        assert len(pools) == 2
+        assert executor._executor is pools[1]
+        assert pools[0]._shutdown_thread
+        assert await executor.run(abs, -1) == 1
+    finally:
+        await executor.shutdown()
@@ -0,0 +1,86 @@
+"""用户列表过滤/排序的执行计划测试（需要测试数据库）.
+
+写入合成用户（约 5% 未激活、0.1% 超级用户，创建时间分布在两年内）并 ANALYZE 后，
+对每个 过滤条件 × 排序 × 方向 组合（首页与带游标的下一页）执行
+``UserRepository.get_page_rows`` 生成的 SQL 的 EXPLAIN，计划中不应出现对 users 的顺序扫描。
+"""
+import itertools
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.user_repository import UserRepository
+from app.services.user_service import PUBLIC_COLUMNS
+
+SEED_ROWS = 200_000
+
+_SEED_SQL = """
+INSERT INTO users (email, username, hashed_password, is_active, is_superuser, created_at)
+SELECT 'plan_' || g || '@example.com', 'plan_' || g, 'x', g % 20 <> 0, g % 1000 = 0,
+       now() - make_interval(secs => (g * 7919) % (730 * 86400))
+FROM generate_series(1, :n) AS g
+"""
+
+_NOW = datetime.now(timezone.utc)
+
+FILTERS: dict[str, dict[str, Any]] = {
+    "none": {},
+    "active": {"is_active": True},
+    "inactive": {"is_active": False},
+    "superuser": {"is_superuser": True},
+    "non-superuser": {"is_superuser": False},
+    "created-range": {"created_after": _NOW - timedelta(days=30), "created_before": _NOW},
+    "inactive+range": {"is_active": False, "created_after": _NOW - timedelta(days=30)},
+    "superuser+range": {"is_superuser": True, "created_before": _NOW - timedelta(days=365)},
+}
+
+
+@pytest.fixture
+async def seeded_session(db_session: AsyncSession) -> AsyncSession:
+    # 在同一事务内 ANALYZE：统计信息包含未提交的合成数据，并随测试结束一起回滚
+    await db_session.execute(text(_SEED_SQL), {"n": SEED_ROWS})
+    await db_session.execute(text("ANALYZE users"))
+    return db_session
+
+
+async def test_list_queries_avoid_sequential_scans(seeded_session: AsyncSession) -> None:
+    captured: list[tuple[str, Any]] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, parameters: Any, *rest: Any) -> None:
+        captured.append((statement, parameters))
+
+    repository = UserRepository(seeded_session)
+    conn = await seeded_session.connection()
+    sync_engine = conn.engine.sync_engine
+    failures: list[str] = []
+    event.listen(sync_engine, "before_cursor_execute", capture)
+    try:
+        for (name, filters), sort, descending in itertools.product(
+            FILTERS.items(), UserRepository.sort_keys, (False, True)
+        ):
+            cursor = None
+            for page in ("first", "next"):
+                captured.clear()
+                _, cursor = await repository.get_page_rows(
+                    PUBLIC_COLUMNS,
+                    cursor=cursor,
+                    limit=20,
+                    filters=filters,
+                    sort=sort,
+                    descending=descending,
+                )
+                statement, parameters = captured[-1]
+                result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                plan = [line for (line,) in result]
+                if any("Seq Scan on users" in line for line in plan):
+                    order = "desc" if descending else "asc"
+                    failures.append(f"{name} / {sort} {order} / {page}:\n  " + "\n  ".join(plan))
+                if cursor is None:
+                    break
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture)
+
+    assert not failures, "\n\n".join(failures)
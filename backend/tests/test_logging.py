@@ -0,0 +1,73 @@
+"""日志轮转压缩测试."""
+import gzip
+import logging
+import logging.handlers
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.core.logging import LogCompressor
+
+
+@pytest.fixture
+def slow_compressor(monkeypatch: pytest.MonkeyPatch) -> LogCompressor:
+    """压缩在收到信号前一直阻塞的压缩器，模拟下一次轮转时上一段仍在压缩."""
+    release = threading.Event()
+    compress = LogCompressor._compress
+
+    def blocking_compress(segment: str, dest: str) -> None:
+        release.wait(timeout=5)
+        compress(segment, dest)
+
+    monkeypatch.setattr(LogCompressor, "_compress", staticmethod(blocking_compress))
+    compressor = LogCompressor()
+    # 下一次轮转等待时放行，使压缩必然晚于轮转开始
+    wait = compressor.wait
+
+    def release_and_wait() -> None:
+        release.set()
+        wait()
+
+    monkeypatch.setattr(compressor, "wait", release_and_wait)
+    return compressor
+
+
+def _rotate(handler: logging.handlers.RotatingFileHandler, segments: list[str]) -> None:
+    for text in segments:
+        handler.stream.write(text)
+        handler.stream.flush()
+        handler.doRollover()
+
+
+def _read_backups(log_file: Path) -> list[str]:
+    backups = sorted(log_file.parent.glob(f"{log_file.name}.*.gz"), key=lambda p: p.name)
+    return [gzip.decompress(path.read_bytes()).decode() for path in backups]
+
+
+def test_rollover_keeps_every_segment(tmp_path: Path, slow_compressor: LogCompressor) -> None:
+    log_file = tmp_path / "app.log"
+    handler = logging.handlers.RotatingFileHandler(log_file, backupCount=5)
+    slow_compressor.attach(handler)
+
+    _rotate(handler, ["first\n", "second\n", "third\n"])
+    slow_compressor.shutdown()
+    handler.close()
+
+    # .1.gz 为最新一段
+    assert _read_backups(log_file) == ["third\n", "second\n", "first\n"]
+
+
+def test_rollover_after_shutdown_compresses_inline(tmp_path: Path) -> None:
+    log_file = tmp_path / "app.log"
+    handler = logging.handlers.RotatingFileHandler(log_file, backupCount=5)
+    compressor = LogCompressor()
+    compressor.attach(handler)
+
+    _rotate(handler, ["before\n"])
+    compressor.shutdown()
+    _rotate(handler, ["after\n"])
+    handler.close()
+
+    assert _read_backups(log_file) == ["after\n", "before\n"]
+    assert not list(tmp_path.glob("app.log.[0-9]"))
@@ -0,0 +1,32 @@
+"""游标编解码测试."""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.exceptions import ValidationException
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    created = datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor([created, 42], "created_at")
+
+    assert decode_cursor(cursor, [datetime, int], "created_at") == [created, 42]
+
+
+def test_cursor_from_another_sort_is_rejected() -> None:
+    # 游标取值恰好也能按当前排序的类型还原时，只有排序名称能识别出不匹配
+    cursor = encode_cursor(["alice", 42], "username")
+
+    with pytest.raises(ValidationException) as exc_info:
+        decode_cursor(cursor, [str, int], "email")
+
+    assert exc_info.value.message == "Cursor does not match sort"
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "W10", encode_cursor([1], None)])
+def test_malformed_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(ValidationException) as exc_info:
+        decode_cursor(cursor, [datetime, int], None)
+
+    assert exc_info.value.message == "Invalid cursor"
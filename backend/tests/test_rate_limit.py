@@ -0,0 +1,55 @@
+"""限流中间件的客户端识别测试（fakeredis）."""
+import fakeredis
+import httpx
+from fastapi import FastAPI
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.core.rate_limit import RateLimit, RateLimiter
+from app.middleware.rate_limit import RateLimitMiddleware
+
+# 与 docker-compose.prod.yml 中 nginx 的固定地址及 --forwarded-allow-ips 一致
+PROXY_IP = "172.28.0.10"
+CLIENT_IP = "203.0.113.7"
+
+
+def make_app(redis: fakeredis.FakeAsyncRedis) -> ProxyHeadersMiddleware:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=RateLimiter(lambda: redis),
+        routes=app.routes,
+        route_limits={},
+        default_limit=RateLimit(1, 60),
+    )
+    # 与 uvicorn --proxy-headers 相同：在应用之外改写 scope["client"]
+    return ProxyHeadersMiddleware(app, trusted_hosts=PROXY_IP)
+
+
+async def get(app: ProxyHeadersMiddleware, peer: str, forwarded_for: str) -> int:
+    transport = httpx.ASGITransport(app=app, client=(peer, 12345))  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/ping", headers={"X-Forwarded-For": forwarded_for})
+    return response.status_code
+
+
+async def test_spoofed_forwarded_for_keeps_bucket(redis: fakeredis.FakeAsyncRedis) -> None:
+    app = make_app(redis)
+
+    assert await get(app, PROXY_IP, CLIENT_IP) == 200
+    # 客户端自带的 X-Forwarded-For 即使被代理追加保留，也不能换到新的令牌桶
+    assert await get(app, PROXY_IP, f"198.51.100.1, {CLIENT_IP}") == 429
+    assert await get(app, PROXY_IP, "198.51.100.2") == 200
+
+
+async def test_untrusted_peer_cannot_choose_bucket(redis: fakeredis.FakeAsyncRedis) -> None:
+    app = make_app(redis)
+    peer = "172.28.0.20"
+
+    assert await get(app, peer, "198.51.100.1") == 200
+    # 未经代理直连时忽略 X-Forwarded-For，按连接地址计数
+    assert await get(app, peer, "198.51.100.2") == 429
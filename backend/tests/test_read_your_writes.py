@@ -0,0 +1,78 @@
+"""读己之写 Cookie 测试：只有提交成功的写请求才下发."""
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.core.config import settings
+from app.core.exceptions import ConflictException
+from app.db import session as db_session_module
+from app.db.session import READ_YOUR_WRITES_COOKIE, get_db, mark_write
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+
+
+class FakeSession:
+    """记录提交与回滚的会话替身."""
+
+    def __init__(self, fail_commit: bool = False):
+        self.info: dict[str, Any] = {}
+        self.fail_commit = fail_commit
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def commit(self) -> None:
+        if self.fail_commit:
+            raise ConflictException(message="commit failed")
+
+    async def rollback(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/read")
+    async def read(db: Any = Depends(get_db)) -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.post("/write")
+    async def write(db: Any = Depends(get_db)) -> dict[str, bool]:
+        mark_write(db)
+        return {"ok": True}
+
+    return app
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "fail_commit", "expected"),
+    [
+        ("GET", "/read", False, False),
+        ("POST", "/write", False, True),
+        ("POST", "/write", True, False),
+    ],
+)
+async def test_cookie_only_after_committed_write(
+    monkeypatch: pytest.MonkeyPatch, method: str, path: str, fail_commit: bool, expected: bool
+) -> None:
+    monkeypatch.setattr(settings, "DB_READ_YOUR_WRITES_SECONDS", 5.0)
+    monkeypatch.setattr(
+        db_session_module, "AsyncSessionLocal", lambda: FakeSession(fail_commit=fail_commit)
+    )
+
+    transport = httpx.ASGITransport(app=make_app(), raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.request(method, path)
+
+    assert (READ_YOUR_WRITES_COOKIE in response.cookies) is expected
+    if expected:
+        assert response.status_code == 200
+        assert "max-age=5" in response.headers["set-cookie"].lower()
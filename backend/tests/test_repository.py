@@ -0,0 +1,23 @@
+"""仓储层写入测试（需要测试数据库）."""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ConflictException
+from app.repositories.user_repository import UserRepository
+
+
+def make_row(email: str, username: str) -> dict[str, str]:
+    return {"email": email, "username": username, "hashed_password": "x"}
+
+
+async def test_create_many_maps_unique_violation(db_session: AsyncSession) -> None:
+    repository = UserRepository(db_session)
+    await repository.create(**make_row("repo@example.com", "repo_user"))
+
+    with pytest.raises(ConflictException) as exc_info:
+        await repository.create_many(
+            [make_row("repo2@example.com", "repo_user2"), make_row("repo@example.com", "other")]
+        )
+
+    assert exc_info.value.message == "Email already registered"
+    assert exc_info.value.details == {"constraint": "ix_users_email"}
@@ -0,0 +1,187 @@
+"""用户读穿透缓存测试（fakeredis）."""
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any
+
+import fakeredis
+import pytest
+
+from app.core import redis as redis_module
+from app.core.cache import ReadThroughCache
+from app.core.config import settings
+from app.models.user import User
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import UserCache, get_user_cache
+from app.services.user_service import UserService
+
+
+def make_user(user_id: int = 1, username: str = "alice") -> User:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return User(
+        id=user_id,
+        email=f"{username}@example.com",
+        username=username,
+        hashed_password="$2b$12$" + "x" * 53,
+        full_name=None,
+        is_active=True,
+        is_superuser=False,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class CountingLoader:
+    """记录调用次数的加载函数，可选地在返回前等待."""
+
+    def __init__(self, user: User | None, delay: float = 0.0):
+        self.user = user
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> User | None:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.user
+
+
+def make_cache(redis: fakeredis.FakeAsyncRedis, **kwargs: float) -> ReadThroughCache:
+    return ReadThroughCache(lambda: redis, namespace="user", ttl=60, **kwargs)
+
+
+async def test_miss_then_hit(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = UserCache(make_cache(redis))
+    loader = CountingLoader(make_user())
+
+    first = await cache.get_by_id(1, loader)
+    second = await cache.get_by_id(1, loader)
+
+    assert loader.calls == 1
+    assert first is not None and second is not None
+    assert second.username == "alice"
+    assert cache.cache.stats.misses == 1
+    assert cache.cache.stats.hits == 1
+
+
+async def test_missing_user_is_not_cached(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = UserCache(make_cache(redis))
+    loader = CountingLoader(None)
+
+    assert await cache.get_by_id(1, loader) is None
+    assert await cache.get_by_id(1, loader) is None
+    assert loader.calls == 2
+
+
+async def test_password_hash_is_not_cached(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = UserCache(make_cache(redis))
+    await cache.get_by_id(1, CountingLoader(make_user()))
+
+    raw = await redis.get("user:id:1")
+    assert raw is not None and b"hashed_password" not in raw
+    cached = await cache.get_by_id(1, CountingLoader(None))
+    assert cached is not None and cached.hashed_password is None
+
+
+async def test_concurrent_misses_load_once(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = UserCache(make_cache(redis))
+    loader = CountingLoader(make_user(), delay=0.05)
+
+    users = await asyncio.gather(*(cache.get_by_id(1, loader) for _ in range(20)))
+
+    assert loader.calls == 1
+    assert all(user is not None and user.id == 1 for user in users)
+    assert cache.cache.stats.coalesced == 19
+
+
+async def test_lock_coalesces_across_workers(redis: fakeredis.FakeAsyncRedis) -> None:
+    # 两个缓存实例共用一个 Redis，模拟两个 worker：后到者等待加载锁持有者回填
+    loader = CountingLoader(make_user(), delay=0.1)
+    workers = [make_cache(redis, lock_poll_interval=0.01) for _ in range(2)]
+
+    async def load() -> bytes | None:
+        user = await loader()
+        return user.username.encode() if user else None
+
+    results = await asyncio.gather(*(worker.get_or_load("k", load) for worker in workers))
+
+    assert results == [b"alice", b"alice"]
+    assert loader.calls == 1
+    assert not await redis.exists("user:k:lock")
+
+
+async def test_invalidate_drops_data_and_indexes(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = UserCache(make_cache(redis))
+    user = make_user()
+    await cache.get_by_id(1, CountingLoader(user))
+    await cache.get_by_username("alice", CountingLoader(user))
+    assert await redis.exists("user:id:1", "user:username:alice") == 2
+
+    await cache.invalidate(user)
+
+    assert await redis.exists("user:id:1", "user:username:alice") == 0
+    loader = CountingLoader(make_user(username="alice2"))
+    reloaded = await cache.get_by_id(1, loader)
+    assert loader.calls == 1
+    assert reloaded is not None and reloaded.username == "alice2"
+
+
+async def test_stale_index_falls_back_to_loader(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = UserCache(make_cache(redis))
+    await cache.get_by_username("alice", CountingLoader(make_user()))
+    # 用户改名后只清理了 id 缓存，username 索引仍指向该用户
+    await redis.delete("user:id:1")
+
+    renamed = CountingLoader(None)
+    assert await cache.get_by_username("alice", renamed) is None
+    assert not await redis.exists("user:username:alice")
+
+
+async def test_shared_cache_follows_client_replacement(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "USER_CACHE_ENABLED", True)
+    monkeypatch.setattr(user_cache_module, "_user_cache", None)
+    first = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+    second = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+    try:
+        redis_module.set_redis(first)
+        cache = get_user_cache()
+        assert cache is not None
+        # 客户端关闭或替换后，缓存使用新的客户端而不是持有旧的
+        redis_module.set_redis(second)
+        await cache.get_by_id(1, CountingLoader(make_user()))
+    finally:
+        redis_module.set_redis(None)
+
+    assert not await first.exists("user:id:1")
+    assert await second.exists("user:id:1")
+
+
+async def test_no_fill_reads_without_writing_back(redis: fakeredis.FakeAsyncRedis) -> None:
+    cache = UserCache(make_cache(redis))
+    loader = CountingLoader(make_user())
+
+    assert await cache.get_by_username("alice", loader, fill=False) is not None
+    assert await redis.keys("user:*") == []
+
+    await cache.get_by_id(1, CountingLoader(make_user()))
+    hit = CountingLoader(None)
+    assert await cache.get_by_id(1, hit, fill=False) is not None
+    assert hit.calls == 0
+
+
+@pytest.mark.parametrize("replica", [False, True])
+async def test_replica_reads_do_not_fill_shared_cache(
+    redis: fakeredis.FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch, replica: bool
+) -> None:
+    session: Any = SimpleNamespace(info={"replica": replica})
+    service = UserService(session, cache=UserCache(make_cache(redis)))
+
+    async def get_many(user_ids: list[int]) -> list[User]:
+        return [make_user(user_id) for user_id in user_ids]
+
+    monkeypatch.setattr(service.repository, "get_many", get_many)
+
+    assert (await service.get_user(1)).id == 1
+    assert bool(await redis.exists("user:id:1")) is not replica
@@ -0,0 +1,40 @@
+"""用户端点参数校验测试."""
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import users
+from app.core.exceptions import AppException, app_exception_handler
+from app.db.session import get_read_db
+
+
+async def fake_read_db() -> AsyncIterator[Any]:
+    yield SimpleNamespace(info={})
+
+
+def make_client() -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(users.router, prefix="/users")
+    app.add_exception_handler(AppException, app_exception_handler)
+    app.dependency_overrides[get_read_db] = fake_read_db
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_ids_out_of_int4_range_are_rejected() -> None:
+    async with make_client() as client:
+        response = await client.get("/users", params={"ids": f"1,{users.MAX_USER_ID + 1}"})
+
+    assert response.status_code == 422
+    body = response.json()
+    assert body["error"]["code"] == "VALIDATION_ERROR"
+    assert body["error"]["details"]["invalid"] == [users.MAX_USER_ID + 1]
+
+
+async def test_search_query_length_is_checked_after_strip() -> None:
+    async with make_client() as client:
+        response = await client.get("/users/search", params={"q": " a "})
+
+    assert response.status_code == 422
+    assert response.json()["error"]["details"] == {"min_length": 2}
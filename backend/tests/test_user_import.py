@@ -0,0 +1,97 @@
+"""用户批量导入测试（需要测试数据库）."""
+import asyncio
+from typing import Any, AsyncIterator
+
+import fakeredis
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.hashing import hashing_executor
+from app.services import user_import
+from app.services.user_import import UserImporter
+from app.services.user_import_jobs import UserImportJobs
+
+CSV = b"""email,username,password
+new1@example.com,import_new1,Passw0rd!
+new2@example.com,import_new2,Passw0rd!
+new1@example.com,import_dup1,Passw0rd!
+new3@example.com,import_new2,Passw0rd!
+taken@example.com,import_new4,Passw0rd!
+new5@example.com,import_taken,Passw0rd!
+"""
+
+
+@pytest.fixture(autouse=True)
+async def _hashing_pool() -> AsyncIterator[None]:
+    yield
+    await hashing_executor.shutdown()
+
+
+async def _chunks() -> AsyncIterator[bytes]:
+    yield CSV
+
+
+@pytest.mark.parametrize("max_issues", [0, 1, 100])
+async def test_import_totals_do_not_depend_on_issue_limit(
+    db_session: AsyncSession, max_issues: int
+) -> None:
+    await db_session.execute(
+        text(
+            "INSERT INTO users (email, username, hashed_password, is_active, is_superuser)"
+            " VALUES ('taken@example.com', 'import_taken', 'x', true, false)"
+        )
+    )
+
+    report = await UserImporter(db_session, max_issues=max_issues).run(_chunks(), "csv")
+
+    assert (report.imported, report.duplicate, report.conflict) == (2, 2, 2)
+    assert len(report.issues) == min(max_issues, 4)
+    assert report.issues_truncated == (max_issues < 4)
+
+
+async def test_import_job_commits_batches_and_reports(
+    database_url: str, redis: fakeredis.FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # 每 2 行一批：暂存表须在多次提交之间保留
+    monkeypatch.setattr(settings, "USER_IMPORT_CHUNK_SIZE", 2)
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    jobs = UserImportJobs(lambda: redis, engine, ttl=60)
+    try:
+        job = await jobs.submit(_chunks(), "csv")
+        assert job["status"] == "pending"
+        await asyncio.wait_for(asyncio.gather(*jobs._tasks), timeout=60)
+        result: Any = await jobs.get(job["id"])
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(text("DELETE FROM users WHERE username LIKE 'import_%'"))
+        await engine.dispose()
+
+    assert result["status"] == "completed", result
+    assert result["progress"]["staged"] == 6
+    report = result["report"]
+    assert (report["imported"], report["duplicate"], report["conflict"]) == (4, 2, 0)
+    assert await jobs.get("missing") is None
+
+
+async def test_failed_import_job_records_error(
+    database_url: str, redis: fakeredis.FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def overloaded(passwords: Any) -> list[str]:
+        raise ServiceUnavailableException(message="Password hashing is overloaded")
+
+    monkeypatch.setattr(user_import, "hash_passwords", overloaded)
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    jobs = UserImportJobs(lambda: redis, engine, ttl=60)
+    try:
+        job = await jobs.submit(_chunks(), "csv")
+        await asyncio.wait_for(asyncio.gather(*jobs._tasks), timeout=60)
+    finally:
+        await engine.dispose()
+
+    result: Any = await jobs.get(job["id"])
+    assert result["status"] == "failed"
+    assert result["error"] == "Password hashing is overloaded"
@@ -1,10 +1,13 @@
 import request from './request'
-import type { User, UserCreate, UserUpdate } from '@/types/user'
+import type { PaginatedResponse, User, UserCreate, UserUpdate } from '@/types/user'
 
 /**
- * 获取用户列表
+ * 获取用户列表（游标分页，next_cursor 为 null 表示没有更多数据）
  */
-export function getUsers(params?: { skip?: number; limit?: number }): Promise<User[]> {
+export function getUsers(params?: {
+    cursor?: string
+    limit?: number
+}): Promise<PaginatedResponse<User>> {
     return request({
         url: '/api/v1/users',
         method: 'get',
@@ -12,6 +15,17 @@ export function getUsers(params?: { skip?: number; limit?: number }): Promise<Us
     })
 }
 
+/**
+ * 按 ID 批量获取用户（一次请求、一次查询；不存在的 ID 被跳过）
+ */
+export function getUsersByIds(ids: number[]): Promise<PaginatedResponse<User>> {
+    return request({
+        url: '/api/v1/users',
+        method: 'get',
+        params: { ids: ids.join(',') },
+    })
+}
+
 /**
  * 获取用户详情
  */
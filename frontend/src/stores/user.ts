@@ -8,6 +8,7 @@ export const useUserStore = defineStore('user', () => {
     // State
     const users = ref<User[]>([])
     const currentUser = ref<User | null>(null)
+    const nextCursor = ref<string | null>(null)
     const loading = ref(false)
 
     // Getters
@@ -15,11 +16,13 @@ export const useUserStore = defineStore('user', () => {
     const isLoading = computed(() => loading.value)
 
     // Actions
-    async function fetchUsers(params?: { skip?: number; limit?: number }) {
+    async function fetchUsers(params?: { cursor?: string; limit?: number }) {
         loading.value = true
         try {
-            const data = await getUsers(params)
-            users.value = data
+            const page = await getUsers(params)
+            // 带游标时追加下一页，否则重新加载第一页
+            users.value = params?.cursor ? [...users.value, ...page.items] : page.items
+            nextCursor.value = page.next_cursor
         } catch (error) {
             console.error('Failed to fetch users:', error)
             ElMessage.error('获取用户列表失败')
@@ -78,6 +81,7 @@ export const useUserStore = defineStore('user', () => {
     return {
         users,
         currentUser,
+        nextCursor,
         loading,
         userList,
         isLoading,
@@ -9,6 +9,14 @@ export interface User {
     updated_at: string
 }
 
+export interface PaginatedResponse<T> {
+    items: T[]
+    next_cursor: string | null
+    limit: number
+    total: number | null
+    total_strategy: 'exact' | 'estimate' | 'cached' | null
+}
+
 export interface UserCreate {
     email: string
     username: string